@@ -11,6 +11,9 @@ from flask_cors import CORS
 from backend.controller import controller_bp
 from backend.diagnostics import diagnostics_bp
 from backend.admin import admin_bp
+from backend.metrics import metrics_bp
+from backend.images import images_bp
+from backend import request_log
 import os
 
 cors_origin = os.environ.get('CORS_ORIGIN','http://localhost:3000')
@@ -18,9 +21,14 @@ cors_origin = os.environ.get('CORS_ORIGIN','http://localhost:3000')
 app = Flask(__name__)
 CORS(app, origins=[cors_origin])
 
+# Structured JSON logs with a request ID and stage timings for every request
+request_log.init_app(app)
+
 app.register_blueprint(controller_bp)
 app.register_blueprint(diagnostics_bp)
 app.register_blueprint(admin_bp)
+app.register_blueprint(metrics_bp)
+app.register_blueprint(images_bp)
 
 if __name__ == '__main__':
     app.run(host = '0.0.0.0', port = 5000)
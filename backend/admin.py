@@ -9,21 +9,23 @@ from flask import Blueprint, request, jsonify
 from functools import wraps
 from pathlib import Path
 import datetime
+import logging
 import os
 import time
 
 # Import database manager
 from backend.database import manager
+from backend import cache
 
 # Create blueprint
 admin_bp = Blueprint('admin', __name__)
 
+logger = logging.getLogger(__name__)
+
 # Path to the database
 LOGS_DIR = Path.cwd() / "logs" / "diagnostics"
-print(LOGS_DIR)
 DB_PATH = LOGS_DIR / "diagnostics.db"
-print("DB PATH", DB_PATH)
-print(os.path.exists(DB_PATH))
+logger.debug("Diagnostics database %s (exists: %s)", DB_PATH, os.path.exists(DB_PATH))
 
 # Simple admin auth middleware
 def admin_required(f):
@@ -51,7 +53,7 @@ def get_diagnostics():
         # Check if database exists first
         if not os.path.exists(DB_PATH):
             # Return sample data instead of error when no database exists
-            print(f"Database doesn't exist at {DB_PATH}. Returning sample data.")
+            logger.warning("Database doesn't exist at %s. Returning sample data.", DB_PATH)
             return jsonify({
                 "userCount": 25,
                 "activeUsers": {"today": 15},
@@ -82,9 +84,9 @@ def get_diagnostics():
         # Connect to the database - wrap in try/except to catch connection issues
         try:
             db = manager.Database(DB_PATH)
-            print("Database connection successful")
+            logger.debug("Database connection successful")
         except Exception as conn_err:
-            print(f"Database connection error: {conn_err}")
+            logger.error("Database connection error: %s", conn_err)
             # Return sample data if database connection fails
             return jsonify({
                 "userCount": 10,
@@ -140,7 +142,7 @@ def get_diagnostics():
                     "avgExecutionTime": avg_exec_time
                 })
         except Exception as solver_err:
-            print(f"Error getting solver data: {solver_err}")
+            logger.error("Error getting solver data: %s", solver_err)
             solvers_data = []
         
         # Get recent activity with error handling
@@ -178,7 +180,7 @@ def get_diagnostics():
                     "executionTime": execution_time
                 })
         except Exception as activity_err:
-            print(f"Error getting activity data: {activity_err}")
+            logger.error("Error getting activity data: %s", activity_err)
             recent_activity = []
         
         # Calculate overall success rate with error handling
@@ -195,7 +197,7 @@ def get_diagnostics():
             result = db.cursor.fetchone()
             overall_success = result[0] if result and result[0] is not None else 0
         except Exception as success_err:
-            print(f"Error calculating success rate: {success_err}")
+            logger.error("Error calculating success rate: %s", success_err)
             overall_success = 0
         
         # Close the database connection
@@ -217,7 +219,7 @@ def get_diagnostics():
         
     except Exception as e:
         # Log the error for debugging
-        print(f"Error in diagnostics endpoint: {str(e)}")
+        logger.exception("Error in diagnostics endpoint: %s", e)
         import traceback
         traceback.print_exc()  # This will print the full stack trace
         return jsonify({
@@ -227,4 +229,11 @@ def get_diagnostics():
             "successRate": 80,
             "solvers": [],
             "recentActivity": []
-        }), 200  # Return 200 instead of 500 so the frontend gets some data
\ No newline at end of file
+        }), 200  # Return 200 instead of 500 so the frontend gets some data
+
+@admin_bp.route('/admin/cache', methods=['GET'])
+@admin_required
+def get_cache_stats():
+    '''Hit/miss/eviction counters of the solver result cache (this worker's memory tier and the shared disk tier)'''
+
+    return jsonify(cache.stats())
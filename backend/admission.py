@@ -0,0 +1,257 @@
+'''-----------------
+# Title: admission.py
+# Author: Backend Team
+# Date: 10/18/2026
+# Description: Admission control. Cost estimators inspect a request before it is solved and
+#   problems that are known to blow up (a 2^n truth table, an iterated power set, a huge
+#   cartesian product) are rejected or downgraded up front instead of tying up a worker
+#   until they time out.
+-----------------'''
+
+#---Imports---#
+import logging
+import math
+import os
+import re
+import sys
+
+from solvers.util import exceptions
+from solvers.util import logic
+from solvers.util import strings
+
+logger = logging.getLogger(__name__)
+
+# Set ADMISSION_CONTROL=0 to let every request through
+ENABLED = os.getenv('ADMISSION_CONTROL', '1') != '0'
+
+
+def parse_limits(spec):
+    '''
+        A function to parse per-route cost limits, e.g. "wff=1e6,power-set=65536".
+
+        Returns
+        ----------
+        limits: dict
+            Route name -> limit
+    '''
+    limits = {}
+    for item in spec.split(','):
+        name, _, limit = item.partition('=')
+        if name.strip() and limit.strip():
+            limits[name.strip()] = float(limit)
+
+    return limits
+
+# Per-route overrides from the environment win over the limits declared in the registry
+LIMITS = parse_limits(os.getenv('SOLVER_COST_LIMITS', ''))
+QUEUE_LIMITS = parse_limits(os.getenv('SOLVER_QUEUE_COST_LIMITS', ''))
+
+
+class CostLimit:
+    '''
+        The admission policy of a route.
+
+        Parameters
+        ----------
+        estimate (function):
+            Takes the (canonical) request payload and returns its estimated cost, in the
+                route's own units (truth table cells, listed subsets, ...).
+        limit (float):
+            Requests estimated above this are not solved synchronously.
+        downgrade (function):
+            Optional. Takes the payload and returns a cheap, reduced answer (e.g. only
+                cardinalities) to send instead. Without one, oversized requests are rejected.
+        queue_limit (float):
+            Optional. Requests estimated between limit and queue_limit are still solved when
+                run as a background job (see jobs.py), instead of being downgraded or rejected.
+    '''
+    def __init__(self, estimate, limit, downgrade=None, queue_limit=None):
+        self.estimate = estimate
+        self.limit = limit
+        self.downgrade = downgrade
+        self.queue_limit = queue_limit
+
+
+def admit(solver_type, entry, data, queued=False, can_queue=False):
+    '''
+        A function to decide whether a request can be solved as asked.
+
+        Parameters
+        ----------
+        solver_type (str):
+            The route name
+        entry (SolverEntry):
+            The route's registry entry
+        data (json):
+            The (canonical) request payload
+        queued (bool):
+            Whether the request is running as a background job, which may go up to the
+                route's queue_limit.
+        can_queue (bool):
+            Whether the caller can turn the request into a job. If so, requests under the
+                queue_limit are rejected (to be queued) rather than downgraded.
+
+        Returns
+        ----------
+        downgraded: json
+            None when the request is admitted, otherwise the reduced answer to return.
+                Raises ProblemTooLargeError when it is rejected, with `queueable` set when
+                it would be admitted as a job.
+    '''
+    policy = entry.admission
+    if not ENABLED or policy is None:
+        return None
+
+    try:
+        cost = policy.estimate(data)
+    except (LookupError, TypeError, ValueError, AttributeError, exceptions.CalculateError) as e:
+        # Malformed input: let the solver report the problem the way it always has. Any
+        #   other error is a bug in the estimator and is raised rather than admitted.
+        logger.debug("could not estimate the cost of a request", extra={"solver": solver_type, "error": repr(e)})
+        return None
+
+    # Estimates saturate at infinity, which JSON (logs, 413 bodies, job results) can't carry
+    if not math.isfinite(cost):
+        cost = sys.float_info.max
+
+    limit = LIMITS.get(solver_type, policy.limit)
+    if cost <= limit:
+        return None
+
+    queue_limit = QUEUE_LIMITS.get(solver_type, policy.queue_limit)
+    queueable = queue_limit is not None and cost <= queue_limit
+    if queueable and queued:
+        return None
+
+    if policy.downgrade is not None and not (queueable and can_queue):
+        logger.info("downgraded oversized request", extra={"solver": solver_type, "estimatedCost": cost, "limit": limit})
+        return policy.downgrade(data)
+
+    logger.info("rejected oversized request", extra={"solver": solver_type, "estimatedCost": cost, "limit": limit})
+    raise exceptions.ProblemTooLargeError(solver_type, cost, limit, queueable)
+
+
+#---Helpers---#
+def _set_size(set_string):
+    # The number of top level elements in "{a, b, {c, d}}" style input
+    set_string = set_string.strip()
+    if set_string in ('∅', '{}'):
+        return 0
+
+    return len(strings.parse_set(set_string))
+
+def _power(base, exponent):
+    # base ** exponent, saturating at infinity instead of building a huge integer or overflowing
+    if base <= 1:
+        return float(base) if exponent else 1.0
+    if exponent > 1024:
+        return float('inf')
+
+    try:
+        return float(base) ** exponent
+    except OverflowError:
+        return float('inf')
+
+def _describe_power_of_two(exponent):
+    # 2^exponent as an int when it's printable, otherwise as notation ("2^(2^65536)")
+    if isinstance(exponent, int) and exponent <= 64:
+        return 2 ** exponent
+
+    exponent = str(exponent)
+    return f"2^({exponent})" if '^' in exponent else f"2^{exponent}"
+
+
+#---Estimators---#
+def wff_cost(data):
+    '''
+        Truth table cells: 2^variables rows, one column per parenthesized subexpression
+            plus the formula itself. In the 'bits' table format a cell is one bit of a
+            packed column, so the cost is the table's size in bytes, cells / 8.
+    '''
+    formula = data['formula']
+    variables = len(logic.variables(formula))
+    cells = _power(2, variables) * (variables + formula.count('(') + 1)
+
+    return cells / 8 if data.get('tableFormat') == 'bits' else cells
+
+def power_set_cost(data):
+    '''
+        Subsets listed: every iteration lists 2^(previous cardinality) elements.
+    '''
+    iterations = int(data.get('iterations', 1))
+    cost = 0.0
+    for set_string in data.get('sets', {}).values():
+        cardinality = _set_size(set_string)
+        for _ in range(iterations):
+            cardinality = _power(2, cardinality)
+            cost += cardinality
+
+    return cost
+
+def power_set_summary(data):
+    '''
+        The cardinalities of the iterated power sets without listing their elements, in
+            the same shape power_set_solver returns.
+    '''
+    iterations = int(data.get('iterations', 1))
+    result = {
+        "original_sets": {},
+        "power_sets": {},
+        "iterations": iterations,
+        "elementsOmitted": True,
+        "message": "The power sets are too large to list, only their cardinalities are shown."
+    }
+
+    for set_name, set_string in data.get('sets', {}).items():
+        result["original_sets"][set_name] = set_string
+
+        cardinality = _set_size(set_string)
+        for i in range(iterations):
+            cardinality = _describe_power_of_two(cardinality)
+            result["power_sets"][f"Iteration {i+1} - Set {set_name}"] = {
+                "notation": f"𝒫^{i+1}({set_name})",
+                "elements": [],
+                "cardinality": cardinality
+            }
+
+    return result
+
+# Elements generated for a set-builder domain by cartesian_product_solver
+BUILDER_DOMAIN_SIZES = {"N": 100, "Z": 201, "Q": 201 * 100, "R": 200 * 100, "C": 21 * 21}
+
+def cartesian_cost(data):
+    '''
+        Elements generated for the sets, plus for every statement the product of the
+            sizes of the sets it mentions (|A| x |B| for "A × B").
+    '''
+    sizes = {}
+    for name, set_input, set_format in data['setOne']:
+        if set_format == "2":
+            domain = re.search(r"∈\s*(\w+)", set_input)
+            sizes[name] = BUILDER_DOMAIN_SIZES.get(domain.group(1) if domain else None, 0)
+        else:
+            sizes[name] = _set_size(set_input)
+
+    cost = float(sum(sizes.values()))
+    for statement in data['setTwo']:
+        product = 1.0
+        for name, size in sizes.items():
+            product *= _power(size, len(re.findall(rf"(?<![\w]){re.escape(name)}(?![\w])", statement)))
+        cost += product
+
+    return cost
+
+def binary_unary_cost(data):
+    '''
+        Operation table lookups needed to check associativity: |S|^3. For expressions
+            (choice 2) every lookup is a sympy substitution, weighted as 100 lookups. The
+            built in domains use a fixed sample and are bounded.
+    '''
+    if str(data.get('choice', '1')) == '1':
+        return float(len(set(data.get('set', '').split()))) ** 3
+
+    match = re.search(r";\s*S\s*=\s*(\{.*\})\s*$", data.get('expression', ''))
+    if not match:
+        return 0.0
+
+    return 100 * float(len(match.group(1).strip('{}').split(','))) ** 3
@@ -0,0 +1,602 @@
+'''-----------------
+# Title: cache.py
+# Author: Backend Team
+# Date: 10/18/2026
+# Description: Two-tier cache for solver results, keyed on canonicalized input. A bounded
+#   in-process LRU + TTL tier sits in front of a shared SQLite tier in logs/cache that every
+#   gunicorn worker on the node reads and writes, and that survives restarts.
+-----------------'''
+
+#---Imports---#
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from solvers.util import exceptions
+
+
+def canonicalize(entry, data):
+    '''
+        A function to rewrite a request payload into its canonical form, using the
+            normalizers declared on the solver's registry entry.
+
+        The canonical payload only builds the cache key (see make_key). Solvers run on the
+            payload as sent, so users see their input in the order and spelling they typed;
+            a cache hit returns the same answer, as the input of whoever solved it first.
+
+        Parameters
+        ----------
+        entry (SolverEntry):
+            The registry entry of the solver being called
+        data (json):
+            The request payload
+
+        Returns
+        ----------
+        data: json
+            A copy of the payload with every declared field normalized.
+    '''
+    if not entry.canonical or not isinstance(data, dict):
+        return data
+
+    canonical = dict(data)
+    for field, normalize in entry.canonical.items():
+        if field in canonical:
+            canonical[field] = _apply(normalize, canonical[field])
+
+    return canonical
+
+def _apply(normalize, value):
+    # Normalizers apply to every string nested inside the declared field
+    if isinstance(value, str):
+        return normalize(value)
+    if isinstance(value, dict):
+        return {k: _apply(normalize, v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_apply(normalize, v) for v in value]
+    return value
+
+def make_key(solver_type, data):
+    '''
+        A function to build the cache key for a (canonical) payload.
+
+        Returns
+        ----------
+        key: str
+            A sha256 hex digest, or None if the payload can't be serialized.
+    '''
+    try:
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    except (TypeError, ValueError):
+        return None
+
+    return hashlib.sha256(f"{solver_type}\x00{payload}".encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    '''
+        A thread-safe, in-process LRU cache whose entries also expire after a TTL.
+
+        Parameters
+        ----------
+        max_entries (int):
+            The number of results to keep. 0 disables the cache.
+        ttl (float):
+            Seconds an entry stays valid after it was stored.
+    '''
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        '''
+            Returns
+            ----------
+            (hit, value): tuple
+                hit is False when the key is missing or expired.
+        '''
+        if key is None or self.max_entries <= 0:
+            return False, None
+
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return False, None
+
+            expires, value = item
+            if expires < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key, value):
+        if key is None or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl
+            }
+
+
+class DiskCache:
+    '''
+        A result cache stored in a SQLite database, shared by every worker process on
+            the node. Writes are single transactions (so readers never see a partial
+            entry), and the least recently used entries are dropped once the database
+            grows past its byte budget.
+
+        Parameters
+        ----------
+        path (str):
+            The SQLite database file. An empty path disables the tier.
+        max_bytes (int):
+            Total size of the stored results before eviction kicks in.
+        max_entry_bytes (int):
+            Results larger than this are not written to disk.
+        ttl (float):
+            Seconds an entry stays valid after it was stored. Wall clock time, so
+                entries outlive a restart.
+    '''
+    def __init__(self, path, max_bytes, max_entry_bytes, ttl):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.skipped = 0
+        self.errors = 0
+
+    @property
+    def enabled(self):
+        return bool(self.path) and self.max_bytes > 0
+
+    def _connect(self):
+        # sqlite connections can't cross threads or a fork, so keep one per thread per process
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS result (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        connection.execute("CREATE INDEX IF NOT EXISTS result_accessed ON result (accessed)")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS flight (
+                key TEXT PRIMARY KEY,
+                expires REAL NOT NULL
+            )
+        """)
+
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key):
+        '''
+            Returns
+            ----------
+            (hit, value): tuple
+                hit is False when the key is missing, expired or the database is unavailable.
+        '''
+        if key is None or not self.enabled:
+            return False, None
+
+        try:
+            hit, value = self._read(self._connect(), key)
+        except (sqlite3.Error, OSError, ValueError):
+            # The disk tier is best effort, never fail a solve because of it
+            self._count('errors')
+            return False, None
+
+        self._count('hits' if hit else 'misses')
+        return hit, value
+
+    def _read(self, connection, key):
+        row = connection.execute("SELECT value, expires FROM result WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+
+        if row is None or row[1] < now:
+            return False, None
+
+        connection.execute("UPDATE result SET accessed = ? WHERE key = ?", (now, key))
+        return True, json.loads(row[0])
+
+    def put(self, key, value):
+        if key is None or not self.enabled:
+            return
+
+        try:
+            payload = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        except (TypeError, ValueError):
+            self._count('skipped')
+            return
+
+        size = len(payload.encode('utf-8'))
+        if size > self.max_entry_bytes:
+            self._count('skipped')
+            return
+
+        try:
+            connection = self._connect()
+            now = time.time()
+
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO result (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, size, now + self.ttl, now)
+                )
+                evicted = self._evict(connection, now)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except (sqlite3.Error, OSError):
+            self._count('errors')
+            return
+
+        with self._lock:
+            self.evictions += evicted
+
+    def _evict(self, connection, now):
+        # Expired entries go first, then the least recently used until we're back under budget
+        evicted = connection.execute("DELETE FROM result WHERE expires < ?", (now,)).rowcount
+
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM result").fetchone()[0]
+        if total <= self.max_bytes:
+            return evicted
+
+        removed = 0
+        doomed = []
+        for key, size in connection.execute("SELECT key, size FROM result ORDER BY accessed"):
+            if total - removed <= self.max_bytes:
+                break
+            doomed.append((key,))
+            removed += size
+
+        connection.executemany("DELETE FROM result WHERE key = ?", doomed)
+        return evicted + len(doomed)
+
+    def claim(self, key, ttl):
+        '''
+            A function to take the lease on a key that's about to be solved, so the other
+                workers wait for its result instead of solving it too.
+
+            Parameters
+            ----------
+            key (str):
+                The cache key being solved
+            ttl (float):
+                Seconds until the lease lapses, in case its holder dies mid-solve.
+
+            Returns
+            ----------
+            claimed: bool
+                False when another process holds a live lease on the key.
+        '''
+        try:
+            connection = self._connect()
+            now = time.time()
+
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute("DELETE FROM flight WHERE expires < ?", (now,))
+                claimed = connection.execute(
+                    "INSERT OR IGNORE INTO flight (key, expires) VALUES (?, ?)", (key, now + ttl)
+                ).rowcount == 1
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except (sqlite3.Error, OSError):
+            self._count('errors')
+            return True
+
+        return claimed
+
+    def release(self, key):
+        try:
+            self._connect().execute("DELETE FROM flight WHERE key = ?", (key,))
+        except (sqlite3.Error, OSError):
+            self._count('errors')
+
+    def wait(self, key, timeout):
+        '''
+            A function to wait for the process holding the lease on a key to store its result.
+
+            Returns
+            ----------
+            (hit, value): tuple
+                hit is False when the lease was released or lapsed without a result being
+                    stored (the solve failed, or its result was too large for the disk tier).
+        '''
+        deadline = time.monotonic() + timeout
+        delay = 0.02
+
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+            try:
+                connection = self._connect()
+                hit, value = self._read(connection, key)
+                if hit:
+                    self._count('hits')
+                    return True, value
+
+                lease = connection.execute("SELECT expires FROM flight WHERE key = ?", (key,)).fetchone()
+            except (sqlite3.Error, OSError, ValueError):
+                self._count('errors')
+                return False, None
+
+            if lease is None or lease[0] < time.time():
+                break
+
+        return False, None
+
+    def clear(self):
+        if not self.enabled:
+            return
+
+        try:
+            self._connect().execute("DELETE FROM result")
+        except (sqlite3.Error, OSError):
+            self._count('errors')
+
+    def stats(self):
+        stats = {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "maxBytes": self.max_bytes,
+            "maxEntryBytes": self.max_entry_bytes,
+            "ttlSeconds": self.ttl
+        }
+
+        if self.enabled:
+            try:
+                row = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM result").fetchone()
+                stats["size"], stats["bytes"] = row
+            except (sqlite3.Error, OSError):
+                pass
+
+        return stats
+
+
+class _Flight:
+    # One solve in progress, its budget and the outcome its waiters will share
+    def __init__(self, timeout):
+        self.done = threading.Event()
+        self.timeout = timeout
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    '''
+        Coalesces concurrent solves of the same key: the first caller solves it and the
+            callers that arrive while it runs wait for and share its outcome. Within a
+            process the waiters share the result directly. Across processes, a lease in the
+            disk tier marks a key as being solved and the other workers wait for the result
+            to land in the disk tier rather than solving it again.
+
+        Parameters
+        ----------
+        memory (ResultCache):
+            Results shared by another process are promoted into this tier.
+        disk (DiskCache):
+            The shared tier holding the leases. When disabled, solves are only coalesced
+                within the process.
+    '''
+    # Leases outlive the solve budget by this much, to cover dispatch to a solver process
+    LEASE_MARGIN = 5.0
+
+    def __init__(self, memory, disk):
+        self.memory = memory
+        self.disk = disk
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.solved = 0
+        self.shared = 0
+        self.remote = 0
+
+    def run(self, key, compute, timeout, solver_type='solver'):
+        '''
+            A function to solve a key once, however many callers ask for it at the same time.
+
+            Parameters
+            ----------
+            key (str):
+                The cache key of the problem. None disables coalescing.
+            compute (function):
+                Solves the problem and stores the result in the cache.
+            timeout (float):
+                The solve's budget in seconds, how long another process may hold the key
+                    and how long this caller waits for another caller's solve.
+            solver_type (str):
+                The route name, for the SolverTimeoutError of a caller that waited too long
+
+            Returns
+            ----------
+            (shared, value): tuple
+                shared is True when the value came from another caller's solve. Errors of
+                    the solve are raised to every caller waiting on it, except timeouts,
+                    which are only shared with callers on the same budget. Callers with a
+                    bigger budget (e.g. a job waiting on a request) solve it themselves.
+        '''
+        if key is None:
+            return False, compute()
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight(timeout)
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise exceptions.SolverTimeoutError(solver_type, timeout)
+
+            if isinstance(flight.error, exceptions.SolverTimeoutError) and flight.timeout != timeout:
+                return False, self._compute(compute)
+
+            with self._lock:
+                self.shared += 1
+            if flight.error is not None:
+                raise flight.error
+            return True, flight.value
+
+        try:
+            shared, flight.value = self._lead(key, compute, timeout)
+            return shared, flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _lead(self, key, compute, timeout):
+        if not self.disk.enabled:
+            return False, self._compute(compute)
+
+        if self.disk.claim(key, timeout + self.LEASE_MARGIN):
+            try:
+                return False, self._compute(compute)
+            finally:
+                self.disk.release(key)
+
+        hit, value = self.disk.wait(key, timeout + self.LEASE_MARGIN)
+        if hit:
+            self.memory.put(key, value)
+            with self._lock:
+                self.remote += 1
+            return True, value
+
+        # The other worker failed or its result couldn't be cached, solve it here
+        return False, self._compute(compute)
+
+    def _compute(self, compute):
+        value = compute()
+        with self._lock:
+            self.solved += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "solved": self.solved,
+                "shared": self.shared,
+                "sharedFromOtherWorkers": self.remote,
+                "inFlight": len(self._flights)
+            }
+
+
+#---The caches used by solve_algorithim---#
+# The disk tier and the image store live here (RESULT_CACHE_DB and RENDER_STORE_DB move them one by one)
+CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '../logs/cache'))
+
+# Per-process tier
+results = ResultCache(
+    int(os.getenv('RESULT_CACHE_SIZE', '512')),
+    float(os.getenv('RESULT_CACHE_TTL', '3600'))
+)
+
+# Node-wide tier, shared by every gunicorn worker. Set RESULT_CACHE_DISK_MB=0 to disable it.
+disk = DiskCache(
+    os.getenv('RESULT_CACHE_DB', os.path.join(CACHE_DIR, 'results.db')),
+    int(float(os.getenv('RESULT_CACHE_DISK_MB', '256')) * 1024 * 1024),
+    int(float(os.getenv('RESULT_CACHE_MAX_ENTRY_KB', '4096')) * 1024),
+    float(os.getenv('RESULT_CACHE_DISK_TTL', str(7 * 24 * 3600)))
+)
+
+# Identical concurrent solves (a class trying the same exercise) run once
+flights = SingleFlight(results, disk)
+
+
+def get(key):
+    '''
+        A function to look a key up in the memory tier, then the disk tier. Disk hits
+            are promoted into the memory tier.
+
+        Returns
+        ----------
+        (hit, value): tuple
+    '''
+    hit, value = results.get(key)
+    if hit:
+        return hit, value
+
+    hit, value = disk.get(key)
+    if hit:
+        results.put(key, value)
+
+    return hit, value
+
+def put(key, value):
+    '''
+        A function to store a result in both tiers.
+    '''
+    results.put(key, value)
+    disk.put(key, value)
+
+def stats():
+    return {"memory": results.stats(), "disk": disk.stats(), "singleFlight": flights.stats()}
@@ -10,6 +10,7 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime
 import os 
 import json
+import logging
 import time
 
 from backend.database import manager
@@ -17,6 +18,8 @@ from backend.database import manager
 # Init the blueprint
 diagnostics_bp = Blueprint('diagnostics', __name__)
 
+logger = logging.getLogger(__name__)
+
 # Create a logs directory if its not there
 LOGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../logs/diagnostics')
 os.makedirs(LOGS_DIR, exist_ok=True)
@@ -108,5 +111,5 @@ def receive_diagnostics():
         return jsonify({"status": "Diagnostics Received"})
 
     except Exception as e:
-        print(f"Error processing diagnostics: {str(e)}")
+        logger.exception("Error processing diagnostics: %s", e)
         return jsonify({"status": "Diagnostic Error", "message": str(e)}), 500
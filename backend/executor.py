@@ -0,0 +1,335 @@
+'''-----------------
+# Title: executor.py
+# Author: Backend Team
+# Date: 10/18/2026
+# Description: A managed pool of solver processes that enforces a wall-clock budget per
+#   solve. A solve that runs over budget has its process killed and replaced, so one
+#   pathological input can't pin the gunicorn worker that received it. A second, smaller
+#   pool of warm renderer processes draws the solvers' diagrams.
+-----------------'''
+
+#---Imports---#
+import atexit
+import contextlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+from backend import registry
+from backend import request_log
+from solvers.util import drawings
+from solvers.util import exceptions
+from solvers.util import spans
+
+logger = logging.getLogger(__name__)
+
+# Budget for solvers without one of their own, in seconds
+DEFAULT_TIMEOUT = float(os.getenv('SOLVER_TIMEOUT', '30'))
+
+# Budget for drawing one diagram, in seconds
+RENDER_TIMEOUT = float(os.getenv('RENDER_TIMEOUT', '30'))
+
+
+def parse_timeouts(spec):
+    '''
+        A function to parse per-route budgets, e.g. "wff=10,graphs=20".
+
+        Returns
+        ----------
+        timeouts: dict
+            Route name -> seconds
+    '''
+    timeouts = {}
+    for item in spec.split(','):
+        name, _, seconds = item.partition('=')
+        if name.strip() and seconds.strip():
+            timeouts[name.strip()] = float(seconds)
+
+    return timeouts
+
+# Per-route overrides from the environment win over the budgets declared in the registry
+TIMEOUTS = parse_timeouts(os.getenv('SOLVER_TIMEOUTS', ''))
+
+
+def timeout_for(solver_type, entry):
+    '''
+        A function to look up the wall-clock budget of a route.
+    '''
+    if solver_type in TIMEOUTS:
+        return TIMEOUTS[solver_type]
+    if entry.timeout is not None:
+        return entry.timeout
+
+    return DEFAULT_TIMEOUT
+
+
+def _serve(connection):
+    # Entry point of a pool process: solve requests off the pipe until it closes
+    request_log.configure()
+    registry.warm_up(os.getenv('SOLVER_WARMUP', ''))
+
+    # With renderers running, diagrams are described here and drawn there
+    defer = drawings.defer if render_pool.size > 0 else contextlib.nullcontext
+
+    while True:
+        try:
+            solver_type, data, rid = connection.recv()
+        except (EOFError, OSError):
+            return
+
+        # Solver logs carry the ID of the request they're solving
+        request_log.request_id.set(rid)
+
+        # Stage timings travel back with the result. Anything the solver doesn't mark as
+        #   parse or render counts as compute.
+        with spans.collect() as recorder:
+            try:
+                with spans.span('compute'), defer():
+                    result = registry.SOLVERS[solver_type].solve(data)
+                connection.send((True, result, recorder.totals))
+            except Exception as e:
+                try:
+                    connection.send((False, e, recorder.totals))
+                except Exception:
+                    # The exception (or the result that raised while pickling) can't cross the pipe
+                    connection.send((False, RuntimeError(repr(e)), recorder.totals))
+
+def _serve_renders(connection):
+    # Entry point of a renderer process: load matplotlib and draw one diagram up front, then
+    #   draw the diagrams off the pipe until it closes
+    request_log.configure()
+    from solvers.util import render
+    render.warm_up()
+
+    while True:
+        try:
+            _, drawing, rid = connection.recv()
+        except (EOFError, OSError):
+            return
+
+        request_log.request_id.set(rid)
+
+        with spans.collect() as recorder:
+            try:
+                image = render.draw(drawing)
+                connection.send((True, image, recorder.totals))
+            except Exception as e:
+                try:
+                    connection.send((False, e, recorder.totals))
+                except Exception:
+                    connection.send((False, RuntimeError(repr(e)), recorder.totals))
+
+
+class _Worker:
+    '''
+        One pool process and the parent's end of its pipe.
+    '''
+    def __init__(self, context, serve):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class SolverPool:
+    '''
+        A fixed number of solver processes, started on first use (or by start()). Each solve
+            takes an idle process (waiting for one if they are all busy), and a process that
+            times out or dies is killed and its slot refilled on the next solve.
+
+        Parameters
+        ----------
+        size (int):
+            The number of solver processes. 0 solves inline in the calling process,
+                without timeouts.
+        serve (function):
+            The entry point of the processes, _serve for solvers, _serve_renders for renderers.
+        max_waiting (int):
+            Optional. How many calls may wait for a busy process, beyond that ServerBusyError
+                is raised instead of queueing more work.
+    '''
+    def __init__(self, size, serve=_serve, max_waiting=None):
+        self.size = size
+        self.serve = serve
+        self.max_waiting = max_waiting
+        self._context = multiprocessing.get_context('spawn')
+        self._condition = threading.Condition()
+        self._reset()
+
+    def _reset(self):
+        self._idle = []
+        self._started = 0
+        self._waiting = 0
+        self._pid = os.getpid()
+
+    def start(self):
+        '''
+            A function to start every process ahead of the first call, so none of them pays
+                its imports and warm up during a request. The processes load in the background.
+        '''
+        with self._condition:
+            if self._pid != os.getpid():
+                self._reset()
+
+            missing = self.size - self._started
+            self._started += missing
+
+        for _ in range(missing):
+            try:
+                worker = _Worker(self._context, self.serve)
+            except BaseException:
+                self._release(None)
+                raise
+            self._release(worker)
+
+    def _acquire(self):
+        with self._condition:
+            # A forked child (e.g. a gunicorn worker) must not share its parent's processes
+            if self._pid != os.getpid():
+                self._reset()
+
+            if not self._idle and self._started >= self.size:
+                # Every process is busy: queue behind them, unless the queue is full
+                if self.max_waiting is not None and self._waiting >= self.max_waiting:
+                    raise exceptions.ServerBusyError(f"All {self.size} processes are busy and {self._waiting} calls are waiting")
+
+                self._waiting += 1
+                try:
+                    while not self._idle and self._started >= self.size:
+                        self._condition.wait()
+                finally:
+                    self._waiting -= 1
+
+            if self._idle:
+                return self._idle.pop()
+            self._started += 1
+
+        try:
+            return _Worker(self._context, self.serve)
+        except BaseException:
+            self._release(None)
+            raise
+
+    def _release(self, worker):
+        # Pass None to give up the slot of a worker that was killed
+        with self._condition:
+            if worker is None:
+                self._started -= 1
+            else:
+                self._idle.append(worker)
+            self._condition.notify()
+
+    def run(self, solver_type, data, timeout):
+        '''
+            A function to solve a problem in a pool process.
+
+            Parameters
+            ----------
+            solver_type (str):
+                The route name in the registry
+            data (json):
+                The (canonical) request payload
+            timeout (float):
+                Wall-clock budget in seconds. None or <= 0 waits forever.
+
+            The solver's stage timings are added to the current spans, plus a 'dispatch'
+                stage for the time spent waiting for a process and moving data over the pipe.
+
+            Returns
+            ----------
+            result:
+                Whatever the solver returned. Exceptions raised by the solver are re-raised
+                    here, and SolverTimeoutError is raised when the budget runs out.
+        '''
+        start = time.perf_counter()
+        worker = self._acquire()
+
+        try:
+            worker.connection.send((solver_type, data, request_log.request_id.get()))
+            finished = worker.connection.poll(timeout if timeout and timeout > 0 else None)
+            if finished:
+                ok, value, stages = worker.connection.recv()
+        except (EOFError, OSError):
+            worker.kill()
+            self._release(None)
+            logger.error("solver process exited unexpectedly", extra={"solver": solver_type})
+            raise RuntimeError(f"The {solver_type} solver process exited unexpectedly")
+
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if not finished:
+            spans.merge({'compute': elapsed})
+
+            # Cancel the solve: the only safe way to stop arbitrary Python code is to kill it
+            worker.kill()
+            self._release(None)
+            logger.warning("solver timed out", extra={"solver": solver_type, "timeoutSeconds": timeout})
+            raise exceptions.SolverTimeoutError(solver_type, timeout)
+
+        self._release(worker)
+
+        spans.merge(stages)
+        spans.merge({'dispatch': max(0.0, elapsed - sum(stages.values()))})
+
+        if not ok:
+            raise value
+
+        return value
+
+    def shutdown(self):
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._started -= len(idle)
+
+        for worker in idle:
+            worker.kill()
+
+
+# The renderers that draw the diagrams of pool solves, at most RENDER_QUEUE_SIZE diagrams wait
+#   for one. Set RENDER_POOL_SIZE=0 to draw in the solver processes.
+render_pool = SolverPool(
+    int(os.getenv('RENDER_POOL_SIZE', '1')),
+    serve=_serve_renders,
+    max_waiting=int(os.getenv('RENDER_QUEUE_SIZE', '16'))
+)
+atexit.register(render_pool.shutdown)
+
+# The pool used by solve_algorithim. Set SOLVER_POOL_SIZE=0 to solve inline.
+pool = SolverPool(int(os.getenv('SOLVER_POOL_SIZE', '2')))
+atexit.register(pool.shutdown)
+
+
+def start():
+    '''
+        A function to start the renderer processes of this gunicorn worker, so the first
+            diagram doesn't wait for matplotlib to load.
+    '''
+    if pool.size > 0:
+        render_pool.start()
+
+def solve(solver_type, entry, data, timeout=None):
+    '''
+        A function to run a registry entry in the pool, or inline when the pool is disabled.
+            The budget defaults to the route's (see timeout_for). Diagrams the solver left
+            as drawings are then drawn by the renderer pool, while the solver process moves
+            on to the next problem.
+    '''
+    if pool.size <= 0:
+        with spans.span('compute'):
+            return entry.solve(data)
+
+    result = pool.run(solver_type, data, timeout if timeout is not None else timeout_for(solver_type, entry))
+    if not entry.images or render_pool.size <= 0:
+        return result
+
+    return drawings.replace(result, lambda drawing: render_pool.run('render', drawing, RENDER_TIMEOUT))
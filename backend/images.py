@@ -0,0 +1,59 @@
+'''-----------------
+# Title: images.py
+# Author: Backend Team
+# Date: 10/18/2026
+# Description: Serves the diagrams in the content-addressed image store (see
+#   solvers/util/image_store.py) at the /render/<sha>.<ext> URLs that solves with a png-url or
+#   svg-url imageFormat return, with ETags and long-lived cache headers.
+-----------------'''
+
+#---Imports---#
+from flask import Blueprint, Response, jsonify, request
+import re
+import sqlite3
+
+from solvers.util import image_store
+
+# Init the blueprint
+images_bp = Blueprint('images', __name__)
+
+IMAGE_NAME = re.compile(r'^([0-9a-f]{64})\.(png|svg)$')
+
+# A URL names its bytes forever, so caches may keep them as long as they like
+CACHE_SECONDS = 365 * 24 * 3600
+
+
+@images_bp.route('/render/<name>', methods=['GET'])
+def get_image(name):
+    '''
+        An endpoint returning a stored diagram. No API key is needed, since <img> tags can't
+            send one and a URL is only known to whoever solved the diagram.
+
+        The ETag is the content hash itself, so a revalidation (If-None-Match) is answered
+            with a 304 without reading the store.
+    '''
+    match = IMAGE_NAME.match(name)
+    if match is None:
+        return jsonify({'error': 'Image not found'}), 404
+
+    digest, ext = match.groups()
+    if request.if_none_match.contains(digest):
+        response = Response(status=304)
+    else:
+        try:
+            data = image_store.store.get(digest, ext)
+        except (sqlite3.Error, OSError):
+            data = None
+
+        if data is None:
+            # Unknown or evicted: solving the problem again stores it again under the same URL
+            #   (cached results whose images were evicted are solved again, see controller.py)
+            return jsonify({'error': 'Image not found'}), 404
+
+        response = Response(data, mimetype=image_store.MIME_TYPES[ext])
+
+    response.set_etag(digest)
+    response.cache_control.public = True
+    response.cache_control.max_age = CACHE_SECONDS
+    response.cache_control.immutable = True
+    return response
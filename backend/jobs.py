@@ -0,0 +1,328 @@
+'''-----------------
+# Title: jobs.py
+# Author: Backend Team
+# Date: 10/18/2026
+# Description: A durable queue of solve jobs and the worker threads that run them, so heavy
+#   problems (big truth tables, iterated power sets, large isomorphism checks) don't have to
+#   finish inside one HTTP request. The queue is a SQLite table next to diagnostics.db that
+#   every gunicorn worker on the node shares.
+-----------------'''
+
+#---Imports---#
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+LOGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../logs/diagnostics')
+
+# JOB_WORKERS threads per gunicorn worker run jobs (0 only queues them), each with a budget
+#   of JOB_TIMEOUT seconds. Finished jobs are kept for JOB_TTL seconds.
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '1'))
+JOB_TIMEOUT = float(os.getenv('JOB_TIMEOUT', '300'))
+JOB_TTL = float(os.getenv('JOB_TTL', str(24 * 3600)))
+
+# A running job holds a lease of JOB_LEASE seconds, renewed by its process every third of
+#   that. A job whose lease lapses (its process or container died) is put back in the queue,
+#   whatever became of the process ID.
+JOB_LEASE = float(os.getenv('JOB_LEASE', '30'))
+
+# A job whose worker died mid-solve is retried this many times before it is failed
+MAX_ATTEMPTS = 3
+
+# How often idle workers look for jobs queued by other processes, in seconds
+POLL_SECONDS = 1.0
+
+
+class JobQueue:
+    '''
+        Solve jobs stored in a SQLite database. A job goes queued -> running -> done or
+            failed, and is claimed by exactly one worker (in any process on the node).
+
+        Parameters
+        ----------
+        path (str):
+            The SQLite database file
+        ttl (float):
+            Seconds a finished job (and its result) is kept.
+        lease (float):
+            Seconds a running job stays claimed without being renewed.
+    '''
+    def __init__(self, path, ttl, lease=JOB_LEASE):
+        self.path = path
+        self.ttl = ttl
+        self.lease = lease
+        self._local = threading.local()
+
+    def _connect(self):
+        # sqlite connections can't cross threads or a fork, so keep one per thread per process
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS job (
+                id TEXT PRIMARY KEY,
+                solver TEXT NOT NULL,
+                data TEXT NOT NULL,
+                status TEXT NOT NULL,
+                outcome TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker INTEGER,
+                created REAL NOT NULL,
+                started REAL,
+                finished REAL,
+                lease REAL
+            )
+        """)
+        # Databases from before leases live on in the diagnostics volume
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(job)")]
+        if 'lease' not in columns:
+            connection.execute("ALTER TABLE job ADD COLUMN lease REAL")
+        connection.execute("CREATE INDEX IF NOT EXISTS job_status ON job (status, created)")
+
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def _transaction(self, work):
+        # Run work(connection) as one write transaction
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        return result
+
+    def submit(self, solver_type, data):
+        '''
+            A function to queue a job.
+
+            Returns
+            ----------
+            job_id: str
+        '''
+        job_id = uuid.uuid4().hex
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        now = time.time()
+
+        def work(connection):
+            # Finished jobs past their TTL are dropped as new ones come in
+            connection.execute("DELETE FROM job WHERE finished < ?", (now - self.ttl,))
+            connection.execute(
+                "INSERT INTO job (id, solver, data, status, created) VALUES (?, ?, ?, 'queued', ?)",
+                (job_id, solver_type, payload, now)
+            )
+
+        self._transaction(work)
+        return job_id
+
+    def claim(self):
+        '''
+            A function to take the oldest queued job for this process. Running jobs whose
+                lease has lapsed are put back in the queue first.
+
+            Returns
+            ----------
+            job: tuple
+                (job_id, solver_type, data), or None when the queue is empty.
+        '''
+        def work(connection):
+            self._recover(connection)
+
+            row = connection.execute(
+                "SELECT id, solver, data FROM job WHERE status = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+
+            now = time.time()
+            connection.execute(
+                "UPDATE job SET status = 'running', worker = ?, started = ?, lease = ?, attempts = attempts + 1 WHERE id = ?",
+                (os.getpid(), now, now + self.lease, row[0])
+            )
+            return row[0], row[1], json.loads(row[2])
+
+        return self._transaction(work)
+
+    def renew(self, job_ids):
+        '''
+            A function to extend the leases of the running jobs of this process.
+        '''
+        if not job_ids:
+            return
+
+        lease = time.time() + self.lease
+        self._transaction(lambda connection: connection.executemany(
+            "UPDATE job SET lease = ? WHERE id = ? AND status = 'running'", [(lease, job_id) for job_id in job_ids]
+        ))
+
+    def _recover(self, connection):
+        # Jobs claimed before leases existed get the job budget from their start
+        lapsed = connection.execute(
+            "SELECT id, attempts FROM job WHERE status = 'running' AND COALESCE(lease, started + ?) < ?",
+            (JOB_TIMEOUT, time.time())
+        ).fetchall()
+        for job_id, attempts in lapsed:
+            if attempts >= MAX_ATTEMPTS:
+                outcome = {'ok': False, 'error': 'Solver failed', 'message': 'The job was interrupted too many times'}
+                connection.execute(
+                    "UPDATE job SET status = 'failed', outcome = ?, finished = ? WHERE id = ?",
+                    (json.dumps(outcome), time.time(), job_id)
+                )
+            else:
+                logger.warning("requeued interrupted job", extra={"jobId": job_id, "attempts": attempts})
+                connection.execute("UPDATE job SET status = 'queued', worker = NULL, lease = NULL WHERE id = ?", (job_id,))
+
+    def finish(self, job_id, outcome):
+        '''
+            A function to store the outcome of a job: {"ok": true, "result": ...} or
+                {"ok": false, "error": ..., "message": ...}.
+        '''
+        status = 'done' if outcome.get('ok') else 'failed'
+        payload = json.dumps(outcome, ensure_ascii=False, separators=(',', ':'), default=str)
+
+        self._transaction(lambda connection: connection.execute(
+            "UPDATE job SET status = ?, outcome = ?, finished = ? WHERE id = ?",
+            (status, payload, time.time(), job_id)
+        ))
+
+    def get(self, job_id):
+        '''
+            A function to look up a job.
+
+            Returns
+            ----------
+            job: dict
+                Its status and timestamps, its place in the queue while queued, and its
+                    outcome once finished. None for unknown (or expired) jobs.
+        '''
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT solver, status, outcome, created, started, finished FROM job WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        solver_type, status, outcome, created, started, finished = row
+        job = {
+            "id": job_id,
+            "solver": solver_type,
+            "status": status,
+            "createdAt": created,
+            "startedAt": started,
+            "finishedAt": finished
+        }
+
+        if status == 'queued':
+            job["position"] = connection.execute(
+                "SELECT COUNT(*) FROM job WHERE status = 'queued' AND created < ?", (created,)
+            ).fetchone()[0]
+        if outcome is not None:
+            job.update(json.loads(outcome))
+
+        return job
+
+    def counts(self):
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM job GROUP BY status").fetchall()
+        return dict(rows)
+
+
+class Workers:
+    '''
+        Threads that claim jobs off the queue and run them, started on first use in each
+            process, and one more that renews the leases of the jobs they are running.
+
+        Parameters
+        ----------
+        queue (JobQueue):
+            The queue to work
+        run (function):
+            Takes (job_id, solver_type, data) and returns the job's outcome dict. Expected
+                not to raise.
+        size (int):
+            The number of threads
+    '''
+    def __init__(self, queue, run, size):
+        self.queue = queue
+        self.run = run
+        self.size = size
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._running = set()
+
+    def start(self):
+        # A forked child (e.g. a gunicorn worker) needs threads of its own
+        if self._pid == os.getpid() or self.size <= 0:
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+
+            # Jobs running in the parent don't run in a forked child
+            self._running = set()
+            for index in range(self.size):
+                threading.Thread(target=self._loop, name=f"job-worker-{index}", daemon=True).start()
+            threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True).start()
+
+    def notify(self):
+        # A job was queued in this process, skip the rest of the poll interval
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            try:
+                job = self.queue.claim()
+            except (sqlite3.Error, OSError):
+                logger.exception("could not claim a job")
+                job = None
+
+            if job is None:
+                self._wake.wait(POLL_SECONDS)
+                self._wake.clear()
+                continue
+
+            job_id, solver_type, data = job
+            with self._lock:
+                self._running.add(job_id)
+            try:
+                outcome = self.run(job_id, solver_type, data)
+            finally:
+                with self._lock:
+                    self._running.discard(job_id)
+
+            try:
+                self.queue.finish(job_id, outcome)
+            except (sqlite3.Error, OSError):
+                logger.exception("could not store a job outcome", extra={"jobId": job_id})
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(self.queue.lease / 3)
+            with self._lock:
+                running = list(self._running)
+
+            try:
+                self.queue.renew(running)
+            except (sqlite3.Error, OSError):
+                logger.exception("could not renew job leases")
+
+
+# The queue shared by every worker process on the node
+queue = JobQueue(os.getenv('JOBS_DB', os.path.join(LOGS_DIR, 'jobs.db')), JOB_TTL)
@@ -0,0 +1,303 @@
+'''-----------------
+# Title: metrics.py
+# Author: Backend Team
+# Date: 10/18/2026
+# Description: Server-side per-solver instrumentation (request and error counts, latency
+#   and response size histograms with p50/p95/p99, time per stage, in-flight requests,
+#   cache hits) and the Prometheus-style /metrics endpoint that exposes it.
+-----------------'''
+
+#---Imports---#
+from flask import Blueprint, Response, request
+from bisect import bisect_left
+from contextlib import contextmanager
+import glob
+import json
+import os
+import threading
+import time
+
+from solvers.util import exceptions
+from solvers.util import spans
+
+# Init the blueprint
+metrics_bp = Blueprint('metrics', __name__)
+
+# Each gunicorn worker keeps its own numbers and publishes a snapshot here, so whichever
+#   worker answers a scrape can report the totals for the whole node.
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '../logs/metrics'))
+FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+
+# Histogram bucket upper bounds, the last bucket is +Inf
+DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+SIZE_BUCKETS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216]
+QUANTILES = [0.5, 0.95, 0.99]
+
+
+class Histogram:
+    '''
+        Bucket counts and a running sum, mergeable across processes.
+    '''
+    def __init__(self, bounds, counts=None, total=0.0):
+        self.bounds = bounds
+        self.counts = counts or [0] * (len(bounds) + 1)
+        self.total = total
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+
+    def quantile(self, q):
+        '''
+            Estimates a quantile by interpolating inside the bucket it falls in, the same
+                way Prometheus' histogram_quantile does.
+        '''
+        count = sum(self.counts)
+        if count == 0:
+            return None
+
+        rank = q * count
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            if seen + bucket >= rank and bucket:
+                if index == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[index - 1] if index else 0
+                return lower + (self.bounds[index] - lower) * (rank - seen) / bucket
+            seen += bucket
+
+        return self.bounds[-1]
+
+
+class SolverMetrics:
+    '''
+        The per-process metrics of every solver route. Thread-safe.
+    '''
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.errors = {}
+        self.cache_hits = {}
+        self.coalesced_solves = {}
+        self.in_flight = {}
+        self.stages = {}
+        self.durations = {}
+        self.sizes = {}
+        self._flushed = 0.0
+
+    @contextmanager
+    def track(self, solver):
+        '''
+            A context manager around one solve: counts it, times it and its stages, records
+                how it failed (if it did) and keeps the in-flight gauge up to date.
+        '''
+        with self._lock:
+            self.in_flight[solver] = self.in_flight.get(solver, 0) + 1
+        start = time.perf_counter()
+        kind = None
+        recorder = None
+
+        try:
+            with spans.collect() as recorder:
+                yield
+        except exceptions.CalculateError:
+            kind = 'calculation'
+            raise
+        except exceptions.SolverTimeoutError:
+            kind = 'timeout'
+            raise
+        except exceptions.ProblemTooLargeError:
+            kind = 'rejected'
+            raise
+        except exceptions.ServerBusyError:
+            kind = 'busy'
+            raise
+        except Exception:
+            kind = 'exception'
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.in_flight[solver] -= 1
+                self.requests[solver] = self.requests.get(solver, 0) + 1
+                self.durations.setdefault(solver, Histogram(DURATION_BUCKETS)).observe(elapsed)
+                if kind is not None:
+                    self.errors[(solver, kind)] = self.errors.get((solver, kind), 0) + 1
+            if recorder is not None:
+                self.observe_stages(solver, recorder.totals)
+            self.maybe_flush()
+
+    def cache_hit(self, solver):
+        with self._lock:
+            self.cache_hits[solver] = self.cache_hits.get(solver, 0) + 1
+
+    def coalesced(self, solver):
+        with self._lock:
+            self.coalesced_solves[solver] = self.coalesced_solves.get(solver, 0) + 1
+
+    def observe_stages(self, solver, totals):
+        # Stage timings in ms, as recorded by spans
+        with self._lock:
+            for stage, ms in totals.items():
+                self.stages[(solver, stage)] = self.stages.get((solver, stage), 0.0) + ms / 1000
+
+    def observe_response(self, solver, size, stages=None):
+        with self._lock:
+            self.sizes.setdefault(solver, Histogram(SIZE_BUCKETS)).observe(size)
+        if stages:
+            self.observe_stages(solver, stages)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "errors": [[solver, kind, count] for (solver, kind), count in self.errors.items()],
+                "cacheHits": dict(self.cache_hits),
+                "coalesced": dict(self.coalesced_solves),
+                "inFlight": dict(self.in_flight),
+                "stages": [[solver, stage, seconds] for (solver, stage), seconds in self.stages.items()],
+                "durations": {solver: [h.counts, h.total] for solver, h in self.durations.items()},
+                "sizes": {solver: [h.counts, h.total] for solver, h in self.sizes.items()}
+            }
+
+    def maybe_flush(self, force=False):
+        # Publish this worker's snapshot for the other workers, at most every FLUSH_SECONDS
+        now = time.monotonic()
+        if not force and now - self._flushed < FLUSH_SECONDS:
+            return
+        self._flushed = now
+
+        try:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            path = os.path.join(METRICS_DIR, f"{os.getpid()}.json")
+            with open(path + '.tmp', 'w') as file:
+                json.dump(self.snapshot(), file)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass
+
+
+# The metrics of this process
+solvers = SolverMetrics()
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def collect():
+    '''
+        A function to merge the snapshots of every live worker on the node (this one
+            included). Snapshots of workers that have exited are removed.
+
+        Returns
+        ----------
+        merged: dict
+            Counters summed per solver and histograms merged bucket by bucket.
+    '''
+    solvers.maybe_flush(force=True)
+
+    merged = {"requests": {}, "errors": {}, "cacheHits": {}, "coalesced": {}, "inFlight": {}, "stages": {}, "durations": {}, "sizes": {}}
+    for path in glob.glob(os.path.join(METRICS_DIR, '*.json')):
+        pid = int(os.path.basename(path).split('.')[0])
+        if not _alive(pid):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+
+        try:
+            with open(path) as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            continue
+
+        for field in ("requests", "cacheHits", "coalesced", "inFlight"):
+            for solver, count in snapshot.get(field, {}).items():
+                merged[field][solver] = merged[field].get(solver, 0) + count
+        for field in ("errors", "stages"):
+            for solver, label, value in snapshot[field]:
+                merged[field][(solver, label)] = merged[field].get((solver, label), 0) + value
+        for field, bounds in (("durations", DURATION_BUCKETS), ("sizes", SIZE_BUCKETS)):
+            for solver, (counts, total) in snapshot[field].items():
+                merged[field].setdefault(solver, Histogram(bounds)).merge(Histogram(bounds, counts, total))
+
+    return merged
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render(merged):
+    '''
+        A function to format merged metrics in the Prometheus text exposition format.
+    '''
+    lines = []
+
+    def counter(name, help_text, kind, values):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in values:
+            label_text = ','.join(f'{key}="{_label(val)}"' for key, val in labels)
+            lines.append(f"{name}{{{label_text}}} {value}")
+
+    counter("solver_requests_total", "Solves by route, cache hits included.", "counter",
+        [((("solver", s),), n) for s, n in sorted(merged["requests"].items())])
+    counter("solver_errors_total", "Failed solves by route and kind (calculation, timeout, rejected, busy, exception).", "counter",
+        [((("solver", s), ("kind", k)), n) for (s, k), n in sorted(merged["errors"].items())])
+    counter("solver_cache_hits_total", "Solves answered from the result cache.", "counter",
+        [((("solver", s),), n) for s, n in sorted(merged["cacheHits"].items())])
+    counter("solver_coalesced_total", "Solves answered by sharing a concurrent identical solve.", "counter",
+        [((("solver", s),), n) for s, n in sorted(merged["coalesced"].items())])
+    counter("solver_in_flight", "Solves currently running.", "gauge",
+        [((("solver", s),), n) for s, n in sorted(merged["inFlight"].items())])
+    counter("solver_stage_seconds_total", "Time spent per stage (cache, import, parse, compute, render, dispatch, serialize).", "counter",
+        [((("solver", s), ("stage", k)), n) for (s, k), n in sorted(merged["stages"].items())])
+
+    for name, help_text, field in (
+        ("solver_request_duration_seconds", "Time spent in solve_algorithim.", "durations"),
+        ("solver_response_bytes", "Size of the encoded /solve response.", "sizes")
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for solver, histogram in sorted(merged[field].items()):
+            label = f'solver="{_label(solver)}"'
+            cumulative = 0
+            for bound, count in zip(histogram.bounds + ['+Inf'], histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{label}}} {histogram.total}")
+            lines.append(f"{name}_count{{{label}}} {cumulative}")
+
+    lines.append("# HELP solver_request_duration_quantile_seconds p50/p95/p99 estimated from the latency histogram.")
+    lines.append("# TYPE solver_request_duration_quantile_seconds gauge")
+    for solver, histogram in sorted(merged["durations"].items()):
+        for q in QUANTILES:
+            value = histogram.quantile(q)
+            if value is not None:
+                lines.append(f'solver_request_duration_quantile_seconds{{solver="{_label(solver)}",quantile="{q}"}} {value}')
+
+    return '\n'.join(lines) + '\n'
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    '''
+        A scrape endpoint exposing the solver metrics of every worker on the node. When
+            METRICS_TOKEN is set, scrapers must send it as a Bearer token.
+    '''
+    token = os.getenv('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f"Bearer {token}":
+        return Response("Unauthorized\n", status=401, mimetype='text/plain')
+
+    return Response(render(collect()), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,262 @@
+'''-----------------
+# Title: registry.py
+# Author: Backend Team
+# Date: 10/18/2026
+# Description: Declarative registry mapping each /solve route to a lazily imported solver.
+-----------------'''
+
+#---Imports---#
+import importlib
+import os
+import sys
+
+# Append the backend directory to the path so the solvers can import their utility
+#   modules, regardless of which solver happens to be imported first.
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from solvers.util import formats
+from solvers.util import strings
+from solvers.util import spans
+from backend import admission
+
+
+def load_solver(module_name):
+    '''
+        A function to import a solver module on first use.
+
+        Parameters
+        ----------
+        module_name (str):
+            The module name inside backend/solvers, e.g. 'wff_solver'
+
+        Returns
+        ----------
+        module: module
+            The imported solver module. Python caches it after the first call.
+    '''
+    return importlib.import_module(f"backend.solvers.{module_name}")
+
+
+class SolverEntry:
+    '''
+        A single route in the registry. The solver module is not imported until the
+            first request for the route (or until it is warmed up).
+
+        Parameters
+        ----------
+        module_name (str):
+            The solver module inside backend/solvers
+        call (function):
+            An adapter taking (solver_module, data) that unpacks the request payload
+                and calls the solver.
+        canonical (dict):
+            Optional payload field -> normalizer used to canonicalize the input for its
+                cache key (see cache.canonicalize). The solver gets the payload as sent.
+        timeout (float):
+            Optional wall-clock budget in seconds when solved in the process pool
+                (see executor.py). Defaults to SOLVER_TIMEOUT.
+        admission (CostLimit):
+            Optional cost estimate and limit checked before solving, to reject or downgrade
+                oversized problems (see admission.py).
+        images (bool):
+            Whether the route draws diagrams. Its payload may then carry an "imageFormat"
+                (png, svg or graph, see formats.py), which is taken out before the adapter runs.
+        stream (function):
+            Optional adapter taking (solver_module, data) that returns a generator of the
+                result in parts, each a list of lines, for /solve/<solver_type>/stream.
+    '''
+    def __init__(self, module_name, call, canonical=None, timeout=None, admission=None, images=False, stream=None):
+        self.module_name = module_name
+        self.call = call
+        self.canonical = canonical or {}
+        self.timeout = timeout
+        self.admission = admission
+        self.images = images
+        self.stream = stream
+
+    def load(self):
+        return load_solver(self.module_name)
+
+    def solve(self, data):
+        # The first solve of a route pays for its imports, keep that out of 'compute'
+        with spans.span('import'):
+            solver = self.load()
+
+        if self.images and isinstance(data, dict) and 'imageFormat' in data:
+            data = dict(data)
+            with formats.use(data.pop('imageFormat')):
+                return self.call(solver, data)
+
+        return self.call(solver, data)
+
+
+#---Adapters for the payloads that need more than a one-liner---#
+def _solve_power_set(solver, data):
+    sets_dict = data.get("sets", {})
+    iterations = data.get("iterations", 1)
+
+    return solver.solve(sets_dict, iterations)
+
+def _solve_order_of_magnitude(solver, data):
+    # Parse the input data from the frontend
+    order = int(data.get("order", 0))
+    scalars_f = data.get("coefficients1", [])
+    scalars_g = data.get("coefficients2", [])
+    use_root = data.get("useRoot", False)
+
+    return solver.solve(order, scalars_f, scalars_g, use_root)
+
+def _solve_boolean_matrices(solver, data):
+    if data["operation"] == "MEET/JOIN":
+        return solver.solve(data["matrix1"], data["matrix2"])
+
+    return load_solver('matrix_multiply_solver').solve(data["matrix1"], data["matrix2"])
+
+def _solve_tree_notation(solver, data):
+    # Map the operation number to the corresponding function name
+    operation_num = int(data.get("operation", 1))
+    operation_map = {
+        1: 'build_from_level',
+        2: 'build_from_table',
+        3: 'reconstruct_from_preorder',
+        4: 'reconstruct_from_postorder',
+        5: 'build_from_math'
+    }
+    operation = operation_map.get(operation_num)
+
+    return solver.solve(data["input"], data["secondaryInput"], operation)
+
+
+#---Canonical forms shared by several routes---#
+# Whitespace, element order and duplicates don't change the meaning of a set or relation
+SET_AND_RELATION = {'set': strings.canonical_set, 'relation': strings.canonical_set}
+
+# Edge lists keep their order (it decides node order in the matrices), only spacing is normalized
+EDGE_LIST = {
+    'pairs': strings.canonical_whitespace,
+    'secondInput': strings.canonical_whitespace,
+    'input': strings.canonical_whitespace
+}
+
+
+# Route name (as used in /solve/<solver_type>) -> solver entry
+SOLVERS = {
+    'wff': SolverEntry('wff_solver',
+        lambda solver, data: solver.solve(data['formula'], data.get('tableFormat', 'rows')),
+        canonical={'formula': strings.canonical_formula},
+        admission=admission.CostLimit(admission.wff_cost, 2 ** 20,
+            downgrade=lambda data: load_solver('wff_solver').summarize(data['formula']), queue_limit=2 ** 24),
+        stream=lambda solver, data: solver.stream(data['formula'])),
+    'propositional-logic': SolverEntry('propositional_solver',
+        lambda solver, data: solver.solve(data["hypotheses"]['hypotheses'], data["hypotheses"]['conclusion']),
+        canonical={'hypotheses': strings.canonical_formula}),
+    'recursive-definitions': SolverEntry('recursion_solver',
+        lambda solver, data: solver.solve(data['formula'], data['baseCase'], data['n'])),
+    'basic-set-functions': SolverEntry('set_function_solver',
+        lambda solver, data: solver.solve(data)),
+    'power-set': SolverEntry('power_set_solver', _solve_power_set,
+        canonical={'sets': strings.canonical_set},
+        admission=admission.CostLimit(admission.power_set_cost, 2 ** 16,
+            downgrade=admission.power_set_summary, queue_limit=2 ** 20)),
+    'set-complement': SolverEntry('set_complement_solver',
+        lambda solver, data: solver.solve(data["universal_set"], data["subset"]),
+        canonical={'universal_set': strings.canonical_set, 'subset': strings.canonical_set}),
+    'binary-unary-operators': SolverEntry('binary_unary_solver',
+        lambda solver, data: solver.solve(
+            data.get('choice', '1'),
+            data.get('set', ''),
+            data.get('table', []),
+            data.get('expression', '')
+        ),
+        admission=admission.CostLimit(admission.binary_unary_cost, 10 ** 6, queue_limit=10 ** 7)),
+    'cartesian-products': SolverEntry('cartesian_product_solver',
+        lambda solver, data: solver.solve(data["setOne"], data["setTwo"]),
+        admission=admission.CostLimit(admission.cartesian_cost, 10 ** 6, queue_limit=10 ** 7)),
+    'properties-of-relations': SolverEntry('properties_solver',
+        lambda solver, data: solver.solve(data["set"], data["relation"]),
+        canonical=SET_AND_RELATION),
+    'closure-axioms': SolverEntry('closures_solver',
+        lambda solver, data: solver.solve(data["set"], data["relation"]),
+        canonical=SET_AND_RELATION),
+    'partitions': SolverEntry('partition_solver',
+        lambda solver, data: solver.solve(data["set"], data["relation"]),
+        canonical=SET_AND_RELATION),
+    'partial-orderings': SolverEntry('special_solver',
+        lambda solver, data: solver.solve(data["set"], data["relation"]),
+        canonical=SET_AND_RELATION),
+    'hasse-diagrams': SolverEntry('hasse_solver',
+        lambda solver, data: solver.solve(data["set"], data["relation"]),
+        canonical=SET_AND_RELATION,
+        images=True),
+    'critical-paths': SolverEntry('critical_solver',
+        lambda solver, data: solver.solve(data)),
+    'pert-diagrams': SolverEntry('table_solver',
+        lambda solver, data: solver.solve(data),
+        images=True),
+    'topological-sorting': SolverEntry('topological_solver',
+        lambda solver, data: solver.solve(data)),
+    'permutations-cycle': SolverEntry('cycle_solver',
+        lambda solver, data: solver.solve(data['input'])),
+    'compositions': SolverEntry('compositions_solver',
+        lambda solver, data: solver.solve(data['setOne']['setOne'], data['setOne']['setTwo'])),
+    'disjoint-cycles': SolverEntry('disjoint_solver',
+        lambda solver, data: solver.solve(data['input'])),
+    'order-of-magnitude': SolverEntry('order_solver', _solve_order_of_magnitude),
+    'master-theorem': SolverEntry('master_solver',
+        lambda solver, data: solver.solve(data["a"], data["b"], data["c"])),
+    'boolean-matrices': SolverEntry('matrix_solver', _solve_boolean_matrices),
+    'graphs': SolverEntry('graph_solver',
+        lambda solver, data: solver.solve(data["pairs"], data["type"], data["isIsomorphic"], data["secondInput"]),
+        canonical=EDGE_LIST,
+        images=True),
+    'adjacency-matrices-lists': SolverEntry('adjacency_solver',
+        lambda solver, data: solver.solve(data["input"], data["type"]),
+        canonical=EDGE_LIST,
+        images=True),
+    'weighted-graphs': SolverEntry('weighted_graph_solver',
+        lambda solver, data: solver.solve(data["input"], data["type"]),
+        canonical=EDGE_LIST,
+        images=True),
+    'binary-trees': SolverEntry('binary_trees_solver',
+        lambda solver, data: solver.solve(data["input"], data["choice"]),
+        images=True),
+    'array-to-tree': SolverEntry('array_to_tree_solver',
+        lambda solver, data: solver.solve(data["input"]),
+        images=True),
+    'tree-to-array': SolverEntry('tree_to_array_solver',
+        lambda solver, data: solver.solve(data["input"], data["choice"]),
+        images=True),
+    'tree-notation': SolverEntry('tree_notation_solver', _solve_tree_notation, images=True),
+    'warshalls-algorithm': SolverEntry('Warshall_solver',
+        lambda solver, data: solver.solve(data["input"])),
+}
+
+
+def warm_up(routes):
+    '''
+        A function to import the solvers for a list of routes ahead of the first request.
+
+        Parameters
+        ----------
+        routes (str):
+            A comma separated list of route names, e.g. "wff,hasse-diagrams", or "all".
+                Usually sourced from the SOLVER_WARMUP environment variable.
+
+        Returns
+        ----------
+        warmed: list
+            The routes that were imported.
+    '''
+    names = [name.strip() for name in routes.split(',') if name.strip()]
+    if 'all' in names:
+        names = list(SOLVERS)
+
+    warmed = []
+    for name in names:
+        entry = SOLVERS.get(name)
+        if entry is None:
+            continue
+
+        entry.load()
+        warmed.append(name)
+
+    return warmed
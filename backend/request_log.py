@@ -0,0 +1,167 @@
+'''-----------------
+# Title: request_log.py
+# Author: Backend Team
+# Date: 10/18/2026
+# Description: Structured (one JSON object per line) logging for the backend. Every request
+#   gets an ID, a per-stage timing breakdown (also sent to the client as a Server-Timing
+#   header) and a size summary of its payloads, and the per-request summary line can be
+#   sampled so busy workers don't flood the log pipeline.
+-----------------'''
+
+#---Imports---#
+import contextvars
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+
+from flask import g, request
+
+from solvers.util import spans
+
+logger = logging.getLogger('backend.requests')
+
+# LOG_LEVEL applies to every logger. LOG_SAMPLE_RATE is the fraction of successful requests
+#   whose summary is logged; errors and requests slower than LOG_SLOW_MS are always logged.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', '1.0'))
+LOG_SLOW_MS = float(os.getenv('LOG_SLOW_MS', '1000'))
+
+# The current request's ID, visible to any code running for the request
+request_id = contextvars.ContextVar('request_id', default=None)
+
+# Stage timings are recorded with the spans used throughout the solvers, e.g.
+#   `with request_log.stage('serialize'): ...`
+stage = spans.span
+
+
+class JsonFormatter(logging.Formatter):
+    '''
+        Formats a record as a single line of JSON. Anything passed through `extra=` is
+            included as a field, along with the ID of the request being served.
+    '''
+    # Attributes every LogRecord has, so they aren't mistaken for extra fields
+    RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+
+        rid = request_id.get()
+        if rid is not None:
+            entry["requestId"] = rid
+
+        for key, value in vars(record).items():
+            if key not in self.RESERVED:
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str, separators=(',', ':'))
+
+
+def configure():
+    '''
+        A function to route every logger through one JSON handler on stderr. Safe to call
+            more than once, e.g. from each solver process.
+    '''
+    root = logging.getLogger()
+    if any(isinstance(handler.formatter, JsonFormatter) for handler in root.handlers):
+        return
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter())
+    root.addHandler(handler)
+    root.setLevel(LOG_LEVEL)
+
+
+def summarize(payload):
+    '''
+        A function to describe a payload without logging it, e.g. a multi-megabyte truth
+            table or base64 image.
+
+        Returns
+        ----------
+        summary: dict
+            The payload's type, encoded size in bytes and top level keys or length.
+    '''
+    if isinstance(payload, (bytes, bytearray)):
+        return {"type": "bytes", "bytes": len(payload)}
+
+    try:
+        size = len(json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        size = None
+
+    summary = {"type": type(payload).__name__, "bytes": size}
+    if isinstance(payload, dict):
+        summary["keys"] = list(payload)[:20]
+    elif isinstance(payload, (list, tuple, str)):
+        summary["length"] = len(payload)
+
+    return summary
+
+
+def stages():
+    # The stage timings (ms) recorded so far for the current request
+    return spans.totals()
+
+def server_timing(timings):
+    # e.g. "cache;dur=0.41, parse;dur=1.20, compute;dur=35.02, render;dur=80.13"
+    return ', '.join(f"{name};dur={ms:.2f}" for name, ms in timings.items())
+
+
+def _before_request():
+    g.request_start = time.perf_counter()
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+    g.log_tokens = (request_id.set(g.request_id), spans.start())
+
+def _after_request(response):
+    duration = (time.perf_counter() - g.get('request_start', time.perf_counter())) * 1000
+    response.headers['X-Request-ID'] = g.get('request_id', '')
+
+    timings = stages()
+    if timings:
+        response.headers['Server-Timing'] = server_timing(timings)
+
+    failed = response.status_code >= 400
+    if failed or duration >= LOG_SLOW_MS or random.random() < LOG_SAMPLE_RATE:
+        logger.log(
+            logging.WARNING if response.status_code >= 500 else logging.INFO,
+            "%s %s %s", request.method, request.path, response.status_code,
+            extra={
+                "status": response.status_code,
+                "durationMs": round(duration, 2),
+                "stagesMs": {name: round(ms, 2) for name, ms in timings.items()},
+                "requestBytes": request.content_length or 0,
+                # Streamed responses have no length yet, and asking would buffer them
+                "responseBytes": None if response.is_streamed else response.calculate_content_length(),
+                "solver": g.get('solver_type')
+            }
+        )
+
+    return response
+
+def _teardown_request(exc):
+    tokens = g.pop('log_tokens', None)
+    if tokens is not None:
+        request_id.reset(tokens[0])
+        spans.stop(tokens[1])
+
+
+def init_app(app):
+    '''
+        A function to install structured logging and the per-request hooks on the app.
+    '''
+    configure()
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
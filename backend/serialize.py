@@ -0,0 +1,60 @@
+'''-----------------
+# Title: serialize.py
+# Author: Backend Team
+# Date: 10/18/2026
+# Description: The single place solver results are turned into JSON. Solvers return plain
+#   Python structures and the controller encodes them once here, with orjson when it is
+#   installed and compact separators either way.
+-----------------'''
+
+#---Imports---#
+import json
+import os
+
+from flask import Response
+
+# orjson is optional, fall back to the standard library when it isn't installed
+#   (or when JSON_ENCODER=json, e.g. to rule the encoder out while debugging).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if os.getenv('JSON_ENCODER', 'orjson') == 'json':
+    orjson = None
+
+
+def dumps(obj):
+    '''
+        A function to encode a solver result as compact UTF-8 JSON.
+
+        Parameters
+        ----------
+        obj (json):
+            Any structure json.dumps accepts.
+
+        Returns
+        ----------
+        body: bytes
+            The encoded JSON.
+    '''
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            # e.g. integers past 64 bits, which the standard library still handles
+            pass
+
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def response(obj, status=200):
+    '''
+        A function to build the JSON response for a solver result.
+
+        Returns
+        ----------
+        response: Response
+            An application/json response with the encoded body.
+    '''
+    return Response(dumps(obj), status=status, mimetype='application/json')
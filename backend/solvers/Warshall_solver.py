@@ -6,14 +6,9 @@
 -----------------'''
 
 import math
-import json
 
 def solve(matrix):
     V = len(matrix)
-    print("beginning graph:")
-    print(matrix)
-    print("\n")
-    print("intermediate graphs")
     matriix = []
     
     for k in range(V):
@@ -38,4 +33,4 @@ def solve(matrix):
         truth_table["Matrix " + str(noOfMatrix)] = row
         noOfMatrix += 1
 
-    return json.dumps(truth_table)
+    return truth_table
@@ -2,13 +2,13 @@
 #Part 2, adjacency matrix/lists
 # Author: Michael Lowder
 
+import os
+import sys
 import networkx as nx
-import matplotlib
-import matplotlib.pyplot as plt
-import json
-matplotlib.use('Agg') # Use to generate diagrams without displaying them
-from io import BytesIO
-import base64
+
+# Append the parent directory to the path so we can import in utility
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from solvers.util import render
 
 
 def solve(graphInput, graphType):
@@ -47,10 +47,10 @@ def solve(graphInput, graphType):
             "List": adj_list
         }
 
-        return json.dumps(result)
+        return result
     
     except Exception:
-        return json.dumps({"error": "An error occurred. Please check your input and try again."})
+        return {"error": "An error occurred. Please check your input and try again."}
 
 
 def get_graph_input(input_list, graphType):
@@ -92,19 +92,9 @@ def plot_graph(G):
             A base64 encoded image string of the graphs.
     '''
 
-    # Plot the graph
-    plt.figure(figsize=(6, 4))
-    pos = nx.spring_layout(G)  # Layout for visualization
-    nx.draw(G, pos, with_labels=True, node_color='skyblue', edge_color='gray', node_size=2000, font_size=15, font_weight="bold", arrows=True)
-
-    # Convert to base64 encoded image
-    plt.title("Graph Visualization")
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png', bbox_inches='tight')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    print(img_data)
-    plt.close()
+    # Plot the graph, laid out by render.graph_layout
+    img_data = render.graph_image(G, style='graph', title="Graph Visualization", figsize=(6, 4),
+        savefig={'bbox_inches': 'tight'})
     return img_data
 
 def get_adjacency_matrix(G):
@@ -5,11 +5,12 @@
 # Description: A solver for generating array representations to binary trees
 -----------------'''
 
-import networkx as nx
-import matplotlib.pyplot as plt
-import base64
-from io import BytesIO
-import json
+import os
+import sys
+
+# Append the parent directory to the path so we can import in utility
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from solvers.util import render
 
 class Node:
     def __init__(self, value):
@@ -54,44 +55,19 @@ def build_tree_from_table(input_data):
         
     return node_map[root_value], edges
 
-def add_edges(graph, root, pos, x=0, y=0, level=1):
-    """Recursively add edges to the graph for visualization."""
-    if root:
-        pos[root.value] = (x, y)
-        if root.left:
-            graph.add_edge(root.value, root.left.value)
-            add_edges(graph, root.left, pos, x - 1 / 2**level, y - 1, level + 1)
-        if root.right:
-            graph.add_edge(root.value, root.right.value)
-            add_edges(graph, root.right, pos, x + 1 / 2**level, y - 1, level + 1)
-
 def draw_tree(root):
     """Draws the binary tree using networkx and matplotlib."""
-    graph = nx.DiGraph()
-    pos = {}
-    add_edges(graph, root, pos)
-    
-    plt.figure(figsize=(8, 6))
-    nx.draw(
-        graph, 
-        pos, 
-        with_labels=True, 
-        node_size=2000, 
-        node_color="lightblue", 
-        font_size=12, 
+    graph, pos = render.tree_layout(root)
+    return render.graph_image(
+        graph,
+        pos,
+        style='tree',
+        figsize=(8, 6),
+        font_size=12,
         font_weight='bold',
-        edge_color="gray",
-        arrows=True
+        arrows=True,
+        savefig={'dpi': 120, 'bbox_inches': 'tight'}
     )
-    
-    # Save to base64 string
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png', dpi=120, bbox_inches='tight')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    plt.close()
-    
-    return img_data
 
 def get_node_list(root):
     """Returns a list of all nodes in the tree using breadth-first traversal."""
@@ -188,4 +164,4 @@ def solve(input_data):
             "error": f"An error occurred: {str(e)}"
         }
     
-    return json.dumps(result)
\ No newline at end of file
+    return result
\ No newline at end of file
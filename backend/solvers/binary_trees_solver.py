@@ -5,13 +5,14 @@
 # Description: A solver for generating binary trees
 -----------------'''
 
+import os
+import sys
 from collections import deque
 import re
-import networkx as nx
-import matplotlib.pyplot as plt
-from io import BytesIO
-import base64
-import json
+
+# Append the parent directory to the path so we can import in utility
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from solvers.util import render
 
 class Node:
     """Node class for binary tree representation"""
@@ -140,33 +141,10 @@ def build_tree_from_input(input_str):
     
     return root
 
-def add_edges(graph, root, pos, x=0, y=0, level=1):
-    """Recursively add edges to the graph."""
-    if root:
-        pos[root.value] = (x, y)
-        if root.left:
-            graph.add_edge(root.value, root.left.value)
-            add_edges(graph, root.left, pos, x - 1 / 2**level, y - 1, level + 1)
-        if root.right:
-            graph.add_edge(root.value, root.right.value)
-            add_edges(graph, root.right, pos, x + 1 / 2**level, y - 1, level + 1)
-
 def draw_tree(root):
     """Draws a binary tree using networkx and matplotlib."""
-    graph = nx.DiGraph()
-    pos = {}
-    add_edges(graph, root, pos)
-    plt.figure(figsize=(6, 4))
-    nx.draw(graph, pos, with_labels=True, node_size=2000, node_color="lightblue", font_size=10, edge_color="gray")
-    plt.title("Binary Tree Visualization")
-    
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    plt.close()
-    
-    return img_data
+    graph, pos = render.tree_layout(root)
+    return render.graph_image(graph, pos, style='tree', title="Binary Tree Visualization", figsize=(6, 4))
 
 def tokenize(expression):
     """Tokenizes an expression, handling implicit multiplication."""
@@ -234,60 +212,13 @@ def build_expression_tree(postfix_tokens):
     
     return stack[0]
 
-def add_edges_for_expression_tree(graph, node, pos, node_ids, x=0, y=0, level=1, x_spacing=1.5):
-    """Recursively adds edges to the graph and positions nodes uniquely."""
-    if node:
-        node_id = node_ids[node]  # Get the unique ID for this node
-        pos[node_id] = (x, y)  # Assign position
-        
-        if node.left:
-            left_id = node_ids[node.left]
-            graph.add_edge(node_id, left_id)
-            add_edges_for_expression_tree(graph, node.left, pos, node_ids, x - x_spacing / (2 ** level), y - 1, level + 1, x_spacing)
-        
-        if node.right:
-            right_id = node_ids[node.right]
-            graph.add_edge(node_id, right_id)
-            add_edges_for_expression_tree(graph, node.right, pos, node_ids, x + x_spacing / (2 ** level), y - 1, level + 1, x_spacing)
-
 def draw_expression_tree(root):
     """Draws the binary expression tree with correct alignment."""
     if not root:
         return None
-    
-    graph = nx.DiGraph()
-    pos = {}
-    
-    # Assign unique node identifiers using their object reference
-    node_ids = {}
-    def assign_ids(node, count=[0]):  # Use a mutable default argument to keep track
-        if node:
-            node_ids[node] = f"{node.value}_{count[0]}"  # Create a unique ID
-            count[0] += 1
-            assign_ids(node.left, count)
-            assign_ids(node.right, count)
-    
-    assign_ids(root)  # Assign unique IDs before drawing
-    
-    add_edges_for_expression_tree(graph, root, pos, node_ids)
-    
-    # Create a mapping for labels, stripping the unique ID from display
-    labels = {node_ids[n]: n.value for n in node_ids}
-    
-    plt.figure(figsize=(8, 5))
-    nx.draw(graph, pos, labels=labels, 
-            with_labels=True, node_size=2000, node_color="lightblue", 
-            font_size=10, edge_color="gray")
-    
-    plt.title("Expression Tree Visualization")
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    plt.close()
-    
-    return img_data
 
+    graph, pos, labels = render.expression_tree_layout(root)
+    return render.graph_image(graph, pos, style='tree', labels=labels, title="Expression Tree Visualization", figsize=(8, 5))
 
 def solve(input, choice):
     """
@@ -374,4 +305,4 @@ def solve(input, choice):
             "error": f"An error occurred: {str(e)}"
         }
     
-    return json.dumps(result)
\ No newline at end of file
+    return result
\ No newline at end of file
@@ -7,7 +7,6 @@
 -----------------'''
 
 import re
-import json
 import os
 import sys
 import sympy as sp
@@ -285,7 +284,7 @@ def solve(choice_input, set_input, table_input, expr_input):
             raise CalculateError("Invalid choice. Please select a valid input type (1 or 2).")
 
         output_str = format_readable_output(result)
-        return json.dumps({"output": output_str})
+        return {"output": output_str}
 
     except CalculateError:
         raise
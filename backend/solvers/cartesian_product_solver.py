@@ -10,7 +10,9 @@ import math
 import re
 from fractions import Fraction
 import cmath
-import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 # empty_set = set()
 # print(empty_set)
@@ -163,7 +165,7 @@ def parse_input(input_str):
         domain, condition = match.groups()
         return domain, condition
     else:
-        print("Invalid input format. Please use {x | x ∈ Domain and condition}.")
+        logger.warning("Invalid input format. Please use {x | x ∈ Domain and condition}.")
         return None, None
 
 def preprocess_condition(condition):
@@ -191,11 +193,10 @@ def generate_set_from_builder(input_str, lower_bound=-100, upper_bound=100):
                            if lower_bound <= a / b <= upper_bound}
     elif domain == "R":  # Real numbers (simulated with floats)
         numbers = {x / 100.0 for x in range(lower_bound * 100, upper_bound * 100)}  # Higher precision
-        print(numbers)
     elif domain == "C":  # Complex numbers (limited grid of points)
         numbers = {complex(a / 10, b / 10) for a in range(-10, 11) for b in range(-10, 11)}
     else:
-        print(f"Unsupported domain: {domain}")
+        logger.warning("Unsupported domain: %s", domain)
         return "{}"
 
     # Filter numbers based on the extracted condition
@@ -203,7 +204,7 @@ def generate_set_from_builder(input_str, lower_bound=-100, upper_bound=100):
         # Evaluate the condition dynamically for each number
         generated_set = {x for x in numbers if eval(condition, {"x": x, "cmath": cmath, "math": math, "sqrt": math.sqrt, "abs": abs, "pow": pow})}
     except Exception as e:
-        print(f"Error evaluating condition: {e}")
+        logger.warning("Error evaluating condition: %s", e)
         return "{}"
     
     # frozen_generated_set = frozenset(generated_set)
@@ -252,7 +253,7 @@ def parse_set(input_str):
 
         return parsed
     except Exception as e:
-        print(f"Error parsing set: {e}")
+        logger.warning("Error parsing set: %s", e)
         return frozenset()
 
 
@@ -417,7 +418,7 @@ def solve(predefined_sets, predefined_statements):
     # Handle predefined sets
     for name, set_input, set_format in predefined_sets:
         if name in sets:
-            print(f"Set '{name}' already exists. Skipping duplicate.")
+            logger.warning("Set '%s' already exists. Skipping duplicate.", name)
             continue
 
         if set_format == "1":
@@ -425,16 +426,14 @@ def solve(predefined_sets, predefined_statements):
         elif set_format == "2":
             sets[name] = generate_set_from_builder(set_input)
         else:
-            print(f"Unknown set format '{set_format}' for set {name}. Skipping.")
+            logger.warning("Unknown set format '%s' for set %s. Skipping.", set_format, name)
 
     # Define universal set
     universal_set = frozenset().union(*sets.values())
 
-    print("\nDefined Sets:")
-    for name, value in sets.items():
-        print(f"{name} = {format_frozenset(value)}")
-
-    print(f"\nUniversal Set (U) = {format_frozenset(universal_set)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Defined sets: %s", {name: format_frozenset(value) for name, value in sets.items()})
+        logger.debug("Universal Set (U) = %s", format_frozenset(universal_set))
 
     # Evaluate predefined statements
     statements = []
@@ -445,7 +444,7 @@ def solve(predefined_sets, predefined_statements):
             result = evaluate_postfix(postfix)
             statements.append((expr, result))
         except Exception as e:
-            print(f"Error evaluating statement '{expr}': {e}")
+            logger.warning("Error evaluating statement '%s': %s", expr, e)
 
     
     # Create a dictionary to store results
@@ -453,4 +452,4 @@ def solve(predefined_sets, predefined_statements):
     for statement, result in statements:
         results.update({statement: result})
     
-    return json.dumps(results)
\ No newline at end of file
+    return results
\ No newline at end of file
@@ -2,7 +2,6 @@
 # Author: Mathias Buchanan
 # Solves: 4.4 permutation problems
 
-import json
 
 def strike(text):
     return ''.join(c + '\u0336' for c in str(text))
@@ -72,13 +71,9 @@ def solve(setOneSize, setTwoSize):
 
                         if usingNumb % t == 0 and fakeDenominator[h] % t == 0:
                             usingNumb //= t
-                            print("yo")
                             fakeDenominator[h] //= t
-                            print("yo")
                             printedString = printedString + " " + str(usingNumb)
-                            print("yo")
                             printThing[denominator[h]] = str(printThing[denominator[h]]) + " " + str(fakeDenominator[h])
-                            print(printThing[denominator[h]])
 
                         t -= 1
             h -= 1
@@ -97,7 +92,6 @@ def solve(setOneSize, setTwoSize):
         k -= 1
 
     t = 0
-    print(printThing)
     while t < denominator.__len__():
         splitString = str(printThing[denominator[t]]).split(" ")
         if splitString.__len__() == 1:
@@ -132,4 +126,4 @@ def solve(setOneSize, setTwoSize):
         "denom": denom
     }
 
-    return json.dumps(result)
\ No newline at end of file
+    return result
\ No newline at end of file
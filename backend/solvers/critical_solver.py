@@ -2,7 +2,6 @@
 # Author: Jacob Warren
 # Solves: 5.2.5 and 5.2.6
 
-import json
 import os
 import sys
 
@@ -77,4 +76,4 @@ def solve(table):
         "Minimum Time": minimum_time
     }
 
-    return json.dumps(result)
+    return result
@@ -2,7 +2,6 @@
 # Author: Jacob Warren
 # Solves: 5.4.53
 
-import json
 
 from .util import exceptions
 from .util import strings
@@ -35,7 +34,7 @@ def solve(permutation):
         "Cycle Form": cycles_string
     }
 
-    return json.dumps(result)
+    return result
 
 def not_json(permutation):
     inputs = {key for key in permutation.keys()}
@@ -4,7 +4,6 @@
 
 from solvers import cycle_solver
 
-import json
 
 from .util import exceptions
 from .util import strings
@@ -83,7 +82,7 @@ def solve(cycle_strings):
         "Disjoint Cycle Form": disjoint_string
     }
 
-    return json.dumps(result)
+    return result
 
 def string_to_list(cycle_strings):
     cycles = []
@@ -2,13 +2,13 @@
 #Part 1, graphs
 # Author: Michael Lowder
 
+import os
+import sys
 import networkx as nx
-import matplotlib
-import matplotlib.pyplot as plt
-import json
-matplotlib.use('Agg') # Use to generate diagrams without displaying them
-from io import BytesIO
-import base64
+
+# Append the parent directory to the path so we can import in utility
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from solvers.util import render
 
 #---Begin Part 1---#
 def solve(graphInput, graphType, isIsomorphic=False, secondInput=None):
@@ -75,7 +75,7 @@ def solve(graphInput, graphType, isIsomorphic=False, secondInput=None):
                 "Graph": img_data 
             }
 
-            return json.dumps(result)
+            return result
 
         else:
             # Get the graph from the input
@@ -88,7 +88,7 @@ def solve(graphInput, graphType, isIsomorphic=False, secondInput=None):
             result = {
                 "Graph": img_data 
             }
-            return json.dumps(result)
+            return result
         
     except Exception:
         return {"success": False, "error": "Something went wrong. Please check your input and try again."}
@@ -137,31 +137,25 @@ def plot_graphs(G1, G2, isomorphic):
     '''
 
     # Plot the graphs side by side
-    _, axs = plt.subplots(1, 2, figsize=(10, 5))
+    fig = render.new_figure((10, 5))
+    axs = fig.subplots(1, 2)
 
-    pos1 = nx.spring_layout(G1)
-    pos2 = nx.spring_layout(G2)
+    pos1 = render.graph_layout(G1)
+    pos2 = render.graph_layout(G2)
 
     axs[0].set_title("Graph 1")
-    nx.draw(G1, pos1, with_labels=True, node_color='lightblue', edge_color='gray', node_size=2000, font_size=15, ax=axs[0])
+    render.draw_graph(axs[0], G1, pos1, style='comparison', node_color='lightblue')
 
     axs[1].set_title("Graph 2")
-    nx.draw(G2, pos2, with_labels=True, node_color='lightcoral', edge_color='gray', node_size=2000, font_size=15, ax=axs[1])
+    render.draw_graph(axs[1], G2, pos2, style='comparison', node_color='lightcoral')
 
-    plt.suptitle(f"Graphs are Isomorphic: {isomorphic}", fontsize=14, fontweight='bold')
+    fig.suptitle(f"Graphs are Isomorphic: {isomorphic}", fontsize=14, fontweight='bold')
 
     # Adjust layout to prevent cutting off labels
-    plt.tight_layout(rect=[0, 0.03, 1, 0.95])  
-
+    fig.tight_layout(rect=[0, 0.03, 1, 0.95])
 
     # Conversion to a base64 encoded image
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png', bbox_inches='tight')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    print(img_data)
-    plt.close()
-    return img_data
+    return render.encode(fig, bbox_inches='tight')
 
 def plot_graph(G):
     '''
@@ -176,19 +170,8 @@ def plot_graph(G):
             A base64 encoded image string of the graphs.
     '''
 
-    # Plot the graph
-    plt.figure(figsize=(6, 4))
-    pos = nx.spring_layout(G)  # Layout for visualization
-    nx.draw(G, pos, with_labels=True, node_color='skyblue', edge_color='gray', node_size=2000, font_size=15, font_weight="bold", arrows=True)
-
-    # Convert to base64 encoded image
-    plt.title("Graph Visualization")
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    print(img_data)
-    plt.close()
+    # Plot the graph, laid out by render.graph_layout
+    img_data = render.graph_image(G, style='graph', title="Graph Visualization", figsize=(6, 4))
     return img_data
 
 #-----------------End of Part 1------------------
@@ -4,7 +4,6 @@
 
 import os
 import sys
-import json
 import networkx as nx
 
 # Append the parent directory to the path so we can import in utility
@@ -13,7 +12,7 @@ from solvers.util import strings
 from solvers.util import methods
 from solvers import properties_solver
 from solvers.util import exceptions
-from solvers.util import images
+from solvers.util import render
 
 '''
 ==========
@@ -51,7 +50,7 @@ def solve(set_string, relation_string):
         "Hasse Diagram": img_data 
     }
 
-    return json.dumps(result)
+    return result
 
 def generate_diagram(set_list, relation):
     # determine the layer each element is in
@@ -65,5 +64,5 @@ def generate_diagram(set_list, relation):
     graph.add_edges_from([(set_list[a], set_list[b]) for (a, b) in relation])
     pos = nx.multipartite_layout(graph, subset_key=layers, align="horizontal")
 
-    return images.graph_to_base64(graph, pos)
+    return render.graph_image(graph, pos)
 
@@ -2,7 +2,6 @@
 # Author: Jacob Warren
 # Solves: 5.5.21-5.5.26
 
-import json
 import math
 import sys
 import os
@@ -52,4 +51,4 @@ def solve(a, b, c):
         else:
             result["Result"] = f"S(n)=\\Theta(n^{{{d:.2f}}})"
 
-    return json.dumps(result)
+    return result
@@ -2,7 +2,6 @@
 # Author: Jacob Warren
 # Solves: 5.7.47-5.7.50
 
-import json
 import os
 import sys
 
@@ -42,7 +41,7 @@ def solve(A, B):
         "Product": C
     }
 
-    return json.dumps(result)
+    return result
 
 def _preprocess_input(A,B):
     A = [[int(j) for j in i] for i in A]
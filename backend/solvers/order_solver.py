@@ -2,7 +2,6 @@
 # Author: Jacob Warren
 # Solves: 5.5.1-5.5.6
 
-import json
 import os
 import sys
 
@@ -78,4 +77,4 @@ def solve(order, scalars_f, scalars_g, root):
         "Result": f"\\forall x\\geq {n_0:.2f}, {c_1:.2f}g(x)\\leq f(x)\\leq {c_2:.2f}g(x)"
     }
 
-    return json.dumps(result)
+    return result
@@ -4,7 +4,6 @@
 
 import os 
 import sys
-import json
 
 # Append the parent directory to the path so we can import in utility
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -82,4 +81,4 @@ def solve(set_string, partition_string):
         "Equivalence Relation": relation_string
     }
 
-    return json.dumps(result)
+    return result
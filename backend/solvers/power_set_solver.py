@@ -8,7 +8,6 @@
 
 import re
 from itertools import chain, combinations
-import json
 
 har_mapping = {
     "\u2205": "∅"
@@ -149,10 +148,10 @@ def solve(sets_dict, iterations=1):
                 # If a specific set fails, add error message but continue processing others
                 result["power_sets"][f"Error in Set {set_name}"] = str(e)
         
-        return json.dumps(result)
+        return result
     
     except Exception as e:
         error_result = {
             "error": f"Error calculating power sets: {str(e)}"
         }
-        return json.dumps(error_result)
\ No newline at end of file
+        return error_result
\ No newline at end of file
@@ -4,7 +4,6 @@
 
 import sys
 import os
-import json
 
 # Do some funky appendin' to get the parent directory on the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -48,7 +47,7 @@ def solve(set_string, relation_string):
         "Transitive": properties[5]
     }
 
-    return json.dumps(result)
+    return result
 
 def something(set_string, relation_string):
     set_list, relation = strings.is_a_relation(set_string, relation_string)
@@ -2,145 +2,159 @@
 # Author: Mathias Buchanan
 # Solves: 1.2 propositinal logic problems
 
-import json
-
-letters = []
-outputString = ""
-outputStrng = ""
-printedH = []
-HsPrinted = 0
-hypothesi = []
-
-def replaceNot(inputString):
-    instr = ""
-    donext = True
-    for i, e in enumerate(inputString):
-        if e == "¬":
-            donext = False
-            instr += inputString[i + 1] + "'"
-        elif donext:
-            instr += e
-        else:
-            donext = True
-    
-    return instr
-
-def fixString(inputString):
-    instr = inputString.replace(" ", "")
-    instr = replaceNot(instr)
-    instr = instr.replace("->", ">")
-    instr = instr.replace("→", ">")
-    instr = instr.replace("′", "'")
-    instr = instr.replace("`", "^")
-    instr = instr.replace("∧", "^")
-    instr = instr.replace("~", "v")
-    instr = instr.replace("V", "v")
-    instr = instr.replace("S", ">")
-    instr = instr.replace("[", "(")
-    return instr.replace("]", ")")
-
-
-class Letter:
-    def __init__(self, letter, parent1, parent2, typeOfGetThere, is_Not, istrue):
-        self.letter = letter
-        self.is_Not = is_Not
-        self.istrue = istrue
-        self.parent1 = parent1
-        self.parent2 = parent2
-        self.type = typeOfGetThere
-        self.pnumb = 0
-    
+import logging
+import threading
+import weakref
+from collections import defaultdict, deque
+from functools import reduce
+
+from solvers.util import logic
+from solvers.util.exceptions import CalculateError
+
+logger = logging.getLogger(__name__)
+
+
+# Every formula built so far, by the identity of its parts, shared by all solves in the process.
+#   Entries go away with the last proof using them.
+_interned = weakref.WeakValueDictionary()
+_interning = threading.Lock()
+
+
+class Formula:
+    '''
+        A statement: a Letter, or two statements joined by OR, AND or IMPLIES, possibly negated.
+
+        Formulas are immutable and interned: building the same statement twice returns the
+            same object. Each one also keeps its canonical form, with the parts of OR and AND
+            in a fixed order, so "A or B" == "B or A" and both hash alike, and equality and
+            set/dict membership cost one identity check instead of a walk over both trees.
+
+        Attributes
+        ----------
+        is_Not (bool):
+            Whether the statement is negated
+        canonical (Formula):
+            The same statement with commutative parts in a fixed order
+        order (str):
+            A text form of canonical, used to put commutative parts in that order
+    '''
+    __slots__ = ('is_Not', 'canonical', 'order', 'hash', 'negation', '__weakref__')
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
     def __eq__(self, value):
-        # Check if the value is a Letter object or a string
-        if isinstance(value, Letter):
-            return self.letter == value.letter
-        return self.letter == value  # Compare with string if value is not a Letter
-    
-    # Override the >= operator
-    def __ge__(self, value):
-        # Check if the value is a Letter object or a string
-        if isinstance(value, Letter):
-            return self.letter == value.letter and self.is_Not == value.is_Not
-        return False  # If string, compare letter only and assume 'not' is False
+        if isinstance(value, Formula):
+            return self.canonical is value.canonical
+        return NotImplemented
 
-    def __str__(self):
-        if self.is_Not == False:
-            return self.letter
-        elif self.is_Not == True:
-            return "not " + self.letter
-        else:
-            return self.letter + "is acting weird"
-        
-    def altPrint(self):
-        if self.is_Not == False:
-            return self.letter
-        elif self.is_Not == True:
-            return self.letter + "'"
-        else:
-            return self.letter + "is acting weird"
-        
-        
-    def printParent(self):
-        p1 = False
-        p2 = False
-        if not isinstance(self.parent1, str):
-            p1 = True
-            self.parent1.printParent()
-        if not isinstance(self.parent2, str):
-            p2 = True
-            self.parent2.printParent()
-        if self not in printedH:
-            printedH.append(self)
-            global HsPrinted
-            HsPrinted += 1
-            for h in hypothesi:
-                if h >= self:
-                    h.pnumb = HsPrinted
-            global outputString
-            global outputStrng
-            outputString += str(HsPrinted) + ". " + str(self)
-            outputStrng += str(HsPrinted) + ". " + self.altPrint()
-            if self.parent1 == "hypothesis" or self.parent1 == "Hypothesis":
-                outputString += ", Hypothesis"
-                outputStrng += ", Hypothesis"
-            if self.type == "hypothesis by deduction method":
-                outputString += " by deduction method."
-                outputStrng += " by deduction method."
-            if p1:
-                for h in hypothesi:
-                    if h >= self.parent1:
-                        try:
-                            outputString += ", " + str(h.pnumb)
-                            outputStrng += ", " + str(h.pnumb)
-                        except:
-                            print("Got error from trying this. here's the current output")
-                            print(outputString)
-                            print(outputStrng)
-            if p2:
-                for h in hypothesi:
-                    if h >= self.parent2:
-                        outputString += ", " + str(h.pnumb)
-                        outputStrng += ", " + str(h.pnumb)
-            if self.type != "none" and self.type != "hypothesis by deduction method":
-                outputString += ", " + self.type
-                outputStrng += ", " + self.type
-            outputString += "\n"
-            outputStrng += "\n"
+    def __hash__(self):
+        return self.hash
 
-        
-    def clone(self):
-        return Letter(self.letter, self.parent1, self.parent2, self.type, self.is_Not, self.istrue)
+    def __reduce__(self):
+        # Unpickled formulas are interned again
+        return (type(self), self.parts())
 
-class OR:
-    def __init__(self, letter1, letter2, parent1, parent2, typeOfGetThere, is_Not):
-        
-        self.letter1 = letter1
-        self.letter2 = letter2
-        self.parent1 = parent1
-        self.parent2 = parent2
-        self.type = typeOfGetThere
-        self.is_Not = is_Not
-        self.pnumb = 0
+    def negate(self):
+        if self.negation is None:
+            # Cached: the proof search asks for the same negations over and over
+            object.__setattr__(self, 'negation', type(self)(*self.parts()[:-1], not self.is_Not))
+        return self.negation
+
+
+def _identity(part):
+    return id(part) if isinstance(part, Formula) else part
+
+
+def _intern(cls, identity, parts, order, canonical=None):
+    '''
+        Returns the formula of class cls with these parts (the last one is is_Not), building it
+            unless another thread just did.
+    '''
+    with _interning:
+        formula = _interned.get(identity)
+        if formula is None:
+            formula = object.__new__(cls)
+            formula.build(*parts)
+            setField = object.__setattr__
+            setField(formula, 'is_Not', parts[-1])
+            setField(formula, 'order', order)
+            setField(formula, 'hash', hash(order))
+            setField(formula, 'negation', None)
+            setField(formula, 'canonical', formula if canonical is None else canonical)
+            _interned[identity] = formula
+    return formula
+
+
+def _order(part):
+    return part.order if isinstance(part, Formula) else repr(part)
+
+
+class Letter(Formula):
+    __slots__ = ('letter',)
+
+    def __new__(cls, letter, is_Not=False):
+        identity = (cls, letter, is_Not)
+        formula = _interned.get(identity)
+        if formula is None:
+            formula = _intern(cls, identity, (letter, is_Not), letter + "'" * is_Not)
+        return formula
+
+    def build(self, letter, is_Not):
+        object.__setattr__(self, 'letter', letter)
+
+    def parts(self):
+        return (self.letter, self.is_Not)
+
+    def __str__(self):
+        return "not " + self.letter if self.is_Not else self.letter
+
+    def altPrint(self):
+        return self.letter + "'" if self.is_Not else self.letter
+
+
+class Connective(Formula):
+    '''
+        Two statements joined by a connective. Subclasses name the connective in symbol and
+            say whether the order of the parts matters.
+    '''
+    __slots__ = ('letter1', 'letter2')
+    symbol = ""
+    commutative = False
+
+    def __new__(cls, letter1, letter2, is_Not=False):
+        # Most formulas the proof search builds already exist
+        identity = (cls, _identity(letter1), _identity(letter2), is_Not)
+        formula = _interned.get(identity)
+        if formula is not None:
+            return formula
+
+        canonical = None
+        left, right = letter1, letter2
+        if isinstance(left, Formula):
+            left = left.canonical
+        if isinstance(right, Formula):
+            right = right.canonical
+        if cls.commutative and _order(right) < _order(left):
+            left, right = right, left
+
+        order = cls.symbol + "(" + _order(left) + "," + _order(right) + ")" + "'" * is_Not
+        if left is not letter1 or right is not letter2:
+            canonical = cls(left, right, is_Not)
+        return _intern(cls, identity, (letter1, letter2, is_Not), order, canonical)
+
+    def build(self, letter1, letter2, is_Not):
+        object.__setattr__(self, 'letter1', letter1)
+        object.__setattr__(self, 'letter2', letter2)
+
+    def parts(self):
+        return (self.letter1, self.letter2, self.is_Not)
+
+
+class OR(Connective):
+    __slots__ = ()
+    symbol = "v"
+    commutative = True
 
     def __str__(self):
         if not self.is_Not:
@@ -163,72 +177,11 @@ class OR:
         if self.is_Not:
             returnStr += ")'"
         return returnStr
-    
-    def __eq__(self, value):
-        if isinstance(value, OR):
-            # Compare using Letter instances directly
-            return ((self.letter1 >= value.letter1 and self.letter2 >= value.letter2) or
-                    (self.letter1 >= value.letter2 and self.letter2 >= value.letter1)) and self.is_Not == value.is_Not
-        return False
-    
-    def __ge__(self, value):
-        return self == value
-    
-    def printParent(self):
-        p1 = False
-        p2 = False
-        if not isinstance(self.parent1, str):
-            p1 = True
-            self.parent1.printParent()
-        if not isinstance(self.parent2, str):
-            p2 = True
-            self.parent2.printParent()
-        if self not in printedH:
-            printedH.append(self)
-            global HsPrinted
-            HsPrinted += 1
-            for h in hypothesi:
-                if h >= self:
-                    h.pnumb = HsPrinted
-            global outputString
-            global outputStrng
-            outputString += str(HsPrinted) + ". " + str(self)
-            outputStrng += str(HsPrinted) + ". " + self.altPrint()
-            if self.parent1 == "hypothesis" or self.parent1 == "Hypothesis":
-                outputString += ", Hypothesis"
-                outputStrng += ", Hypothesis"
-            if self.type == "hypothesis by deduction method":
-                outputString += " by deduction method."
-                outputStrng += " by deduction method."
-            if p1:
-                for h in hypothesi:
-                    if h >= self.parent1:
-                        outputString += ", " + str(h.pnumb)
-                        outputStrng += ", " + str(h.pnumb)
-            if p2:
-                for h in hypothesi:
-                    if h >= self.parent2:
-                        outputString += ", " + str(h.pnumb)
-                        outputStrng += ", " + str(h.pnumb)
-            if self.type != "none" and self.type != "hypothesis by deduction method":
-                outputString += ", " + self.type
-                outputStrng += ", " + self.type
-            outputString += "\n"
-            outputStrng += "\n"
-    
-    def clone(self):
-        return OR(self.letter1.clone(), self.letter2.clone(), self.parent1, self.parent2, self.type, self.is_Not)
 
 
-class IMPLIES:
-    def __init__(self, letter1, letter2, parent1=None, parent2=None, typeOfGetThere=None, is_Not=False):
-        self.letter1 = letter1
-        self.letter2 = letter2
-        self.parent1 = parent1
-        self.parent2 = parent2
-        self.type = typeOfGetThere
-        self.is_Not = is_Not
-        self.pnumb = 0
+class IMPLIES(Connective):
+    __slots__ = ()
+    symbol = ">"
 
     def __str__(self):
         if isinstance(self.letter1, IMPLIES):
@@ -250,71 +203,12 @@ class IMPLIES:
             returnStr += f"({self.letter2.altPrint()})"
 
         return returnStr
-    
-    def __eq__(self, value):
-        if isinstance(value, IMPLIES):
-            return self.letter1 >= value.letter1 and self.letter2 >= value.letter2 and self.is_Not == value.is_Not
-        return False
-    
-    def __ge__(self, value):
-        return self == value
-    
-    def printParent(self):
-        p1 = False
-        p2 = False
-        if not isinstance(self.parent1, str):
-            p1 = True
-            self.parent1.printParent()
-        if not isinstance(self.parent2, str):
-            p2 = True
-            self.parent2.printParent()
-        if self not in printedH:
-            printedH.append(self)
-            global HsPrinted
-            HsPrinted += 1
-            for h in hypothesi:
-                if h >= self:
-                    h.pnumb = HsPrinted
-            global outputString
-            global outputStrng
-            outputString += str(HsPrinted) + ". " + str(self)
-            outputStrng += str(HsPrinted) + ". " + self.altPrint()
-            if self.parent1 == "hypothesis" or self.parent1 == "Hypothesis":
-                outputString += ", Hypothesis"
-                outputStrng += ", Hypothesis"
-            if self.type == "hypothesis by deduction method":
-                outputString += " by deduction method."
-                outputStrng += " by deduction method."
-            if p1:
-                for h in hypothesi:
-                    if h >= self.parent1:
-                        outputString += ", " + str(h.pnumb)
-                        outputStrng += ", " + str(h.pnumb)
-            if p2:
-                for h in hypothesi:
-                    if h >= self.parent2:
-                        outputString += ", " + str(h.pnumb)
-                        outputStrng += ", " + str(h.pnumb)
-            if self.type != "none" and self.type != "hypothesis by deduction method":
-                outputString += ", " + self.type
-                outputStrng += ", " + self.type
-            outputString += "\n"
-            outputStrng += "\n"
-    
-    def clone(self):
-        return IMPLIES(self.letter1.clone(), self.letter2.clone(), self.parent1, self.parent2, self.type, self.is_Not)
 
 
-class AND:
-    def __init__(self, letter1, letter2, parent1, parent2, typeOfGetThere, is_Not):
-        
-        self.letter1 = letter1
-        self.letter2 = letter2
-        self.parent1 = parent1
-        self.parent2 = parent2
-        self.type = typeOfGetThere
-        self.is_Not = is_Not
-        self.pnumb = 0
+class AND(Connective):
+    __slots__ = ()
+    symbol = "^"
+    commutative = True
 
     def __str__(self):
         base_str = f"{self.letter1} and {self.letter2}"
@@ -337,837 +231,380 @@ class AND:
         if self.is_Not:
             returnStr += ")'"
         return returnStr
-    
-    def __eq__(self, value):
-        if isinstance(value, AND):
-            return ((self.letter1 >= value.letter1 and self.letter2 >= value.letter2) or
-                    (self.letter1 >= value.letter2 and self.letter2 >= value.letter1)) and self.is_Not == value.is_Not
-        return False
-    
-    def __ge__(self, value):
-        return self == value
-    
-    def printParent(self):
-        p1 = False
-        p2 = False
-        if not isinstance(self.parent1, str):
-            p1 = True
-            self.parent1.printParent()
-        if not isinstance(self.parent2, str):
-            p2 = True
-            self.parent2.printParent()
-        if self not in printedH:
-            printedH.append(self)
-            global HsPrinted
-            HsPrinted += 1
-            for h in hypothesi:
-                if h >= self:
-                    h.pnumb = HsPrinted
-            global outputString
-            global outputStrng
-            outputString += str(HsPrinted) + ". " + str(self)
-            outputStrng += str(HsPrinted) + ". " + self.altPrint()
-            if self.parent1 == "hypothesis" or self.parent1 == "Hypothesis":
-                outputString += ", Hypothesis"
-                outputStrng += ", Hypothesis"
-            if self.type == "hypothesis by deduction method":
-                outputString += " by deduction method."
-                outputStrng += " by deduction method."
-            if p1:
-                for h in hypothesi:
-                    if h >= self.parent1:
-                        outputString += ", " + str(h.pnumb)
-                        outputStrng += ", " + str(h.pnumb)
-            if p2:
-                for h in hypothesi:
-                    if h >= self.parent2:
-                        outputString += ", " + str(h.pnumb)
-                        outputStrng += ", " + str(h.pnumb)
-            if self.type != "none" and self.type != "hypothesis by deduction method":
-                outputString += ", " + self.type
-                outputStrng += ", " + self.type
-            outputString += "\n"
-            outputStrng += "\n"
-    
-    def checkTrue(self):
-        l1t = "unknown"
-        l2t = "unknown"
-        for ls in letters:
-            if ls == self.letter1 and ls.istrue != "unknown":
-                l1t = ls.istrue != self.letter1.is_Not
-            if ls == self.letter2 and ls.istrue != "unknown":
-                l2t = ls.istrue != self.letter2.is_Not
-        if l1t == "unknown" or l2t == "unknown":
-            return False
-        if not self.is_Not:
-            return l1t and l2t
-        return not (l1t and l2t)
-    
-    def checkFalse(self):
-        l1t = "unknown"
-        l2t = "unknown"
-        for ls in letters:
-            if ls == self.letter1 and ls.istrue != "unknown":
-                l1t = ls.istrue != self.letter1.is_Not
-            if ls == self.letter2 and ls.istrue != "unknown":
-                l2t = ls.istrue != self.letter2.is_Not
-        if l1t == "unknown" or l2t == "unknown":
-            return False
-        if self.is_Not:
-            return l1t and l2t
-        return not (l1t and l2t)
-    
-    def clone(self):
-        return AND(self.letter1.clone(), self.letter2.clone(), self.parent1, self.parent2, self.type, self.is_Not)
-
 
-def cycleThrough(conclusion):
-
-    global outputString
-    global outputStrng
-    global hypothesi
-    global printedH
-    global HsPrinted
-    global letters
-    printedH.clear()
-    HsPrinted = 0
-    
-    print([str(h) for h in hypothesi])
-
-
-    for h1 in hypothesi:
-        for h2 in hypothesi:
-            if isinstance(h1, Letter) and isinstance(h2, IMPLIES):
-                # If h1 is thaZSe left-hand side of the IMPLIES and is true
-                if h1 >= h2.letter1:
-                        newH2 = h2.letter2.clone()
-                        if isinstance(newH2, Letter):
-                            newH2.istrue = not newH2.is_Not
-                            newH2.parent1= h1
-                            newH2.parent2 = h2
-                            newH2.type = "Modus Ponens"
-                            if newH2 not in hypothesi:
-                                hypothesi.append(newH2)
-                            for letter in letters:
-                                if letter == newH2:
-                                    letter.istrue = newH2.istrue
-                                    break
-                        else:
-                                newH2.parent1 = h1
-                                newH2.parent2 = h2
-                                newH2.type = "Modus Ponens"
-                                if newH2 not in hypothesi:
-                                    hypothesi.append(newH2)
-
-                # If h1 is the right-hand side of the IMPLIES and is false
-                elif h1 == h2.letter2 and h1.istrue == h2.letter2.is_Not:
-                    if isinstance(h2.letter1, Letter):
-                        l1_negated = h2.letter1.clone()
-                        l1_negated.is_Not = not l1_negated.is_Not  # Negate the letter
-                        l1_negated.istrue = not l1_negated.is_Not
-                        l1_negated.parent1 = h1
-                        l1_negated.parent2 = h2
-                        l1_negated.type = "modus tollens"
-                        if l1_negated not in hypothesi:
-                            hypothesi.append(l1_negated)
-                            for letter in letters:
-                                if letter == l1_negated:
-                                    letter.istrue = l1_negated.istrue
-                                    break
-                    elif not isinstance(h2.letter1, IMPLIES):
-                        newH2 = h2.letter1.clone()
-                        newH2.is_Not = not newH2.is_Not
-                        if newH2 not in hypothesi:
-                            hypothesi.append(newH2)
-            if isinstance(h2, Letter) and isinstance(h1, IMPLIES):
-                # If h1 is the left-hand side of the IMPLIES and is true
-                if h2 >= h1.letter1:
-                        newH1 = h1.letter1.clone()
-                        if isinstance(newH1, Letter):
-                            newH1.istrue = not newH1.is_Not
-                            newH1.parent2= h2
-                            newH1.parent1 = h1
-                            newH1.type = "Modus Ponens"
-                            if newH1 not in hypothesi:
-                                hypothesi.append(newH1)
-                            for letter in letters:
-                                if letter == newH1:
-                                    letter.istrue = newH1.istrue
-                                    break
-                        elif isinstance(newH1, AND):
-                                newH1.parent1 = h1
-                                newH1.parent2 = h2
-                                newH1.type = "Modus Ponens"
-                                if newH1 not in hypothesi:
-                                    hypothesi.append(newH1)
-
-                # If h1 is the right-hand side of the IMPLIES and is false
-                elif h2 == h1.letter2 and h2.istrue == h1.letter2.is_Not:
-                    if isinstance(h1.letter1, Letter):
-                        l1_negated = h1.letter1.clone()
-                        l1_negated.is_Not = not l1_negated.is_Not  # Negate the letter
-                        l1_negated.istrue = not l1_negated.is_Not
-                        l1_negated.parent1 = h1
-                        l1_negated.parent2 = h2
-                        l1_negated.type = "modus tollens"
-                        if l1_negated not in hypothesi:
-                            hypothesi.append(l1_negated)
-                            for letter in letters:
-                                if letter == l1_negated:
-                                    letter.istrue = l1_negated.istrue
-                                    break
-                    if not isinstance(h1.letter1, IMPLIES):
-                        newH1 = h1.letter1.clone()
-                        newH1.is_Not = not newH1.is_Not
-                        if newH1 not in hypothesi:
-                            hypothesi.append(newH1)
-            if isinstance(h1, IMPLIES) and isinstance(h2, IMPLIES):
-                if h1.letter2 >= h2.letter1 and h1.is_Not == h2.is_Not:
-                    newImp = IMPLIES(h1.letter1.clone(), h2.letter2.clone(), h1, h2, "transitive", h1.is_Not)
-
-                    # Ensure no invalid implications (e.g., A > not A)
-                    if newImp.letter1 == newImp.letter2 and newImp.letter1.is_Not != newImp.letter2.is_Not:
-                        continue  # Skip invalid implications
-                    
-                    # Avoid adding duplicates
-                    if newImp not in hypothesi:
-                        hypothesi.append(newImp)
-
-                        # Apply the "or logic" directly for the new implication
-                        l1 = newImp.letter1.clone()
-                        l2 = newImp.letter2.clone()
-                        
-                        # Add conditional disjunction (A > B becomes not A or B)
-                        l1.is_Not = not l1.is_Not
-                        newOr = OR(l1, l2, newImp, "none", "conditional disjunction", h1.is_Not)
-                        if newOr not in hypothesi:
-                            hypothesi.append(newOr)
-
-                if h1.letter1 == h2.letter1 and h1.letter1.is_Not != h2.letter1.is_Not and h1.letter2 >= h2.letter2:
-                        newL = h1.letter2.clone()
-                        newL.parent1 = h1
-                        newL.parent2 = h2
-                        newL.type = "proof by cases"
-                        if newL not in hypothesi:
-                            hypothesi.append(newL)
-            if isinstance(h1, IMPLIES):
-                if h1.letter1 >= h2:
-                        newH2 = h1.letter2.clone()
-                        if isinstance(newH2, Letter):
-                            newH2.istrue = not newH2.is_Not
-                            newH2.parent1= h1
-                            newH2.parent2 = h2
-                            newH2.type = "Modus Ponens"
-                            if newH2 not in hypothesi:
-                                hypothesi.append(newH2)
-                            for letter in letters:
-                                if letter == newH2:
-                                    letter.istrue = newH2.istrue
-                                    break
-                        elif isinstance(newH2, AND):
-                                if newH2 not in hypothesi:
-                                    hypothesi.append(newH2)
-            if isinstance(h2, IMPLIES):
-                if h2.letter1 >= h1:
-                        newH2 = h2.letter2.clone()
-                        if isinstance(newH2, Letter):
-                            newH2.istrue = not newH2.is_Not
-                            newH2.parent1= h1
-                            newH2.parent2 = h2
-                            newH2.type = "Modus Ponens"
-                            if newH2 not in hypothesi:
-                                hypothesi.append(newH2)
-                            for letter in letters:
-                                if letter == newH2:
-                                    letter.istrue = newH2.istrue
-                                    break
-                        elif isinstance(newH2, AND):
-                                if newH2 not in hypothesi:
-                                    hypothesi.append(newH2)
-
-            if isinstance(h1, OR) and isinstance(h1.letter1, Letter) and isinstance(h1.letter2, Letter) and isinstance(h2, Letter) and not h1.is_Not and not h2 == h1.letter1 and not h2 == h1.letter2:
-                newOREO = OR(AND(h1.letter1.clone(), h2.clone(), h1.clone(), h2.clone(), "Distributive", False), AND(h1.letter2.clone(), h2.clone(), h1.clone(), h2.clone(), "Distributive", False), h1, h2, "Distributive", False)
-                if newOREO not in hypothesi:
-                    hypothesi.append(newOREO)
-            if isinstance(h2, OR) and isinstance(h2.letter1, Letter) and isinstance(h2.letter2, Letter) and isinstance(h1, Letter) and not h2.is_Not and not h1 == h2.letter1 and not h1 == h2.letter2:
-                newOREY = OR(AND(h1.clone(), h2.letter1.clone(), h1.clone(), h2.clone(), "Distributive", False), AND(h1.clone(), h2.letter2.clone(), h1.clone(), h2.clone(), "Distributive", False), h1, h2, "Distributive", False)
-                if newOREY not in hypothesi:
-                    hypothesi.append(newOREY)
-            if isinstance(h2, AND):
-                if not h2.is_Not:
-                    l1s = h2.letter1.clone()
-                    l1s.istrue = not l1s.is_Not
-                    l2s = h2.letter2.clone()
-                    l2s.istrue = not l2s.is_Not
-                    l1s.parent1 = h2
-                    l1s.type = h2.type
-                    l2s.parent1 = h2
-                    l2s.type = h2.type
-                    if l1s not in letters and isinstance(l1s, Letter):
-                        letters.append(l1s)
-                    if l2s not in letters and isinstance(l2s, Letter):
-                        letters.append(l2s)
-                    for letter in letters:
-                        if letter == l1s:
-                            letter.istrue = l1s.istrue
-                        if letter == l2s:
-                            letter.istrue = l2s.istrue
-                    if l1s not in hypothesi:
-                        hypothesi.append(l1s)
-                    if l2s not in hypothesi:
-                        hypothesi.append(l2s)
-
-                    orl1 = l1s.clone()
-                    orl2 = l2s.clone()
-                    orl1.is_Not = not orl1.is_Not
-                    orl2.is_Not = not orl2.is_Not
-                    newOR = OR(orl1, orl2, h2, "none", "De Morgan's law", True)
-                    if newOR not in hypothesi:
-                        hypothesi.append(newOR)
-                else:
-                    l1s = h2.letter1.clone()
-                    l1s.is_Not = not l1s.is_Not
-                    l2s = h2.letter2.clone()
-                    l2s.is_Not = not l2s.is_Not
-
-                    newOr = OR(l1s, l2s, h2, "none", "De Morgan's law", False)
-                    if newOr not in hypothesi:
-                        hypothesi.append(newOr)
-            if isinstance(h2, OR) and not h2.is_Not:
-                        notA = h2.letter1.clone()
-                        notA.is_Not = not notA.is_Not
-                        newImp1 = IMPLIES(notA, h2.letter2, h2, "none", "Conditional Dysjunction", False)
-                        if newImp1 not in hypothesi:
-                            hypothesi.append(newImp1)
-
-                        notB = h2.letter2.clone()
-                        notB.is_Not = not notB.is_Not
-                        newImp2 = IMPLIES(notB, h2.letter1, h2, "none", "Conditional Dysjunction", False)
-                        if newImp2 not in hypothesi:
-                            hypothesi.append(newImp2)
-
-                        if h2.letter1 >= h2.letter2:
-                            newL = h2.letter1.clone()
-                            newL.parent1 = h2
-                            newL.type = "Self Refrence"
-                            if newL not in hypothesi:
-                                hypothesi.append(newL)
-
-            if isinstance(h2, IMPLIES) and isinstance(h2.letter1, AND) and h2.letter1 >= h1:
-                        newH2 = h2.letter2.clone()
-                        if isinstance(newH2, Letter):
-                            newH2.istrue = not newH2.is_Not
-                            newH2.parent1 = h2
-                            newH2.parent2 = h1
-                            newH2.type = "Modus Ponens"
-                            if newH2 not in hypothesi:
-                                hypothesi.append(newH2)
-                            for letter in letters:
-                                if letter == newH2:
-                                    letter.istrue = newH2.istrue
-                                    break
-                        elif isinstance(newH2, AND):
-                                newH2.parent1 = h2
-                                newH2.type = "Modus Ponens"
-                                if newH2 not in hypothesi:
-                                    hypothesi.append(newH2)
-            if isinstance(h1, IMPLIES) and isinstance(h1.letter1, AND) and h1.letter1 >= h2:
-                        newH2 = h1.letter2.clone()
-                        if isinstance(newH2, Letter):
-                            newH2.istrue = not newH2.is_Not
-                            newH2.parent1 = h2
-                            newH2.parent2 = h1
-                            newH2.type = "Modus Ponens"
-                            if newH2 not in hypothesi:
-                                hypothesi.append(newH2)
-                            for letter in letters:
-                                if letter == newH2:
-                                    letter.istrue = newH2.istrue
-                                    break
-                        elif isinstance(newH2, AND):
-                                newH2.parent1 = h2
-                                newH2.type = "Modus Ponens"
-                                if newH2 not in hypothesi:
-                                    hypothesi.append(newH2)
-            if isinstance(h1, Letter) and isinstance(h2, Letter) and not h1 == h2:
-                newAND = AND(h1.clone(), h2.clone(), h1, h2, "Conjunction", False)
-                if newAND not in hypothesi:
-                    hypothesi.append(newAND)
-
-    hypothesi = [
-        h for h in hypothesi
-        if not (isinstance(h, IMPLIES) and h.letter1 == h.letter2)
-    ]
-
-    
-    print([str(h) for h in hypothesi])
-
-    for h in hypothesi:
-        if h.type == "none" or h.type == "hypothesis by deduction method":
-            h.printParent()
-
-        # Check the conclusion
-    hasntThing = True
-    for i in hypothesi:
-        if i >= conclusion:
-            hasntThing = False
-            i.printParent()
-
-    if hasntThing:
-        if isinstance(conclusion, IMPLIES):
-            outputString = ""
-            outputStrng = ""
 
+# Rule names as they appear in the proof
+HYPOTHESIS = "Hypothesis"
+DEDUCTION = "hypothesis by deduction method"
+
+
+def negatable(formula):
+    # Whether "not formula" can be used as a statement of its own (negated implications can't)
+    return isinstance(formula, (Letter, OR, AND))
+
+
+class Proof:
+    '''
+        Everything one solve works on. Each call to solve builds its own, so solves running
+            side by side (threads, a batch) never see each other's statements or output.
+
+        Statements are derived by forward chaining from an agenda: each new statement is
+            matched once against the statements before it, through indexes on the antecedent
+            and consequent of implications and the disjuncts of disjunctions, so every rule
+            fires only on newly derived statements. Rules that build bigger statements
+            (conjunction, addition, ...) only build the ones the conclusion or an antecedent
+            needs, which keeps the set of derived statements small.
+
+        Attributes
+        ----------
+        hypotheses (list):
+            The hypotheses, in the order they were given, then any assumed by deduction
+        facts (dict):
+            statement -> (statement as derived, rule, parents) for every statement derived so far
+        agenda (deque):
+            The derived statements not yet matched against the others
+        wanted (dict):
+            statement -> statement for the statements worth building
+        lines (dict):
+            statement -> its line number in the written proof
+        text (str):
+            The proof in words
+        symbols (str):
+            The same proof in symbols
+    '''
+    def __init__(self):
+        self.hypotheses = []
+        self.facts = {}
+        self.agenda = deque()
+        self.wanted = {}
+        self.lines = {}
+        self.text = ""
+        self.symbols = ""
+
+        # statement -> implications with that antecedent / consequent, disjunctions with that disjunct
+        self.byAntecedent = defaultdict(list)
+        self.byConsequent = defaultdict(list)
+        self.byDisjunct = defaultdict(list)
+
+    def assume(self, formula, rule=HYPOTHESIS):
+        if isinstance(formula, Formula) and formula not in self.facts:
+            self.hypotheses.append(formula)
+            self.derive(formula, rule)
+
+    def derive(self, formula, rule, *parents):
+        if isinstance(formula, Formula) and formula not in self.facts:
+            self.facts[formula] = (formula, rule, parents)
+            self.agenda.append(formula)
+
+    def known(self, formula):
+        # The statement as it was derived (parts in the order they were written), if it was
+        fact = self.facts.get(formula)
+        return None if fact is None else fact[0]
+
+    def want(self, formula):
+        '''
+            Marks a statement, and the statements it is built from, as worth building.
+        '''
+        if not isinstance(formula, Connective) or formula in self.wanted:
+            return
+        self.wanted[formula] = formula
+
+        self.want(formula.letter1)
+        self.want(formula.letter2)
+        if formula.is_Not and isinstance(formula, (OR, AND)) and negatable(formula.letter1) and negatable(formula.letter2):
+            # Built by De Morgan's law from its negated parts
+            flipped = AND if isinstance(formula, OR) else OR
+            self.want(flipped(formula.letter1.negate(), formula.letter2.negate()))
+
+    def saturate(self):
+        '''
+            Derives everything the rules give from the statements so far, building wanted
+                statements whenever nothing else is left to derive.
+        '''
+        while True:
+            while self.agenda:
+                self.fire(self.agenda.popleft())
+            if not self.introduce():
+                return
+
+    def fire(self, formula):
+        '''
+            Matches a new statement against the statements before it.
+        '''
+        opposite = formula.negate()
+
+        # The statement as the premise of an implication or a disjunction
+        for implication in self.byAntecedent.get(formula, ()):
+            self.derive(implication.letter2, "Modus Ponens", formula, implication)
+        for implication in self.byConsequent.get(opposite, ()):
+            if negatable(implication.letter1):
+                self.derive(implication.letter1.negate(), "modus tollens", formula, implication)
+        for disjunction in self.byDisjunct.get(opposite, ()):
+            other = disjunction.letter2 if disjunction.letter1 == opposite else disjunction.letter1
+            self.derive(other, "disjunctive syllogism", formula, disjunction)
+
+        if isinstance(formula, IMPLIES) and not formula.is_Not:
+            self.fireImplication(formula)
+        elif isinstance(formula, OR) and not formula.is_Not:
+            self.fireDisjunction(formula)
+        elif isinstance(formula, AND) and not formula.is_Not:
+            self.derive(formula.letter1, "Simplification", formula)
+            self.derive(formula.letter2, "Simplification", formula)
+        elif not isinstance(formula, (OR, AND)) or not (negatable(formula.letter1) and negatable(formula.letter2)):
+            return
+        elif isinstance(formula, OR):
+            self.derive(AND(formula.letter1.negate(), formula.letter2.negate()), "De Morgan's law", formula)
+        else:
+            self.derive(OR(formula.letter1.negate(), formula.letter2.negate()), "De Morgan's law", formula)
+
+    def fireImplication(self, implication):
+        antecedent, consequent = implication.letter1, implication.letter2
+        if not isinstance(antecedent, Formula) or not isinstance(consequent, Formula):
+            return
+
+        if antecedent in self.facts:
+            self.derive(consequent, "Modus Ponens", antecedent, implication)
+        if negatable(consequent) and negatable(antecedent) and consequent.negate() in self.facts:
+            self.derive(antecedent.negate(), "modus tollens", consequent.negate(), implication)
+
+        # Hypothetical syllogism with the implications before it, both ways round
+        for before in self.byConsequent.get(antecedent, ()):
+            self.chain(before, implication)
+        for after in self.byAntecedent.get(consequent, ()):
+            self.chain(implication, after)
+
+        if negatable(antecedent):
+            other = self.known(IMPLIES(antecedent.negate(), consequent))
+            if other is not None:
+                self.derive(consequent, "proof by cases", implication, other)
+
+            if negatable(consequent):
+                self.derive(IMPLIES(consequent.negate(), antecedent.negate()), "Contraposition", implication)
+
+        if isinstance(antecedent, AND) and not antecedent.is_Not and not isinstance(consequent, IMPLIES):
+            # (A and B) implies C is A implies (B implies C), and B implies (A implies C). Not
+            #   applied to nested implications, whose exports would only nest deeper.
+            self.derive(IMPLIES(antecedent.letter1, IMPLIES(antecedent.letter2, consequent)), "Exportation", implication)
+            self.derive(IMPLIES(antecedent.letter2, IMPLIES(antecedent.letter1, consequent)), "Exportation", implication)
+
+        # A compound antecedent may need building before it can be used
+        self.want(antecedent)
+        if isinstance(consequent, (OR, AND)):
+            self.want(consequent.negate())
+
+        self.byAntecedent[antecedent].append(implication)
+        self.byConsequent[consequent].append(implication)
+
+    def chain(self, first, second):
+        start, end = first.letter1, second.letter2
+        if not negatable(start) or not isinstance(end, Formula):
+            return
+        # A implies A says nothing, and A implies not A is left to the other rules
+        if start == end or start.negate() == end:
+            return
+        self.derive(IMPLIES(start, end), "transitive", first, second)
+
+    def fireDisjunction(self, disjunction):
+        left, right = disjunction.letter1, disjunction.letter2
+        if not negatable(left) or not negatable(right):
+            return
+
+        notLeft, notRight = left.negate(), right.negate()
+        if notLeft in self.facts:
+            self.derive(right, "disjunctive syllogism", notLeft, disjunction)
+        if notRight in self.facts:
+            self.derive(left, "disjunctive syllogism", notRight, disjunction)
+
+        if left == right:
+            self.derive(left, "Self Refrence", disjunction)
+
+        # A or B is not A implies B, and not B implies A
+        self.derive(IMPLIES(notLeft, right), "Conditional Dysjunction", disjunction)
+        self.derive(IMPLIES(notRight, left), "Conditional Dysjunction", disjunction)
+
+        # (A and B) or C is (A or C) and (B or C)
+        for part, rest in ((left, right), (right, left)):
+            if isinstance(part, AND) and not part.is_Not:
+                self.derive(OR(part.letter1, rest), "Distributive", disjunction)
+                self.derive(OR(part.letter2, rest), "Distributive", disjunction)
+
+        for part in (left, right):
+            if not isinstance(part, Letter):
+                self.want(part.negate())
+
+        self.byDisjunct[left].append(disjunction)
+        if right != left:
+            self.byDisjunct[right].append(disjunction)
+
+    def introduce(self):
+        '''
+            Builds the wanted statements whose parts are known.
+
+            Returns
+            ----------
+            introduced: bool
+                Whether a new statement was built
+        '''
+        introduced = False
+        for formula in list(self.wanted):
+            if formula in self.facts:
+                continue
+            reason = self.build(formula)
+            if reason is not None:
+                self.derive(formula, *reason)
+                introduced = True
+        return introduced
+
+    def build(self, formula):
+        # The rule and parents that build a wanted statement from known ones, if any
+        left, right = formula.letter1, formula.letter2
+
+        if isinstance(formula, AND) and not formula.is_Not:
+            if self.known(left) is not None and self.known(right) is not None:
+                return ("Conjunction", self.known(left), self.known(right))
+        elif isinstance(formula, OR) and not formula.is_Not:
+            for part in (left, right):
+                if self.known(part) is not None:
+                    return ("Addition", self.known(part))
+            if negatable(left) and negatable(right):
+                for implication in (IMPLIES(left.negate(), right), IMPLIES(right.negate(), left)):
+                    if self.known(implication) is not None:
+                        return ("conditional disjunction", self.known(implication))
+        elif isinstance(formula, IMPLIES) and not formula.is_Not:
+            if negatable(left) and negatable(right):
+                disjunction = self.known(OR(left.negate(), right))
+                if disjunction is not None:
+                    return ("conditional disjunction", disjunction)
+                contrapositive = self.known(IMPLIES(right.negate(), left.negate()))
+                if contrapositive is not None:
+                    return ("Contraposition", contrapositive)
+        elif isinstance(formula, (OR, AND)) and negatable(left) and negatable(right):
+            flipped = AND if isinstance(formula, OR) else OR
+            parts = self.known(flipped(left.negate(), right.negate()))
+            if parts is not None:
+                return ("De Morgan's law", parts)
+        return None
+
+    def prove(self, conclusion):
+        '''
+            A function to derive the conclusion and write out its proof.
+
+            Parameters
+            ----------
+            conclusion (Letter/OR/AND/IMPLIES):
+                The statement to prove
+
+            Returns
+            ----------
+            result: dict
+                The proof in words ("String") and in symbols ("Symbol")
+        '''
+        self.want(conclusion)
+        self.saturate()
+
+        if conclusion in self.facts:
+            self.write(conclusion)
+        elif isinstance(conclusion, IMPLIES):
+            # Deduction method: assume the antecedents and prove the final consequent
+            self.text = ""
+            self.symbols = ""
             while isinstance(conclusion, IMPLIES):
-                outputString += "Because this conclusion only matters if " + str(conclusion.letter1) + " is true, then we can assume that it is, and place it in our hypotheses. This also means our new conclusion is " + str(conclusion.letter2) + "\n"
-                outputStrng += "Because this conclusion only matters if " + conclusion.letter1.altPrint() + " is true, then we can assume that it is, and place it in our hypotheses. This also means our new conclusion is " + conclusion.letter2.altPrint() + "\n"
-                conclusion.letter1.parent1 = "hypothesis"
-                conclusion.letter1.type = "hypothesis by deduction method"
-                hypothesi.append(conclusion.letter1)
+                self.text += "Because this conclusion only matters if " + str(conclusion.letter1) + " is true, then we can assume that it is, and place it in our hypotheses. This also means our new conclusion is " + str(conclusion.letter2) + "\n"
+                self.symbols += "Because this conclusion only matters if " + conclusion.letter1.altPrint() + " is true, then we can assume that it is, and place it in our hypotheses. This also means our new conclusion is " + conclusion.letter2.altPrint() + "\n"
+                self.assume(conclusion.letter1, DEDUCTION)
                 conclusion = conclusion.letter2
 
-            cycleThrough(conclusion)
+            self.want(conclusion)
+            self.saturate()
+            if conclusion in self.facts:
+                self.write(conclusion)
+            else:
+                self.fail()
         else:
-            outputString = "Unfortunately, your inputted hypothesis does not derive this conclusion"
-            outputStrng = "Unfortunately, your inputted hypothesis does not derive this conclusion"
+            self.fail()
+
+        return {
+            "String": self.text,
+            "Symbol": self.symbols
+        }
+
+    def fail(self):
+        self.text = "Unfortunately, your inputted hypothesis does not derive this conclusion"
+        self.symbols = "Unfortunately, your inputted hypothesis does not derive this conclusion"
+
+    def write(self, conclusion):
+        for hypothesis in self.hypotheses:
+            self.cite(hypothesis)
+        self.cite(conclusion)
+
+    def cite(self, statement):
+        '''
+            Writes a statement into the proof as a numbered line, after the lines it follows
+                from, citing their numbers and the rule that derived it.
+        '''
+        if statement in self.lines:
+            return
+        statement, rule, parents = self.facts[statement]
+        for parent in parents:
+            self.cite(parent)
+
+        number = len(self.lines) + 1
+        self.lines[statement] = number
+        line = str(number) + ". "
+        reason = ""
+        if rule == HYPOTHESIS or rule == DEDUCTION:
+            reason += ", Hypothesis"
+        if rule == DEDUCTION:
+            reason += " by deduction method."
+        for parentNumber in sorted(self.lines[parent] for parent in parents):
+            reason += ", " + str(parentNumber)
+        if rule != HYPOTHESIS and rule != DEDUCTION:
+            reason += ", " + rule
+
+        self.text += line + str(statement) + reason + "\n"
+        self.symbols += line + statement.altPrint() + reason + "\n"
 
-    returnJson = {
-        "String": outputString,
-        "Symbol": outputStrng
-    }
 
-    return json.dumps(returnJson)
+# Input hypothesis
+def toFormula(tree):
+    '''
+        Builds the statement for a parsed formula (see solvers/util/logic.py). Runs of ∧ and ∨
+            become nested pairs, and A ↔ B becomes (A → B) ∧ (B → A).
+    '''
+    kind = tree[0]
+    if kind == "var":
+        return Letter(tree[1])
+    if kind == "not":
+        return toFormula(tree[1]).negate()
+    if kind == "and":
+        return reduce(AND, map(toFormula, tree[1:]))
+    if kind == "or":
+        return reduce(OR, map(toFormula, tree[1:]))
+    if kind == "implies":
+        return IMPLIES(toFormula(tree[1]), toFormula(tree[2]))
+    if kind == "iff":
+        left, right = toFormula(tree[1]), toFormula(tree[2])
+        return AND(IMPLIES(left, right), IMPLIES(right, left))
+    raise CalculateError("Constants can't be used in a proof, use letters instead")
 
 
-# Input hypothesis
 def solve(hypothisis, conclusionn):
 
-    global outputString
-    global outputStrng
-    global hypothesi
-    global printedH
-    global HsPrinted
-    global letters
-
-    hypothisis = fixString(hypothisis)
-    hypothisises = []
-    hypothesi.clear()
-    outputString = ""
-    outputStrng = ""
-    letters.clear()
-    printedH.clear()
-    HsPrinted = 0
-
-    parserString = ""
-    inThing = 0
-    for index, char in enumerate(hypothisis):
-        if char == "(":
-            inThing += 1
-        if char == ")":
-            inThing -= 1
-        if char == "^" and inThing <= 0:
-            hypothisises.append(parserString)
-            parserString = ""
-        else:
-            parserString += char
-        
-    if parserString != "":
-        hypothisises.append(parserString)
-
-
-    def parse_and(component):
-        ore = "v" in component
-        andy = "^" in component
-        imp = ">" in component
-        wholeisNot = ")'" in component
-        component = component.replace("(", "").replace(")'", "").replace(")", "")
-        coms = [component]
-        if ore:
-            coms = component.split("v")
-        if andy:
-            coms = component.split("^")
-        if imp:
-            coms = component.split(">")
-        isnt = "'" in coms[0]
-        base_letter = coms[0].replace("'", "")
-        letter1 = Letter(base_letter, "hypothesis", "hypothesis", "none", isnt, "unknown")
-        letter2 = "none"
-        if coms.__len__() > 1 and coms[1] != "":  
-            isnt2 = "'" in coms[1]
-            base_letter = coms[1].replace("'", "")
-            letter2 = Letter(base_letter, "hypothesis", "hypothesis", "none", isnt2, "unknown") 
-        if ore:
-            return OR(letter1, letter2, "none", "none", "none", wholeisNot)
-        elif andy:
-            return AND(letter1, letter2, "none", "none", "none", wholeisNot)
-        elif imp:
-            return IMPLIES(letter1, letter2, "none", "none", "none", wholeisNot)
-        else:
-            return letter1
+    proof = Proof()
 
-    def split_logic_string(i: str):
-        result = []
-        current = ""
-        
-        for index, char in enumerate(i):
-            if char == '(':
-                if current != "":
-                    result.append(str(current))
-                current = "("
-            elif char == ')': 
-                current += ")"
-                result.append(str(current))
-                current = ""
-            elif char == "'" and current == "":
-                holdUp = result.pop()
-                holdUp += "'"
-                result.append(holdUp)
-            elif current == "" and char in {'>', 'v', '^'}:
-                result.append(char)
-            else:
-                current += char
-        
-        if current != "":
-            result.append(current)
-        
-        return result
-
-    for i in hypothisises:
-        if "(" in i and ")" in i:
-            newEye = split_logic_string(i)
-            if newEye.__len__() > 1:
-                wholeNot = ")'" in newEye
-                if not wholeNot:
-                    finalEntry = newEye[newEye.__len__() - 1]
-                    wholeNot = ")'" in finalEntry and finalEntry.replace(")'", "").__len__() == 1
-                ore = "v" in newEye
-                andy = "^" in newEye
-                imp = ">" in newEye
-                index = 0
-                while newEye[index].replace("(", "").replace(")", "").replace("'", "").replace("v", "").replace("^", "").replace(">", "") == "":
-                    index += 1
-                letter1 = parse_and(newEye[index])
-                index += 1
-                while newEye[index].replace("(", "").replace(")", "").replace("'", "").replace("v", "").replace("^", "").replace(">", "") == "":
-                    index += 1
-                letter2 = parse_and(newEye[index])
-                if not ore and not andy and not imp:
-                    if isinstance(letter1, OR):
-                        newOR = OR(letter1.letter1, letter2, "hypothesis", "hypothesis", "none", wholeNot)
-                        hypothesi.append(newOR)
-                    if isinstance(letter1, AND):
-                        newAND = AND(letter1.letter1, letter2, "hypothesis", "hypothesis", "none", wholeNot)
-                        hypothesi.append(newAND)
-                    if isinstance(letter1, IMPLIES):
-                        newIMP = IMPLIES(letter1.letter1, letter2, "hypothesis", "hypotheis", "none", wholeNot)
-                        hypothesi.append(newIMP)
-                if ore:
-                    newOR = OR(letter1, letter2, "hypothesis", "hypothesis", "none", wholeNot)
-                    hypothesi.append(newOR)
-                if andy:
-                    newOR = AND(letter1, letter2, "hypothesis", "hypothesis", "none", wholeNot)
-                    hypothesi.append(newOR)
-                if imp:
-                    newOR = IMPLIES(letter1, letter2, "hypothesis", "hypothesis", "none", wholeNot)
-                    hypothesi.append(newOR)
-            else:
-                hypothisises.append(i.replace("(", ""))
+    # The hypotheses are the formulas joined by ∧ at the top level
+    hypotheses = [toFormula(tree) for tree in logic.conjuncts(hypothisis)]
+    conclusion = toFormula(logic.parse(conclusionn))
 
-        else:
-            if "v" in i:  # Process OR
-                components = i.split("v")
-                letter1 = parse_and(components[0])  # Use parse_and for letter1
-                letter2 = parse_and(components[1])  # Use parse_and for letter2
-
-                is_not = False
-                if isinstance(letter2, Letter):
-                    is_not = i.endswith(")'")
-                elif isinstance(letter2, AND):
-                        if letter2.is_Not:
-                            is_not = i.endswith(")')'")
-                        else:
-                            is_not = i.endswith(")'")
-                newOr = OR(letter1, letter2, "hypothesis", "hypothesis", "none", is_not)
-                hypothesi.append(newOr)
-
-                if not is_not:
-                        notA = letter1.clone()
-                        notA.is_Not = not notA.is_Not
-                        newImp1 = IMPLIES(notA, letter2, newOr, "none", "Conditional Dysjunction", False)
-                        if newImp1 not in hypothesi:
-                            hypothesi.append(newImp1)
-
-                        notB = letter2.clone()
-                        notB.is_Not = not notB.is_Not
-                        newImp2 = IMPLIES(notB, letter1, newOr, "none", "Conditional Dysjunction", False)
-                        if newImp2 not in hypothesi:
-                            hypothesi.append(newImp2)
-
-            # Process IMPLIES
-            elif ">" in i:  # Process IMPLIES
-                components = i.split(">")
-                letter1 = parse_and(components[0])  # Use parse_and for letter1
-                letter2 = parse_and(components[1])  # Use parse_and for letter2
-
-                is_not = False
-                if isinstance(letter2, Letter):
-                    is_not = i.endswith(")'")
-                else:
-                    if isinstance(letter2, AND):
-                        if letter2.is_Not:
-                            is_not = i.endswith(")')'")
-                        else:
-                            is_not = i.endswith(")'")
-                newImplies = IMPLIES(letter1, letter2, "hypothesis", "hypothesis", "none", is_not)
-                hypothesi.append(newImplies)
-            elif "^" in i:  # AND statement
-                components = i.replace("(", "").replace(")'", "").replace(")", "").split("^")
-                wholeNot = ")'" in i
-                letter1, letter2 = components[0], components[1]
-
-                is_not_1 = "'" in letter1
-                base_letter1 = letter1.replace("'", "")
-                letter_obj1 = Letter(base_letter1, "hypothesis", "hypothesis", "none",  is_not_1, "unknown")
-                if letter_obj1 not in letters and isinstance(letter_obj1, Letter):
-                    letters.append(letter_obj1)
-
-                is_not_2 = "'" in letter2
-                base_letter2 = letter2.replace("'", "")
-                letter_obj2 = Letter(base_letter2, "hypothesis", "hypothesis", "none",  is_not_2, "unknown")
-                if letter_obj2 not in letters and isinstance(letter_obj2, Letter):
-                    letters.append(letter_obj2)
-
-                conclusion = AND(letter_obj1, letter_obj2, "conclusion", "conclusion", "none", False)
-            else:  # Process single-letter hypothesis
-                is_not = "'" in i
-                base_letter = i.replace("'", "")
-                newLetter = Letter(base_letter, "hypothesis", "hypothesis", "none",  is_not, not is_not)  # True for positive, False for negative
-                if newLetter not in letters and isinstance(newLetter, Letter):
-                    letters.append(newLetter)
-                else:  # Update `istrue` if the letter already exists
-                    for letter in letters:
-                        if letter.letter == base_letter:
-                            letter.istrue = not is_not
-                hypothesi.append(newLetter)
-
-    # Input conclusion (optional)
-    solve = fixString(conclusionn)
-
-    conclusion = ""
-
-    # Process the statement based on its type
-    newEye = split_logic_string(solve)
-    if "(" in solve and ")" in solve and newEye.__len__() > 1:
-            newEye = split_logic_string(solve)
-            wholeNot = ")'" in newEye
-            if not wholeNot:
-                finalEntry = newEye[newEye.__len__() - 1]
-                wholeNot = ")'" in finalEntry and finalEntry.replace(")'", "").__len__() == 1
-            ore = "v" in newEye
-            andy = "^" in newEye
-            imp = ">" in newEye
-            index = 0
-            while newEye[index].replace("(", "").replace(")", "").replace("'", "").replace("v", "").replace("^", "").replace(">", "") == "":
-                index += 1
-            letter1 = parse_and(newEye[index])
-            index += 1
-            while newEye[index].replace("(", "").replace(")", "").replace("'", "").replace("v", "").replace("^", "").replace(">", "") == "":
-                index += 1
-            letter2 = parse_and(newEye[index])
-            if not ore and not andy and not imp:
-                if isinstance(letter1, OR):
-                    newOR = OR(letter1.letter1, letter2, "hypothesis", "hypothesis", "none", wholeNot)
-                    conclusion = newOR
-                if isinstance(letter1, AND):
-                    newAND = AND(letter1.letter1, letter2, "hypothesis", "hypothesis", "none", wholeNot)
-                    conclusion = newAND
-                if isinstance(letter1, IMPLIES):
-                    newIMP = IMPLIES(letter1.letter1, letter2, "hypothesis", "hypotheis", "none", wholeNot)
-                    conclusion = newIMP
-            if ore:
-                newOR = OR(letter1, letter2, "hypothesis", "hypothesis", "none", wholeNot)
-                conclusion = newOR
-            if andy:
-                newOR = AND(letter1, letter2, "hypothesis", "hypothesis", "none", wholeNot)
-                conclusion = newOR
-            if imp:
-                newOR = IMPLIES(letter1, letter2, "hypothesis", "hypothesis", "none", wholeNot)
-                conclusion = newOR
-
-    else:
-            if "v" in solve:  # OR statement
-                wholeNot = ")'" in solve
-                components = solve.replace("(", "").replace(")'", "").replace(")", "").split("v")
-                letter1, letter2 = components[0], components[1]
-
-                is_not_1 = "'" in letter1
-                base_letter1 = letter1.replace("'", "")
-                letter_obj1 = Letter(base_letter1, "hypothesis", "hypothesis", "none",  is_not_1, "unknown")
-                if letter_obj1 not in letters and isinstance(letter_obj1, Letter):
-                    letters.append(letter_obj1)
-
-                is_not_2 = "'" in letter2
-                base_letter2 = letter2.replace("'", "")
-                letter_obj2 = Letter(base_letter2, "hypothesis", "hypothesis", "none", is_not_2,  "unknown")
-                if letter_obj2 not in letters and isinstance(letter_obj2, Letter):
-                    letters.append(letter_obj2)
-
-                conclusion = OR(letter_obj1, letter_obj2, "conclusion", "conclusion", "none", wholeNot)
-
-            elif ">" in solve: 
-                wholeNot = ")'" in solve # IMPLIES statement
-                components = solve.replace("(", "").replace(")'", "").replace(")", "").split(">")
-                letter1, letter2 = components[0], components[1]
-
-                is_not_1 = "'" in letter1
-                base_letter1 = letter1.replace("'", "")
-                letter_obj1 = Letter(base_letter1, "hypothesis", "hypothesis", "none",  is_not_1, "unknown")
-                if letter_obj1 not in letters and isinstance(letter_obj1, Letter):
-                    letters.append(letter_obj1)
-
-                is_not_2 = "'" in letter2
-                base_letter2 = letter2.replace("'", "")
-                letter_obj2 = Letter(base_letter2, "hypothesis", "hypothesis", "none",  is_not_2, "unknown")
-                if letter_obj2 not in letters and isinstance(letter_obj2, Letter):
-                    letters.append(letter_obj2)
-
-                conclusion = IMPLIES(letter_obj1, letter_obj2, "conclusion", "conclusion", "none", wholeNot)
-
-            elif "^" in solve:  # AND statement
-                wholeNot = ")'" in solve
-                components = solve.replace("(", "").replace(")'", "").replace(")", "").split("^")
-                letter1, letter2 = components[0], components[1]
-
-                is_not_1 = "'" in letter1
-                base_letter1 = letter1.replace("'", "")
-                letter_obj1 = Letter(base_letter1, "hypothesis", "hypothesis", "none",  is_not_1, "unknown")
-                if letter_obj1 not in letters and isinstance(letter_obj1, Letter):
-                    letters.append(letter_obj1)
-
-                is_not_2 = "'" in letter2
-                base_letter2 = letter2.replace("'", "")
-                letter_obj2 = Letter(base_letter2, "hypothesis", "hypothesis", "none",  is_not_2, "unknown")
-                if letter_obj2 not in letters and isinstance(letter_obj2, Letter):
-                    letters.append(letter_obj2)
-
-                conclusion = AND(letter_obj1, letter_obj2, "conclusion", "conclusion", "none", wholeNot)
-
-            else:  # Single letter
-                is_not = "'" in solve
-                base_letter = solve.replace("'", "")
-                letter_obj = Letter(base_letter, "hypothesis", "hypothesis", "none",  is_not, "unknown")
-                if letter_obj not in letters and isinstance(letter_obj, Letter):
-                    letters.append(letter_obj)
-                else:
-                    for letter in letters:
-                        if letter.letter == base_letter:
-                            letter.istrue = not is_not
-                conclusion = letter_obj
+    if isinstance(conclusion, IMPLIES) and conclusion.is_Not:
+        proof.text += "Because the conclusion is " + str(conclusion) + ", and A > B is the same as A' v B, then we can rearange the conclusion as: "
+        proof.symbols += "Because the conclusion is " + str(conclusion) + ", and A > B is the same as A' v B, then we can rearange the conclusion as: "
+        conclusion = OR(conclusion.letter1.negate(), conclusion.letter2, True)
+        proof.text += str(conclusion) + "\n"
+        proof.symbols += str(conclusion) + "\n"
 
+    logger.debug("Parsed conclusion %s from hypotheses %s", conclusion, [str(h) for h in hypotheses])
 
-    if isinstance(conclusion, IMPLIES) and conclusion.is_Not:
-        outputString += "Because the conclusion is " + str(conclusion) + ", and A > B is the same as A' v B, then we can rearange the conclusion as: "
-        outputStrng += "Because the conclusion is " + str(conclusion) + ", and A > B is the same as A' v B, then we can rearange the conclusion as: "
-        l1 = conclusion.letter1.clone()
-        l1.is_Not = not l1.is_Not
-        conclusion = OR(l1, conclusion.letter2, conclusion.parent1, conclusion.parent2, conclusion.type, True)
-        outputString += str(conclusion) + "\n"
-        outputStrng += str(conclusion) + "\n"
-
-    # Output the parsed conclusion
-    print("Parsed Conclusion:", conclusion)
-                    
-    print([str(h) for h in hypothesi])
-
-    # Add transitive implications to the hypotheses
-    # Add transitive implications to the hypotheses
-    for i in hypothesi:
-        if isinstance(i, OR):
-            # If 'is_Not' is True in the OR, handle as specified
-            if isinstance(i.letter1, AND) and not i.letter1.is_Not:
-                newOr1 = OR(i.letter1.letter1, i.letter2, i, "none", "Distributive", i.is_Not)
-                newOr2 = OR(i.letter1.letter2, i.letter2, i, "none", "Distributive", i.is_Not)
-                if newOr1 not in hypothesi:
-                    hypothesi.append(newOr1)
-                if newOr2 not in hypothesi:
-                    hypothesi.append(newOr2)
-            if isinstance(i.letter2, AND) and not i.letter2.is_Not:
-                newOr1 = OR(i.letter2.letter1, i.letter1, i, "none", "Distributive", i.is_Not)
-                newOr2 = OR(i.letter2.letter2, i.letter1, i, "none", "Distributive", i.is_Not)
-                if newOr1 not in hypothesi:
-                    hypothesi.append(newOr1)
-                if newOr2 not in hypothesi:
-                    hypothesi.append(newOr2)
-            if i.is_Not:
-                # Add both letters with the opposite is_Not and their istrue as the opposite of the new is_Not
-                letter1_opposite = i.letter1.clone()
-                letter2_opposite = i.letter2.clone()
-                
-                # Set the opposite of 'is_Not' for both letters
-                letter1_opposite.is_Not = not letter1_opposite.is_Not
-                letter2_opposite.is_Not = not letter2_opposite.is_Not
-
-                newAND = AND(letter1_opposite, letter2_opposite, i, "none", "De Morgan's law", False)
-                if newAND not in hypothesi:
-                    hypothesi.append(newAND)
-        if isinstance(i, AND):
-            if i.is_Not:
-                letter1_opposite = i.letter1.clone()
-                letter2_opposite = i.letter2.clone()
-
-                letter1_opposite.is_Not = not letter1_opposite.is_Not
-                letter2_opposite.is_Not = not letter2_opposite.is_Not
-
-                newOr = OR(letter1_opposite, letter2_opposite, i, "none", "De Morgan's law", False)
-                if newOr not in hypothesi:
-                    hypothesi.append(newOr)
-            else:
-                l1c = i.letter1.clone()
-                l2c = i.letter2.clone()
-
-                l1c.istrue = not l1c.is_Not
-                l2c.istrue = not l2c.is_Not
-
-                l1c.type = i.type
-                l2c.type = i.type
-
-                l1c.parent1 = i
-                l2c.parent1 = i
-
-                if l1c not in hypothesi:
-                    hypothesi.append(l1c)
-                if l2c not in hypothesi:
-                    hypothesi.append(l2c)
-        if isinstance(i, IMPLIES):
-            l1 = i.letter1.clone()
-            l2 = i.letter2.clone()
-            
-            if not isinstance(l2, IMPLIES):
-                # Add conditional disjunction (A > B becomes not A or B)
-                l1.is_Not = not l1.is_Not
-                newOr = OR(l1, l2, i, "none", "conditional disjunction", False)
-                if newOr not in hypothesi:
-                    hypothesi.append(newOr)
-
-                # Add contrapositive (A > B becomes not B > not A)
-                l3 = l2.clone()
-                l3.is_Not = not l3.is_Not
-                newImp = IMPLIES(l3, l1, i, "none", "Contraposition", False)
-                if newImp not in hypothesi:
-                    hypothesi.append(newImp)
-            
-            if isinstance(i.letter1, AND) and not i.letter1.is_Not:
-                newImplies1 = IMPLIES(i.letter1.letter1, IMPLIES(i.letter1.letter2, i.letter2, i, "none", "Exportation", False), i, "none", "Exportation", False)
-                if newImplies1 not in hypothesi:
-                    hypothesi.append(newImplies1)
-                newImplies2 = IMPLIES(i.letter1.letter2, IMPLIES(i.letter1.letter1, i.letter2, i, "none", "Exportation", False), i, "none", "Exportation", False)
-                if newImplies2 not in hypothesi:
-                    hypothesi.append(newImplies2)
-        if isinstance(i, Letter):
-            for letter in letters:
-                if letter.letter == i.letter:
-                    letter.istrue = i.istrue  # Set istrue to the opposite of is_Not
-
-    # Double for loop to add valid transitive implications
-    # Check the conclusion and update based on single letters and implications
-    return cycleThrough(conclusion)
+    for hypothesis in hypotheses:
+        proof.assume(hypothesis)
+    return proof.prove(conclusion)
@@ -6,7 +6,6 @@
 -----------------'''
 
 from sympy import Interval, Union, S, Complement, Symbol
-import json
 
 # Function to find the complement of a set
 def find_complement(universal_set, subset):
@@ -59,4 +58,4 @@ def solve(U, A):
         "complement_A": sorted_set(complement_A),
     }
 
-    return json.dumps(result)
\ No newline at end of file
+    return result
\ No newline at end of file
@@ -10,7 +10,6 @@ import math
 import re
 from fractions import Fraction
 import cmath
-import json
 import sys
 import os
 
@@ -402,4 +401,4 @@ def solve(data):
         except Exception as e:
             result = {"error": "An unknown error has occured"}
     
-    return json.dumps(results)
\ No newline at end of file
+    return results
\ No newline at end of file
@@ -3,7 +3,6 @@
 # Solves: 5.1.32
 import os
 import sys
-import json
 
 
 
@@ -103,4 +102,4 @@ def solve(set_string, relation_string):
         "Maximal Elements": maximals_string
     }
 
-    return json.dumps(result)
+    return result
@@ -2,7 +2,6 @@
 # Author: Jacob Warren
 # Solves: 5.2.3 and 5.2.4
 
-import json
 import os
 import sys
 import networkx as nx
@@ -11,7 +10,7 @@ import networkx as nx
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from solvers.util import exceptions
 from solvers.util import methods
-from solvers.util import images
+from solvers.util import render
 
 '''
 ==========
@@ -38,7 +37,7 @@ def solve(table):
         "PERT Diagram": img_data
     }
 
-    return json.dumps(result)
+    return result
 
 def not_string(table):
     set_list = list(table.keys())
@@ -74,4 +73,4 @@ def generate_diagram(table):
     graph.add_edges_from([(labels[a], labels[b]) for (a, b) in relation])
     pos = nx.multipartite_layout(graph, subset_key=layers, align="vertical")
 
-    return images.graph_to_base64(graph, pos)
+    return render.graph_image(graph, pos)
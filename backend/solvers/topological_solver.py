@@ -2,7 +2,6 @@
 # Author: Jacob Warren
 # Solves: 5.2.9-5.2.14
 
-import json
 import os
 import sys
 
@@ -48,7 +47,7 @@ def solve(table):
         "Relation": relation_string 
     }
 
-    return json.dumps(result)
+    return result
 
 def not_string(table):
     set_list, relation = table_solver.not_string(table) 
@@ -5,13 +5,17 @@
 # Description: A solver for binary tree notations and representations
 -----------------'''
 
+import os
+import sys
 import re
-import networkx as nx
-import matplotlib.pyplot as plt
 from collections import deque
-from io import BytesIO
-import base64
-import json
+import logging
+
+# Append the parent directory to the path so we can import in utility
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from solvers.util import render
+
+logger = logging.getLogger(__name__)
 
 
 class Node:
@@ -80,7 +84,7 @@ def build_tree_from_table(input_data):
                 node_map[node].right = node_map[right]
                 edges.append((node, right))
         except Exception as e:
-            print(f"Error processing input line '{line}': {e}")
+            logger.warning("Error processing input line %r: %s", line, e)
             continue
 
     if not root_value or root_value not in node_map:
@@ -291,90 +295,21 @@ def level_order_traversal(root):
 # VISUALIZATION METHODS
 #------------------
 
-def add_edges(graph, root, pos, x=0, y=0, level=1):
-    """Recursively adds edges to the graph for visualization."""
-    if root:
-        pos[root.value] = (x, y)
-        if root.left:
-            graph.add_edge(root.value, root.left.value)
-            add_edges(graph, root.left, pos, x - 1 / 2**level, y - 1, level + 1)
-        if root.right:
-            graph.add_edge(root.value, root.right.value)
-            add_edges(graph, root.right, pos, x + 1 / 2**level, y - 1, level + 1)
-
 def draw_tree(root):
     """Draws the binary tree using networkx and matplotlib."""
     if not root:
         return None
-        
-    graph = nx.DiGraph()
-    pos = {}
-    add_edges(graph, root, pos)
-    plt.figure(figsize=(6, 4))
-    nx.draw(graph, pos, with_labels=True, node_size=2000, node_color="lightblue", font_size=10, edge_color="gray")
-    plt.title("Binary Tree Visualization")
-    
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    plt.close()
-    
-    return img_data
 
-def add_edges_for_expression_tree(graph, node, pos, node_ids, x=0, y=0, level=1, x_spacing=1.5):
-    """Recursively adds edges to the graph for expression tree visualization."""
-    if node:
-        node_id = node_ids[node]
-        pos[node_id] = (x, y)
-        
-        if node.left:
-            left_id = node_ids[node.left]
-            graph.add_edge(node_id, left_id)
-            add_edges_for_expression_tree(graph, node.left, pos, node_ids, x - x_spacing / (2 ** level), y - 1, level + 1, x_spacing)
-        
-        if node.right:
-            right_id = node_ids[node.right]
-            graph.add_edge(node_id, right_id)
-            add_edges_for_expression_tree(graph, node.right, pos, node_ids, x + x_spacing / (2 ** level), y - 1, level + 1, x_spacing)
+    graph, pos = render.tree_layout(root)
+    return render.graph_image(graph, pos, style='tree', title="Binary Tree Visualization", figsize=(6, 4))
 
 def draw_expression_tree(root):
     """Draws the binary expression tree with correct alignment."""
     if not root:
         return None
-    
-    graph = nx.DiGraph()
-    pos = {}
-    
-    # Assign unique node identifiers
-    node_ids = {}
-    def assign_ids(node, count=[0]):
-        if node:
-            node_ids[node] = f"{node.value}_{count[0]}"
-            count[0] += 1
-            assign_ids(node.left, count)
-            assign_ids(node.right, count)
-    
-    assign_ids(root)
-    
-    add_edges_for_expression_tree(graph, root, pos, node_ids)
-    
-    # Create label mapping
-    labels = {node_ids[n]: n.value for n in node_ids}
-    
-    plt.figure(figsize=(8, 5))
-    nx.draw(graph, pos, labels=labels, 
-            with_labels=True, node_size=2000, node_color="lightblue", 
-            font_size=10, edge_color="gray")
-    
-    plt.title("Expression Tree Visualization")
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    plt.close()
-    
-    return img_data
+
+    graph, pos, labels = render.expression_tree_layout(root)
+    return render.graph_image(graph, pos, style='tree', labels=labels, title="Expression Tree Visualization", figsize=(8, 5))
 
 def generate_child_array(nodes):
     """Generates the left child-right child representation."""
@@ -432,7 +367,7 @@ def build_tree_from_input(input_str, input_format):
         return root, nodes, tree_type
         
     except Exception as e:
-        print(f"Error building tree: {e}")
+        logger.warning("Error building tree: %s", e)
         return None, {}, tree_type
 
 def reconstruct_tree_from_traversals(traversal1, traversal2, traversal_types):
@@ -472,7 +407,7 @@ def reconstruct_tree_from_traversals(traversal1, traversal2, traversal_types):
         return root, nodes, tree_type
         
     except Exception as e:
-        print(f"Error reconstructing tree: {e}")
+        logger.warning("Error reconstructing tree: %s", e)
         return None, {}, tree_type
 
 def process_tree_result(root, nodes, tree_type):
@@ -566,20 +501,20 @@ def solve(input1, input2, operation):
             root, nodes, tree_type = reconstruct_tree_from_traversals(input1, input2, 'postorder_inorder')
             
         else:
-            return json.dumps({
+            return {
                 "success": False,
                 "error": f"Unknown operation: {operation}"
-            })
+            }
         
         # Process results
         result = process_tree_result(root, nodes, tree_type)
-        return json.dumps(result)
+        return result
         
     except Exception as e:
-        return json.dumps({
+        return {
             "success": False,
             "error": f"An error occurred: {str(e)}"
-        })
+        }
 
 # Legacy interface for backwards compatibility
 def solve_legacy(input1, input2, choice):
@@ -596,15 +531,15 @@ def solve_legacy(input1, input2, choice):
         
         operation = operation_map.get(choice, None)
         if operation is None:
-            return json.dumps({
+            return {
                 "success": False,
                 "error": f"Invalid choice. Must be between 1 and 5."
-            })
+            }
             
         return solve(input1, input2, operation)
         
     except Exception as e:
-        return json.dumps({
+        return {
             "success": False,
             "error": f"An error occurred: {str(e)}"
-        })
\ No newline at end of file
+        }
\ No newline at end of file
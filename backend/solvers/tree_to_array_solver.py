@@ -5,13 +5,19 @@
 # Description: A solver for generating binary trees to array representations
 -----------------'''
 
+import os
+import sys
 import re
 from collections import deque
-import networkx as nx
-import matplotlib.pyplot as plt
-from io import BytesIO
-import base64
-import json
+from matplotlib.patches import Rectangle
+import logging
+
+# Append the parent directory to the path so we can import in utility
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from solvers.util import spans
+from solvers.util import render
+
+logger = logging.getLogger(__name__)
 
 class Node:
     def __init__(self, value):
@@ -19,6 +25,7 @@ class Node:
         self.left = None
         self.right = None
 
+@spans.traced('parse')
 def build_tree_from_input(input_str):
     """Builds a binary tree from level-order user input."""
     if ',' in input_str:
@@ -29,8 +36,6 @@ def build_tree_from_input(input_str):
     values = [v.strip() for v in values]
     values = [v if v.lower() != 'none' else 'None' for v in values]
 
-    print(f"Parsed values: {values}")
-
     if not values or values[0] == 'None':
         return None, {}
 
@@ -61,46 +66,17 @@ def build_tree_from_input(input_str):
                 queue.append(current.right)
             i += 1  # Move to next value regardless
     
-    # Debug output to verify structure
-    print("Tree structure:")
-    for key, node in nodes.items():
-        left_val = node.left.value if node.left else "None"
-        right_val = node.right.value if node.right else "None"
-        print(f"Node {key}: left={left_val}, right={right_val}")
-    
     return root, nodes
 
-def add_edges(graph, root, pos, x=0, y=0, level=1):
-    """Recursively add edges to the graph."""
-    if root:
-        pos[root.value] = (x, y)
-        if root.left:
-            graph.add_edge(root.value, root.left.value)
-            add_edges(graph, root.left, pos, x - 1 / 2**level, y - 1, level + 1)
-        if root.right:
-            graph.add_edge(root.value, root.right.value)
-            add_edges(graph, root.right, pos, x + 1 / 2**level, y - 1, level + 1)
-
 def draw_tree(root):
     """Draws a binary tree using networkx and matplotlib."""
     if not root:
         return None
-        
-    graph = nx.DiGraph()
-    pos = {}
-    add_edges(graph, root, pos)
-    plt.figure(figsize=(6, 4))
-    nx.draw(graph, pos, with_labels=True, node_size=2000, node_color="lightblue", font_size=10, edge_color="gray")
-    plt.title("Binary Tree Visualization")
-    
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    plt.close()
-    
-    return img_data
 
+    graph, pos = render.tree_layout(root)
+    return render.graph_image(graph, pos, style='tree', title="Binary Tree Visualization", figsize=(6, 4))
+
+@spans.traced('parse')
 def tokenize(expression):
     """Tokenizes an expression, handling implicit multiplication."""
     expression = expression.replace(" ", "")
@@ -118,6 +94,7 @@ def precedence(op):
     """Returns precedence of operators."""
     return {'+': 1, '-': 1, '*': 2, '/': 2, '^': 3}.get(op, 0)
 
+@spans.traced('parse')
 def to_postfix(tokens):
     """Converts infix expression to postfix notation (Reverse Polish Notation)."""
     output = []
@@ -142,6 +119,7 @@ def to_postfix(tokens):
     
     return output
 
+@spans.traced('parse')
 def build_expression_tree(postfix_tokens):
     """Builds an expression tree from postfix notation."""
     stack = []
@@ -176,59 +154,13 @@ def build_expression_tree(postfix_tokens):
     
     return stack[0], complete_nodes
 
-def add_edges_for_expression_tree(graph, node, pos, node_ids, x=0, y=0, level=1, x_spacing=1.5):
-    """Recursively adds edges to the graph and positions nodes uniquely."""
-    if node:
-        node_id = node_ids[node]  # Get the unique ID for this node
-        pos[node_id] = (x, y)  # Assign position
-        
-        if node.left:
-            left_id = node_ids[node.left]
-            graph.add_edge(node_id, left_id)
-            add_edges_for_expression_tree(graph, node.left, pos, node_ids, x - x_spacing / (2 ** level), y - 1, level + 1, x_spacing)
-        
-        if node.right:
-            right_id = node_ids[node.right]
-            graph.add_edge(node_id, right_id)
-            add_edges_for_expression_tree(graph, node.right, pos, node_ids, x + x_spacing / (2 ** level), y - 1, level + 1, x_spacing)
-
 def draw_expression_tree(root):
     """Draws the binary expression tree with correct alignment."""
     if not root:
         return None
-    
-    graph = nx.DiGraph()
-    pos = {}
-    
-    # Assign unique node identifiers using their object reference
-    node_ids = {}
-    def assign_ids(node, count=[0]):
-        if node:
-            node_ids[node] = f"{node.value}_{count[0]}"  # Create a unique ID
-            count[0] += 1
-            assign_ids(node.left, count)
-            assign_ids(node.right, count)
-    
-    assign_ids(root)  # Assign unique IDs before drawing
-    
-    add_edges_for_expression_tree(graph, root, pos, node_ids)
-    
-    # Create a mapping for labels, stripping the unique ID from display
-    labels = {node_ids[n]: n.value for n in node_ids}
-    
-    plt.figure(figsize=(8, 5))
-    nx.draw(graph, pos, labels=labels, 
-            with_labels=True, node_size=2000, node_color="lightblue", 
-            font_size=10, edge_color="gray")
-    
-    plt.title("Expression Tree Visualization")
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    plt.close()
-    
-    return img_data
+
+    graph, pos, labels = render.expression_tree_layout(root)
+    return render.graph_image(graph, pos, style='tree', labels=labels, title="Expression Tree Visualization", figsize=(8, 5))
 
 def generate_child_array(nodes):
     """Generates the left child-right child representation like Figure 6.42a."""
@@ -352,8 +284,9 @@ def solve(input, choice):
             "error": f"An error occurred: {str(e)}"
         }
     
-    return json.dumps(result)
+    return result
 
+@spans.traced('render')
 def create_pointer_diagram(nodes):
     """
     Creates a visualization where each node has three squares:
@@ -368,7 +301,8 @@ def create_pointer_diagram(nodes):
     # Create figure with appropriate size
     fig_height = max(4, num_nodes * 1.5)
     fig_width = 14
-    fig, ax = plt.subplots(figsize=(fig_width, fig_height))
+    fig = render.new_figure((fig_width, fig_height))
+    ax = fig.add_subplot()
     
     # Parameters for node layout
     node_width = 1.2 
@@ -390,14 +324,14 @@ def create_pointer_diagram(nodes):
         
         # Draw the three connected squares
         # 1. Value square (left)
-        value_rect = plt.Rectangle((x, y), node_width, node_height, 
+        value_rect = Rectangle((x, y), node_width, node_height, 
                             fc='#d0e8f2', ec='black', lw=2.0) 
         ax.add_patch(value_rect)
         ax.text(x + node_width/2, y + node_height/2, str(key),
                 ha='center', va='center', fontweight='bold', fontsize=14) 
         
         # 2. Left pointer square (middle)
-        left_rect = plt.Rectangle((x + node_width, y), node_width, node_height, 
+        left_rect = Rectangle((x + node_width, y), node_width, node_height, 
                             fc='#f2e4d0', ec='black', lw=2.0)
         ax.add_patch(left_rect)
         
@@ -410,7 +344,7 @@ def create_pointer_diagram(nodes):
             ax.plot(x + node_width*1.5, y + node_height/2, 'ko', markersize=6)
         
         # 3. Right pointer square (right)
-        right_rect = plt.Rectangle((x + node_width*2, y), node_width, node_height, 
+        right_rect = Rectangle((x + node_width*2, y), node_width, node_height, 
                             fc='#f2d0d0', ec='black', lw=2.0)
         ax.add_patch(right_rect)
         
@@ -444,7 +378,7 @@ def create_pointer_diagram(nodes):
                             arrowprops=dict(arrowstyle='->', color='blue', lw=2.0,
                                         connectionstyle='angle3,angleA=0,angleB=90'))
             except Exception as e:
-                print(f"ERROR drawing left arrow for {key}: {e}")
+                logger.warning("Could not draw left arrow for %s: %s", key, e)
         
         # Draw arrow from right pointer to right child
         if node.right:
@@ -463,12 +397,12 @@ def create_pointer_diagram(nodes):
                             arrowprops=dict(arrowstyle='->', color='red', lw=2.0,
                                         connectionstyle='angle3,angleA=0,angleB=90'))
             except Exception as e:
-                print(f"ERROR drawing right arrow for {key}: {e}")
+                logger.warning("Could not draw right arrow for %s: %s", key, e)
     
     # Add a legend for the squares
-    value_patch = plt.Rectangle((0, 0), 1, 1, fc='#d0e8f2', ec='black')
-    left_patch = plt.Rectangle((0, 0), 1, 1, fc='#f2e4d0', ec='black')
-    right_patch = plt.Rectangle((0, 0), 1, 1, fc='#f2d0d0', ec='black')
+    value_patch = Rectangle((0, 0), 1, 1, fc='#d0e8f2', ec='black')
+    left_patch = Rectangle((0, 0), 1, 1, fc='#f2e4d0', ec='black')
+    right_patch = Rectangle((0, 0), 1, 1, fc='#f2d0d0', ec='black')
     ax.legend([value_patch, left_patch, right_patch],
             ['Node Value', 'Left Child Pointer', 'Right Child Pointer'],
             loc='upper right', bbox_to_anchor=(0.98, 0.98))
@@ -481,12 +415,4 @@ def create_pointer_diagram(nodes):
     ax.axis('off')
     ax.set_title("Pointer Representation", fontsize=16, pad=10) 
 
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png', dpi=150, 
-                bbox_inches='tight',
-                pad_inches=0.2)  
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    plt.close()
-
-    return img_data
\ No newline at end of file
+    return render.encode(fig, dpi=150, bbox_inches='tight', pad_inches=0.2)
\ No newline at end of file
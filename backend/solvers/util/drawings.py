@@ -0,0 +1,80 @@
+# File: drawings.py
+# Author: Backend Team
+# Description: diagrams described instead of drawn, for the renderer processes to draw
+#
+# When the renderer pool is on (see executor.py), a solver process doesn't draw its graphs:
+# render.graph_image returns a Drawing, a picklable description of the figure, in the solver's
+# result. The gunicorn worker hands every Drawing in the result to a warm renderer process and
+# swaps the image in, while the solver process is already on its next problem. Kept free of
+# matplotlib and networkx so unpickling a Drawing costs the gunicorn worker nothing.
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_deferred = ContextVar('deferred_drawings', default=False)
+
+class Drawing:
+    '''
+        One graph_image call, to be drawn later.
+
+        Parameters
+        ----------
+        directed (bool):
+            Whether the graph is directed
+        nodes (list):
+            The graph's nodes, in order
+        edges (list):
+            (u, v, attributes) for every edge, in order
+        image_format (str):
+            The format the request asked for (see formats.py)
+        arguments (dict):
+            The other graph_image arguments: pos, style, title, figsize, edge_labels, savefig
+                and the draw options.
+    '''
+    __slots__ = ('directed', 'nodes', 'edges', 'image_format', 'arguments')
+
+    def __init__(self, directed, nodes, edges, image_format, arguments):
+        self.directed = directed
+        self.nodes = nodes
+        self.edges = edges
+        self.image_format = image_format
+        self.arguments = arguments
+
+def deferred():
+    # Whether graph_image should describe its figure instead of drawing it
+    return _deferred.get()
+
+@contextmanager
+def defer():
+    token = _deferred.set(True)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+
+def replace(result, draw):
+    '''
+        Swaps every Drawing in a solver result for draw(drawing).
+
+        Parameters
+        ----------
+        result:
+            The solver result, any nesting of dicts, lists and tuples
+        draw (function):
+            Takes a Drawing and returns its image
+
+        Returns
+        ----------
+        result:
+            The result with images in place of the drawings. Results without drawings
+                are returned as they are.
+    '''
+    if isinstance(result, Drawing):
+        return draw(result)
+    if isinstance(result, dict):
+        return {key: replace(value, draw) for key, value in result.items()}
+    if isinstance(result, list):
+        return [replace(value, draw) for value in result]
+    if isinstance(result, tuple):
+        return tuple(replace(value, draw) for value in result)
+    return result
@@ -2,4 +2,34 @@ class CalculateError(Exception):
     """Custom exception for calculation errors in solvers."""
     def __init__(self, message):
         self.message = message
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class SolverTimeoutError(Exception):
+    """Raised when a solver runs past its wall-clock budget and is cancelled."""
+    def __init__(self, solver_type, timeout):
+        self.solver_type = solver_type
+        self.timeout = timeout
+        self.message = f"{solver_type} did not finish within {timeout:g} seconds"
+        super().__init__(solver_type, timeout)
+
+    def __str__(self):
+        return self.message
+
+class ProblemTooLargeError(Exception):
+    """Raised when admission control estimates a problem is too large to solve as asked."""
+    def __init__(self, solver_type, cost, limit, queueable=False):
+        self.solver_type = solver_type
+        self.cost = cost
+        self.limit = limit
+        self.queueable = queueable
+        self.message = f"{solver_type} input is too large (estimated cost {cost:g}, limit {limit:g})"
+        super().__init__(solver_type, cost, limit)
+
+    def __str__(self):
+        return self.message
+
+class ServerBusyError(Exception):
+    """Raised when work would have to queue behind a full queue, the caller should retry later."""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
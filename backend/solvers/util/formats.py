@@ -0,0 +1,33 @@
+# File: formats.py
+# Author: Backend Team
+# Description: the image format requested for the diagrams of the current solve
+#
+# Kept apart from render.py so the registry can set the format without importing matplotlib.
+# The format is a context variable, so concurrent solves (threads, batch items) each keep
+# their own.
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from . import exceptions
+
+# png: base64 PNG (the default), svg: SVG markup, graph: nodes/edges/coordinates for the
+# frontend to draw itself (diagrams that aren't a single graph fall back to svg).
+# png-url / svg-url: the image is put in the image store and sent as its /render/<sha> URL.
+IMAGE_FORMATS = ('png', 'svg', 'graph', 'png-url', 'svg-url')
+
+_image_format = ContextVar('image_format', default='png')
+
+def image_format():
+    return _image_format.get()
+
+@contextmanager
+def use(image_format):
+    if image_format not in IMAGE_FORMATS:
+        raise exceptions.CalculateError(f"Unsupported image format '{image_format}', expected one of: {', '.join(IMAGE_FORMATS)}")
+
+    token = _image_format.set(image_format)
+    try:
+        yield
+    finally:
+        _image_format.reset(token)
@@ -0,0 +1,178 @@
+# File: image_store.py
+# Author: Backend Team
+# Description: content-addressed storage for rendered diagrams
+#
+# An image is stored under the sha256 of its bytes and served from /render/<sha>.<ext>, so a
+# URL always names the same bytes: browsers and proxies can cache it forever and revalidate
+# it without the backend reading anything. The store is a SQLite database in logs/cache shared
+# by every gunicorn worker and solver process on the node, and the least recently used images
+# are dropped once it grows past RENDER_STORE_MB.
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../../logs/cache'))
+
+# Extension -> content type of the images the store serves
+MIME_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+# The URLs put returns
+IMAGE_URL = re.compile(r'^/render/([0-9a-f]{64})\.(png|svg)$')
+
+class ImageStore:
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    def _connect(self):
+        # sqlite connections can't cross threads or a fork, so keep one per thread per process
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS image (
+                digest TEXT PRIMARY KEY,
+                ext TEXT NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        connection.execute("CREATE INDEX IF NOT EXISTS image_accessed ON image (accessed)")
+
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def put(self, data, ext):
+        '''
+            A function to store an image, or refresh it when the same bytes are already stored.
+
+            Parameters
+            ----------
+            data (bytes):
+                The encoded image
+            ext (str):
+                Its extension, a key of MIME_TYPES
+
+            Returns
+            ----------
+            url: str
+                /render/<sha256>.<ext>, or None when the store is unavailable (the caller
+                    then sends the image inline).
+        '''
+        digest = hashlib.sha256(data).hexdigest()
+
+        try:
+            connection = self._connect()
+            now = time.time()
+
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                refreshed = connection.execute("UPDATE image SET accessed = ? WHERE digest = ?", (now, digest)).rowcount
+                if not refreshed:
+                    connection.execute(
+                        "INSERT INTO image (digest, ext, data, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                        (digest, ext, data, len(data), now)
+                    )
+                    self._evict(connection)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except (sqlite3.Error, OSError):
+            return None
+
+        return f"/render/{digest}.{ext}"
+
+    def _evict(self, connection):
+        # The least recently stored or served images go first, until we're back under budget
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM image").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        removed = 0
+        doomed = []
+        for digest, size in connection.execute("SELECT digest, size FROM image ORDER BY accessed"):
+            if total - removed <= self.max_bytes:
+                break
+            doomed.append((digest,))
+            removed += size
+
+        connection.executemany("DELETE FROM image WHERE digest = ?", doomed)
+
+    def get(self, digest, ext):
+        '''
+            Returns
+            ----------
+            data: bytes
+                The stored image, or None when it is unknown, was evicted or has another extension.
+        '''
+        connection = self._connect()
+        row = connection.execute("SELECT data FROM image WHERE digest = ? AND ext = ?", (digest, ext)).fetchone()
+        if row is None:
+            return None
+
+        connection.execute("UPDATE image SET accessed = ? WHERE digest = ?", (time.time(), digest))
+        return bytes(row[0])
+
+    def has(self, digest, ext):
+        '''
+            Returns
+            ----------
+            stored: bool
+                Whether the image is still stored. A stored image counts as used, so it is
+                    kept longer.
+        '''
+        connection = self._connect()
+        return connection.execute("UPDATE image SET accessed = ? WHERE digest = ? AND ext = ?", (time.time(), digest, ext)).rowcount > 0
+
+    def stats(self):
+        count, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM image").fetchone()
+        return {"images": count, "bytes": size, "maxBytes": self.max_bytes}
+
+# The store shared by every process on the node
+store = ImageStore(
+    os.getenv('RENDER_STORE_DB', os.path.join(CACHE_DIR, 'images.db')),
+    int(float(os.getenv('RENDER_STORE_MB', '512')) * 1024 * 1024)
+)
+
+def available(result):
+    '''
+        A function to check that every image URL in a solver result can still be served.
+            Results are cached longer than the store may keep their images.
+
+        Parameters
+        ----------
+        result (json):
+            A solver result, with png-url or svg-url diagrams
+
+        Returns
+        ----------
+        available: bool
+            False when an image was evicted (or the store can't be read), so the result
+                should be solved again, which stores its images again under the same URLs.
+    '''
+    if isinstance(result, dict):
+        return all(available(value) for value in result.values())
+    if isinstance(result, (list, tuple)):
+        return all(available(value) for value in result)
+    if isinstance(result, str):
+        match = IMAGE_URL.match(result)
+        if match is not None:
+            try:
+                return store.has(*match.groups())
+            except (sqlite3.Error, OSError):
+                return False
+
+    return True
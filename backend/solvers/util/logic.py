@@ -0,0 +1,257 @@
+# File: logic.py
+# Author: Backend Team
+# Description: the tokenizer and parser for the logical formulas the logic solvers read
+#
+# Formulas come in several notations: unicode (¬ ∧ ∨ → ↔, and look-alikes such as ⇒ and ⋀),
+# ASCII (^ v -> <> and primes), the book's copy and paste forms (` for and, ~ for or, S for
+# implies, 4 for iff) and the words not/and/or. The tokenizer reads them in one pass, and the parser builds the tree by
+# precedence climbing, so a formula is read in time linear in its length.
+#
+# Trees are nested tuples, so equal subformulas compare and hash equal:
+#   ('var', 'A'), ('const', True), ('not', x), ('and', x, y, ...), ('or', x, y, ...),
+#   ('implies', x, y), ('iff', x, y)
+
+from . import exceptions
+
+# Operator spellings, longest first where one is a prefix of another
+SYMBOLS = {
+    '<->': 'iff', '<>': 'iff', '==': 'iff', '↔': 'iff', '4': 'iff',
+    '->': 'implies', '<=': 'implies', '→': 'implies', '>': 'implies', 'S': 'implies',
+    '∧': 'and', '^': 'and', '`': 'and',
+    '∨': 'or', 'v': 'or', 'V': 'or', '~': 'or',
+    '¬': 'not', "'": 'prime', '′': 'prime',
+    '(': '(', '[': '(', ')': ')', ']': ')',
+}
+
+# Look-alikes pasted from other documents (see strings.OPERATOR_VARIANTS, which maps them for
+#   cache keys)
+SYMBOLS.update({
+    '⇒': 'implies', '⟹': 'implies', '⟶': 'implies', '⊃': 'implies',
+    '⇔': 'iff', '⟺': 'iff', '⟷': 'iff', '≡': 'iff',
+    '⋀': 'and', '&': 'and',
+    '⋁': 'or', '|': 'or',
+    '￢': 'not', '’': 'prime', 'ʹ': 'prime',
+    '（': '(', '）': ')',
+})
+WORDS = {'not': 'not', 'and': 'and', 'or': 'or'}
+CONSTANTS = {'0': False, '1': True}
+
+# Loosest first, ¬ and primes bind tighter than all of them. Implications group to the left,
+#   A → B → C is (A → B) → C, as the solvers always read them.
+PRECEDENCE = {'implies': 1, 'or': 2, 'and': 3, 'iff': 4}
+
+def tokenize(formula):
+    '''
+        Splits a formula into tokens.
+
+        Parameters
+        ----------
+        formula (str):
+            The formula, in any of the supported notations
+
+        Returns
+        ----------
+        tokens: list
+            (kind, value, position) for every token, ending with an 'end' token. Kinds are
+                'var', 'const', the operators ('not', 'prime', 'and', 'or', 'implies', 'iff'),
+                '(' and ')'. The value is the letter, the constant, or the operator as it was
+                written. Raises CalculateError for characters that aren't part of a formula.
+    '''
+    tokens = []
+    position = 0
+    length = len(formula)
+
+    while position < length:
+        char = formula[position]
+
+        if char.isspace():
+            position += 1
+            continue
+
+        for size in (3, 2, 1):
+            symbol = formula[position:position + size]
+            kind = SYMBOLS.get(symbol)
+            if kind is not None:
+                tokens.append((kind, symbol, position))
+                position += size
+                break
+        else:
+            if 'A' <= char <= 'Z':
+                tokens.append(('var', char, position))
+                position += 1
+            elif char in CONSTANTS:
+                tokens.append(('const', CONSTANTS[char], position))
+                position += 1
+            elif 'a' <= char <= 'z':
+                end = position
+                while end < length and 'a' <= formula[end] <= 'z':
+                    end += 1
+                word = formula[position:end]
+                if word not in WORDS:
+                    raise exceptions.CalculateError(f"Unknown word '{word}' at position {position + 1} of the formula")
+                tokens.append((WORDS[word], word, position))
+                position = end
+            else:
+                raise exceptions.CalculateError(f"Unexpected '{char}' at position {position + 1} of the formula")
+
+    tokens.append(('end', None, length))
+    return tokens
+
+# How format writes each operator, whatever notation it was typed in
+DISPLAY = {
+    'iff': '↔', 'implies': '→', 'and': '∧', 'or': '∨', 'not': '¬',
+    '（': '(', '）': ')', '’': "'", 'ʹ': "'",
+}
+
+def format(formula):
+    '''
+        Writes a formula with the unicode operators, e.g. for truth table headers.
+
+        Parameters
+        ----------
+        formula (str):
+            The formula, in any of the supported notations
+
+        Returns
+        ----------
+        formula: str
+            The formula as tokenized, with ¬ ∧ ∨ → ↔ for the operators however they were
+                written. Letters, constants, brackets, primes and the spacing between tokens
+                are kept as typed, except that ¬ is written next to its operand.
+    '''
+    text = []
+    end = 0
+    previous = None
+    for kind, value, position in tokenize(formula):
+        if previous != 'not':
+            text.append(formula[end:position])
+        if kind == 'end':
+            break
+
+        written = formula[position:position + (1 if kind in ('var', 'const') else len(value))]
+        text.append(DISPLAY.get(kind, DISPLAY.get(written, written)))
+        end = position + len(written)
+        previous = kind
+
+    return ''.join(text)
+
+def variables(formula):
+    '''
+        The letters in a formula, sorted, each once.
+    '''
+    return sorted({value for kind, value, _ in tokenize(formula) if kind == 'var'})
+
+def parse(formula):
+    '''
+        Parses a formula into a tree.
+
+        Parameters
+        ----------
+        formula (str):
+            The formula, in any of the supported notations
+
+        Returns
+        ----------
+        tree: tuple
+            The formula's tree (see the top of this file). Raises CalculateError for
+                malformed formulas.
+    '''
+    return _parse_tokens(tokenize(formula))
+
+def conjuncts(formula):
+    '''
+        Parses formulas joined by ∧ at the top level, e.g. the hypotheses of a proof. The ∧
+            between them binds loosest, so "A → B ∧ A" is the two formulas A → B and A.
+
+        Returns
+        ----------
+        trees: list
+            One tree per formula
+    '''
+    tokens = tokenize(formula)
+    trees = []
+    start = 0
+    depth = 0
+    for index, (kind, _, position) in enumerate(tokens):
+        if kind == '(':
+            depth += 1
+        elif kind == ')':
+            depth -= 1
+        elif kind == 'end' or (kind == 'and' and depth == 0):
+            trees.append(_parse_tokens(tokens[start:index] + [('end', None, position)]))
+            start = index + 1
+
+    return trees
+
+def _parse_tokens(tokens):
+    try:
+        tree, position = _expression(tokens, 0, 1)
+    except RecursionError:
+        raise exceptions.CalculateError("The formula is nested too deeply") from None
+
+    if tokens[position][0] != 'end':
+        raise exceptions.CalculateError(f"Unexpected {_describe(tokens[position])} at position {tokens[position][2] + 1} of the formula")
+
+    return tree
+
+def _expression(tokens, position, lowest):
+    # Precedence climbing: an operand, then every operator that binds at least as tightly as lowest
+    left, position = _operand(tokens, position)
+
+    while True:
+        kind = tokens[position][0]
+        precedence = PRECEDENCE.get(kind)
+        if precedence is None or precedence < lowest:
+            return left, position
+
+        operands = [left]
+        if kind == 'implies':
+            right, position = _expression(tokens, position + 1, precedence + 1)
+            operands.append(right)
+        else:
+            # A run of the same operator is read at once, so long chains don't nest deeply
+            while tokens[position][0] == kind:
+                right, position = _expression(tokens, position + 1, precedence + 1)
+                operands.append(right)
+
+        if kind == 'iff':
+            # A ↔ B ↔ C reads as A ↔ B and B ↔ C
+            pairs = [('iff', a, b) for a, b in zip(operands, operands[1:])]
+            left = pairs[0] if len(pairs) == 1 else ('and', *pairs)
+        else:
+            left = (kind, *operands)
+
+def _operand(tokens, position):
+    # A letter, constant or parenthesized formula, with its prefix and postfix negations
+    token = tokens[position]
+    kind, value, at = token
+
+    if kind == 'not':
+        operand, position = _operand(tokens, position + 1)
+        return ('not', operand), position
+
+    if kind in ('var', 'const'):
+        tree = (kind, value)
+        position += 1
+    elif kind == '(':
+        tree, position = _expression(tokens, position + 1, 1)
+        closing, _, closing_at = tokens[position]
+        if closing != ')':
+            raise exceptions.CalculateError(f"Expected ')' at position {closing_at + 1} of the formula")
+        position += 1
+    else:
+        raise exceptions.CalculateError(f"Expected a letter or '(' at position {at + 1} of the formula, found {_describe(token)}")
+
+    while tokens[position][0] == 'prime':
+        tree = ('not', tree)
+        position += 1
+
+    return tree, position
+
+def _describe(token):
+    kind, value, _ = token
+    if kind == 'end':
+        return 'the end'
+    if kind == 'const':
+        return "'1'" if value else "'0'"
+    return f"'{value}'"
@@ -0,0 +1,296 @@
+# File: render.py
+# Author: Backend Team
+# Description: the one place diagrams are drawn and encoded
+#
+# Built on matplotlib's object-oriented API: every diagram gets its own Figure on its own Agg
+# canvas, so nothing touches pyplot's global "current figure" and diagrams can be rendered on
+# several threads at once. Solvers describe what to draw (a graph and its positions, a tree, a
+# style preset) and get back the image in the format the request asked for (see formats.py):
+# a base64 PNG, SVG markup, a /render URL of the image in the image store, or for single graphs
+# the nodes, edges and coordinates themselves. With the renderer pool on, single graphs are
+# drawn in a renderer process instead (see drawings.py).
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import matplotlib
+matplotlib.use('Agg') # Use to generate diagrams without a display
+# SVG text as <text> rather than glyph outlines, and stable element IDs (same figure, same bytes)
+matplotlib.rcParams['svg.fonttype'] = 'none'
+matplotlib.rcParams['svg.hashsalt'] = 'render'
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import networkx as nx
+
+from . import drawings
+from . import formats
+from . import image_store
+from . import spans
+
+# nx.draw options shared by every diagram of a kind
+STYLES = {
+    # hasse and PERT diagrams
+    'diagram': dict(node_size=2000, node_color="skyblue", font_size=15, font_color="black", font_weight="bold"),
+    # graphs built from edge lists
+    'graph': dict(node_color='skyblue', edge_color='gray', node_size=2000, font_size=15, font_weight="bold", arrows=True),
+    # graphs drawn side by side, each with its own node_color
+    'comparison': dict(edge_color='gray', node_size=2000, font_size=15),
+    # binary and expression trees
+    'tree': dict(node_size=2000, node_color="lightblue", font_size=10, edge_color="gray"),
+}
+
+def new_figure(figsize=None):
+    # a figure on its own Agg canvas, figsize defaults to matplotlib's 6.4 x 4.8 inches
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+def draw_graph(ax, graph, pos, style='graph', edge_labels=None, **options):
+    # draw a networkx graph on ax with a style preset, options override the preset
+    nx.draw(graph, pos, ax=ax, with_labels=True, **{**STYLES[style], **options})
+    if edge_labels:
+        nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, font_size=12, font_color="red", ax=ax)
+
+@spans.traced('render')
+def encode(figure, **savefig):
+    # the single encode path: PNG unless the request asked for svg (or graph, which only single
+    # graphs can be), inline or as a URL into the image store. savefig options (dpi,
+    # bbox_inches...) pass through
+    image_format = formats.image_format()
+    ext = 'png' if image_format.startswith('png') else 'svg'
+
+    img_buf = BytesIO()
+    if ext == 'png':
+        figure.savefig(img_buf, format='png', **savefig)
+    else:
+        savefig.pop('dpi', None)
+        figure.savefig(img_buf, format='svg', metadata={'Date': None}, **savefig)
+
+    if image_format.endswith('-url'):
+        url = image_store.store.put(img_buf.getvalue(), ext)
+        if url is not None:
+            return url
+    if ext == 'png':
+        return base64.b64encode(img_buf.getvalue()).decode('utf-8')
+    return img_buf.getvalue().decode('utf-8')
+
+def graph_data(graph, pos, style='diagram', title=None, edge_labels=None, labels=None, **options):
+    # the structured form of a graph image: what to draw and where, for the frontend to draw
+    labels = labels or {}
+    edge_labels = edge_labels or {}
+    settings = {**STYLES[style], **options}
+
+    return {
+        "format": "graph",
+        "title": title,
+        "directed": graph.is_directed(),
+        "nodeColor": settings.get('node_color', '#1f78b4'),
+        "edgeColor": settings.get('edge_color', 'k'),
+        "nodes": [
+            {"id": str(node), "label": str(labels.get(node, node)), "x": float(pos[node][0]), "y": float(pos[node][1])}
+            for node in graph.nodes
+        ],
+        "edges": [
+            {"source": str(u), "target": str(v), "label": None if (u, v) not in edge_labels else str(edge_labels[(u, v)])}
+            for u, v in graph.edges
+        ]
+    }
+
+@spans.traced('render')
+def graph_image(graph, pos=None, style='diagram', title=None, figsize=None, edge_labels=None, savefig=None, **options):
+    '''
+        Draws one graph filling the whole figure, in the format the request asked for.
+
+        Parameters
+        ----------
+        graph (nx.Graph):
+            The graph to draw
+        pos (dict):
+            Node -> (x, y). Defaults to graph_layout(graph), computed wherever the graph
+                is drawn.
+        style (str):
+            A preset in STYLES, options override single settings of it
+        title (str):
+            Optional title above the graph
+        edge_labels (dict):
+            Optional (u, v) -> label drawn on the edges, e.g. weights
+        savefig (dict):
+            Optional encode options, e.g. {'dpi': 120, 'bbox_inches': 'tight'}
+
+        Returns
+        ----------
+        image: str or dict
+            A base64 PNG, SVG markup, a /render URL, or the graph_data() of the graph. A
+                Drawing in its place while drawings are deferred to the renderer pool.
+    '''
+    if formats.image_format() == 'graph':
+        return graph_data(graph, pos if pos is not None else graph_layout(graph), style, title, edge_labels, **options)
+
+    if drawings.deferred():
+        return drawings.Drawing(
+            graph.is_directed(),
+            list(graph.nodes(data=True)),
+            list(graph.edges(data=True)),
+            formats.image_format(),
+            dict(pos=pos, style=style, title=title, figsize=figsize, edge_labels=edge_labels, savefig=savefig, **options)
+        )
+
+    if pos is None:
+        pos = graph_layout(graph)
+
+    figure = new_figure(figsize)
+    ax = figure.add_axes((0, 0, 1, 1))
+    draw_graph(ax, graph, pos, style, edge_labels=edge_labels, **options)
+    if title:
+        ax.set_title(title)
+
+    return encode(figure, **(savefig or {}))
+
+def draw(drawing):
+    # draw a deferred graph_image call, exactly as it would have been drawn in the solver
+    graph = nx.DiGraph() if drawing.directed else nx.Graph()
+    graph.add_nodes_from(drawing.nodes)
+    graph.add_edges_from(drawing.edges)
+
+    with formats.use(drawing.image_format):
+        return graph_image(graph, **drawing.arguments)
+
+def warm_up():
+    # draw and encode a small graph in both encodings, so fonts, the Agg canvas and the SVG
+    # backend are loaded before the first real diagram
+    graph = nx.DiGraph([(0, 1)])
+    for image_format in ('png', 'svg'):
+        with formats.use(image_format):
+            graph_image(graph, {0: (0, 0), 1: (1, 1)}, title="warm up", edge_labels={(0, 1): 1})
+
+
+# Graph layouts. Seeded, so a graph always gets the same picture (and the same image bytes),
+# cached on a hash of the graph, and cheaper than a force simulation for big graphs:
+# spring up to LAYOUT_SPRING_MAX_NODES, then a two column layout for bipartite graphs,
+# spectral for connected graphs up to LAYOUT_SPECTRAL_MAX_NODES and circular for the rest.
+# networkx needs scipy for spring and spectral layouts of 500+ nodes, keep both limits below.
+LAYOUT_SEED = int(os.getenv('LAYOUT_SEED', '12'))
+LAYOUT_SPRING_MAX_NODES = int(os.getenv('LAYOUT_SPRING_MAX_NODES', '100'))
+LAYOUT_SPECTRAL_MAX_NODES = int(os.getenv('LAYOUT_SPECTRAL_MAX_NODES', '400'))
+LAYOUT_CACHE_SIZE = int(os.getenv('LAYOUT_CACHE_SIZE', '256'))
+
+_layouts = OrderedDict()
+_layouts_lock = threading.Lock()
+
+def _canonical_graph(graph):
+    # the same graph with its nodes and edges in sorted order, and its hash: layouts only
+    # depend on the iteration order, so equal graphs typed in any order get the same picture
+    nodes = sorted(graph.nodes, key=repr)
+    edges = graph.edges(data='weight')
+    if not graph.is_directed():
+        edges = [(*sorted((u, v), key=repr), weight) for u, v, weight in edges]
+    edges = sorted(edges, key=repr)
+
+    canonical = graph.__class__()
+    canonical.add_nodes_from(nodes)
+    for u, v, weight in edges:
+        if weight is None:
+            canonical.add_edge(u, v)
+        else:
+            canonical.add_edge(u, v, weight=weight)
+
+    payload = json.dumps([graph.is_directed(), [repr(n) for n in nodes], [repr(e) for e in edges]])
+    return canonical, hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _compute_layout(graph):
+    size = graph.number_of_nodes()
+    if size <= LAYOUT_SPRING_MAX_NODES:
+        return nx.spring_layout(graph, seed=LAYOUT_SEED)
+
+    undirected = graph.to_undirected(as_view=True)
+    if nx.is_bipartite(undirected):
+        colors = nx.algorithms.bipartite.color(undirected)
+        nx.set_node_attributes(graph, colors, 'side')
+        return nx.multipartite_layout(graph, subset_key='side')
+    if size <= LAYOUT_SPECTRAL_MAX_NODES and nx.is_connected(undirected):
+        return nx.spectral_layout(graph)
+    return nx.circular_layout(graph)
+
+@spans.traced('render')
+def graph_layout(graph):
+    '''
+        Positions the nodes of a graph, deterministically.
+
+        Parameters
+        ----------
+        graph (nx.Graph):
+            The graph to lay out
+
+        Returns
+        ----------
+        pos: dict
+            Node -> (x, y), the same for every request with this graph.
+    '''
+    canonical, key = _canonical_graph(graph)
+    with _layouts_lock:
+        pos = _layouts.get(key)
+        if pos is not None:
+            _layouts.move_to_end(key)
+            return dict(pos)
+
+    pos = {node: (float(x), float(y)) for node, (x, y) in _compute_layout(canonical).items()}
+
+    with _layouts_lock:
+        _layouts[key] = pos
+        while len(_layouts) > LAYOUT_CACHE_SIZE:
+            _layouts.popitem(last=False)
+
+    return dict(pos)
+
+
+# Tree layouts. Trees are any nodes with .value, .left and .right.
+def tree_layout(root):
+    # (graph, pos) with children spread 1/2^level either side of their parent
+    graph = nx.DiGraph()
+    pos = {}
+
+    def add_edges(node, x, y, level):
+        pos[node.value] = (x, y)
+        if node.left:
+            graph.add_edge(node.value, node.left.value)
+            add_edges(node.left, x - 1 / 2**level, y - 1, level + 1)
+        if node.right:
+            graph.add_edge(node.value, node.right.value)
+            add_edges(node.right, x + 1 / 2**level, y - 1, level + 1)
+
+    if root:
+        add_edges(root, 0, 0, 1)
+    return graph, pos
+
+def expression_tree_layout(root, x_spacing=1.5):
+    # (graph, pos, labels) for trees whose values repeat (e.g. "x * x"), nodes get unique IDs
+    node_ids = {}
+    def assign_ids(node):
+        if node:
+            node_ids[node] = f"{node.value}_{len(node_ids)}"
+            assign_ids(node.left)
+            assign_ids(node.right)
+    assign_ids(root)
+
+    graph = nx.DiGraph()
+    pos = {}
+
+    def add_edges(node, x, y, level):
+        node_id = node_ids[node]
+        pos[node_id] = (x, y)
+        if node.left:
+            graph.add_edge(node_id, node_ids[node.left])
+            add_edges(node.left, x - x_spacing / (2 ** level), y - 1, level + 1)
+        if node.right:
+            graph.add_edge(node_id, node_ids[node.right])
+            add_edges(node.right, x + x_spacing / (2 ** level), y - 1, level + 1)
+
+    if root:
+        add_edges(root, 0, 0, 1)
+    labels = {node_ids[node]: node.value for node in node_ids}
+    return graph, pos, labels
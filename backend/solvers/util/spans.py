@@ -0,0 +1,107 @@
+# File: spans.py
+# Author: Backend Team
+# Description: lightweight per-stage timing (parse / compute / render / serialize ...)
+#
+# Stages are exclusive: time spent in a nested span is taken off the enclosing one, so a
+# request's stages add up to its wall time. Outside of a recorder (scripts, tests) spans
+# cost one context variable lookup and record nothing. Threads that share a recorder (e.g.
+# the items of a batch) each keep their own stack of open spans.
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+_recorder = ContextVar('spans', default=None)
+
+class Recorder:
+    def __init__(self):
+        self.totals = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self):
+        # the spans open in the calling thread
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def add(self, stage, ms):
+        with self._lock:
+            self.totals[stage] = self.totals.get(stage, 0.0) + ms
+
+    def merge(self, totals):
+        for stage, ms in totals.items():
+            self.add(stage, ms)
+
+    def enter(self, stage):
+        now = time.perf_counter()
+        stack = self._stack
+        if stack:
+            parent = stack[-1]
+            self.add(parent[0], (now - parent[1]) * 1000)
+        stack.append([stage, now])
+
+    def exit(self):
+        now = time.perf_counter()
+        stack = self._stack
+        stage, resumed = stack.pop()
+        self.add(stage, (now - resumed) * 1000)
+        if stack:
+            stack[-1][1] = now
+
+@contextmanager
+def span(stage):
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+
+    recorder.enter(stage)
+    try:
+        yield
+    finally:
+        recorder.exit()
+
+def traced(stage):
+    # decorator form of span, e.g. @spans.traced('parse')
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@contextmanager
+def collect():
+    # record the spans of a block in a fresh recorder, then fold them into the enclosing one
+    parent = _recorder.get()
+    recorder = Recorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+        if parent is not None:
+            parent.merge(recorder.totals)
+
+def start():
+    # begin recording for the current context (e.g. a request), returns a token for stop()
+    return _recorder.set(Recorder())
+
+def stop(token):
+    _recorder.reset(token)
+
+def merge(totals):
+    # add stage timings measured elsewhere (e.g. in a solver process) to the current recorder
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.merge(totals)
+
+def totals():
+    recorder = _recorder.get()
+    return dict(recorder.totals) if recorder is not None else {}
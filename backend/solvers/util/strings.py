@@ -2,8 +2,12 @@
 # Author: Jacob Warren
 # Description: Chapter 5 string parsing stuff
 
+import unicodedata
+
 from . import exceptions
+from . import spans
 
+@spans.traced('parse')
 def parse_set(set_string):
     set_string_ = set_string.strip()
     set_string_ = set_string_[1:-1]
@@ -89,6 +93,7 @@ def parse_tuple(tuple_string):
 
     return elements
 
+@spans.traced('parse')
 def is_a_relation(set_string, relation_string):
     set_list = parse_set(set_string)
     relation_list = parse_set(relation_string)
@@ -116,3 +121,46 @@ def relation_to_string(set_list, relation):
     relation_string += "}"
 
     return relation_string
+
+# Unicode look-alikes of the logical operators, mapped on to the symbols the
+#   logic solvers already understand
+OPERATOR_VARIANTS = {
+    '⇒': '→', '⟹': '→', '⟶': '→', '⊃': '→',
+    '⇔': '↔', '⟺': '↔', '⟷': '↔', '≡': '↔',
+    '⋀': '∧', '&': '∧',
+    '⋁': '∨', '|': '∨',
+    '￢': '¬',
+    '’': "'", 'ʹ': '′',
+    '（': '(', '）': ')'
+}
+
+def canonical_whitespace(string):
+    return ' '.join(string.split())
+
+def canonical_formula(formula_string):
+    formula = unicodedata.normalize('NFC', formula_string)
+    formula = ''.join(OPERATOR_VARIANTS.get(char, char) for char in formula)
+
+    return canonical_whitespace(formula)
+
+def canonical_set(set_string):
+    set_string_ = set_string.strip()
+    if not (set_string_.startswith('{') and set_string_.endswith('}')):
+        return canonical_whitespace(set_string_)
+
+    try:
+        elements = {canonical_element(e) for e in parse_set(set_string_)}
+    except Exception:
+        # leave malformed input for the solver to report
+        return canonical_whitespace(set_string_)
+
+    return "{" + ", ".join(sorted(elements)) + "}"
+
+def canonical_element(element_string):
+    if element_string.startswith('{') and element_string.endswith('}'):
+        return canonical_set(element_string)
+
+    if element_string.startswith('(') and element_string.endswith(')'):
+        return "(" + ", ".join(canonical_element(e) for e in parse_tuple(element_string)) + ")"
+
+    return canonical_whitespace(element_string)
@@ -5,13 +5,13 @@
 # Description: A solver to generate weighted graphs.
 -----------------'''
 
+import os
+import sys
 import networkx as nx
-import matplotlib
-import matplotlib.pyplot as plt
-import json
-matplotlib.use('Agg') # Use to generate diagrams without displaying them
-from io import BytesIO
-import base64
+
+# Append the parent directory to the path so we can import in utility
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from solvers.util import render
 
 
 def solve(graphInput, graphType):
@@ -49,7 +49,7 @@ def solve(graphInput, graphType):
         "List": adj_list
     }
 
-    return json.dumps(result)
+    return result
 
 
 
@@ -93,22 +93,11 @@ def plot_graph(G):
             A base64 encoded image string of the graphs.
     '''
 
-    plt.figure(figsize=(8, 6))
-    pos = nx.spring_layout(G)  # Layout for visualization
-
     edge_labels = {(u, v): G[u][v]['weight'] for u, v in G.edges()}
 
-    nx.draw(G, pos, with_labels=True, node_color='skyblue', edge_color='gray', node_size=2000, font_size=15, font_weight="bold", arrows=True)
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=12, font_color="red")  # Draw weights
-
-    # Convert to base64 encoded image
-    plt.title("Weighted Graph Visualization")
-    img_buf = BytesIO()
-    plt.savefig(img_buf, format='png', bbox_inches='tight')
-    img_buf.seek(0)
-    img_data = base64.b64encode(img_buf.getvalue()).decode('utf-8')
-    print(img_data)
-    plt.close()
+    # Convert to base64 encoded image, with the weights drawn on the edges
+    img_data = render.graph_image(G, style='graph', title="Weighted Graph Visualization", figsize=(8, 6),
+        edge_labels=edge_labels, savefig={'bbox_inches': 'tight'})
     return img_data
 
 def get_adjacency_matrix(G):
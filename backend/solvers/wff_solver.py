@@ -6,82 +6,27 @@
 -----------------'''
 
 #---Imports---#
-import itertools
+import base64
+import functools
 import re
-import json
 
-def implies (p, q):
-    '''
-        Function to evaluate logical implication
-
-        Parameters
-        ----------
-        p (int): 
-            The antecedent of the implication
-        q (int):
-            The consequent of the implication
+import numpy as np
 
-        Returns
-        ----------
-        return: bool
-            True if p implies q, False otherwise.
-    '''
-    return not p or q
+from solvers.util import exceptions
+from solvers.util import logic
 
+# Rows per word of a packed truth table column
+WORD_BITS = 64
+ALL_ONES = 2 ** WORD_BITS - 1
 
-def _parse_formula(formula):
-    '''
-        Function to parse a logical formula and replace logical operators 
-            with Python equivalents. Does this by converting to Python syntax and evaluating the formula.
+# Formulas classified without their rows (see summarize) are evaluated up to this many
+#   variables, 2^22 rows or 512KB per column
+MAX_SUMMARY_VARIABLES = 22
 
-        Parameters
-        ----------
-        formula (str): 
-            The logical formula to parse
-
-        Returns
-        ----------
-        return: str
-            The parsed formula with Python equivalents of logical operators.
-    '''
-    # Normalize brackets to parentheses first
-    formula = formula.replace('[', '(').replace(']', ')')
-
-    # Process any parenthesized expressions first
-    parenthesis_pattern =  re.findall(r'\(([^()]+)\)', formula)
-    for expr in parenthesis_pattern:
-        parsed_expr = _parse_formula(expr.strip())
-        formula = formula.replace(f"({expr})", f"({parsed_expr})")
-
-    # Replace characters from the book copy n paste format
-    formula = formula.replace('`', ' and ')
-    formula = formula.replace('~', ' or ')
-    formula = formula.replace('4', ' == ')
-    formula = re.sub(r"([A-Z])′", r'not \1', formula)
-
-    # Replace unicode characters with ASCII equivalents
-    formula = formula.replace('¬', 'not ')
-    formula = formula.replace('∧', ' and ')
-    formula = formula.replace('∨', ' or ')
-    formula = formula.replace('↔', ' == ')
-
-    formula = re.sub(r"\(([^()]+)\)\'", r'not (\1)', formula)  # ASCII apostrophe
-    formula = re.sub(r"\(([^()]+)\)′", r'not (\1)', formula)   # Unicode prime symbol
-    
-    # Handle negation of individual variables
-    formula = re.sub(r"([A-Z])\'", r'not \1', formula)
-    formula = re.sub(r"([A-Z])′", r'not \1', formula)
-
-
-    # Replace logical operators with Python equivalents
-    formula = formula.replace('v', ' or ')
-    formula = formula.replace('V', ' or ')
-    formula = formula.replace('^', ' and ')
-    formula = formula.replace('<>', ' == ')
-    formula = re.sub(r"([A-Z])'", r'not \1', formula)
-
-    # Return the formula once implications are parsed
-    return _parse_implications(formula)
+# Tables are streamed (see stream) 2^12 rows at a time, and summarized 2^20 rows at a time,
+#   so memory stays the same however many variables there are
+CHUNK_BITS = 12
+SUMMARY_CHUNK_BITS = 20
 
 def _extract_intermediate_expressions(formula):
     '''
@@ -116,13 +61,13 @@ def _extract_variables(formula):
         return: list
             A sorted list of unique variables extracted from the formula.
     '''
-    # Extract unique variables from the formula using a regular expression
-    #   (excluding V, which is a logical operator in this context)
-    return sorted(set(re.findall(r'\b(?!V|S\b)[A-Z]\b', formula)))
+    # The letters the tokenizer reads as variables (V and S are operators)
+    return logic.variables(formula)
 
 def _post_process_formula(headers):
     '''
-        Function to sub in common operators for output. Just to make it look nice.
+        Function to write the headers with the unicode operators, from their tokens (see
+            logic.format), so they read the same whichever notation was typed.
 
         Parameters
         ----------
@@ -135,86 +80,229 @@ def _post_process_formula(headers):
             A list of headers for the truth table, updated with operators
             
     '''
+    return [logic.format(header) for header in headers]
 
-    # Replace characters in the header with ascii equivalents
-    for i in range(len(headers)):
-        headers[i] = headers[i].replace('^', '∧')
-        headers[i] = headers[i].replace('`', '∧')
-        headers[i] = headers[i].replace('->', '→')
-        headers[i] = headers[i].replace('>', '→')
-        headers[i] = headers[i].replace('<>', '↔')
-        headers[i] = headers[i].replace('v', '∨')
-        headers[i] = headers[i].replace('V', '∨')
-        headers[i] = headers[i].replace('~', '∨')
-        headers[i] = headers[i].replace('<=', '→')
-        headers[i] = headers[i].replace('S', '→')
-        headers[i] = headers[i].replace('==', '↔')
-        headers[i] = headers[i].replace('4', '↔')
-
-    return headers
-
-def solve(formula):
+def _variable_bitset(position, count):
     '''
-        Function to solve a logical formula and generate a truth table.
+        Function to build the packed column of a variable. Bit r of word r // 64 is the
+            variable's value in row r, with rows in itertools.product order (the first
+            variable changes slowest).
 
         Parameters
         ----------
-        formula (str): 
-            The logical formula to solve
+        position (int):
+            The variable's column
+        count (int):
+            The number of variables
 
         Returns
         ----------
-        return: json
-            A JSON object representing the truth table to return to the client.
+        return: numpy.ndarray
+            max(1, 2^count / 64) uint64 words
     '''
+    words = max(1, (1 << count) // WORD_BITS)
+    shift = count - 1 - position
 
-    # Extract unique variables from the formula
-    variables = _extract_variables(formula)
+    # Slow variables are whole words of zeros then ones, fast ones repeat inside every word
+    if shift >= 6:
+        block = np.repeat(np.array([0, ALL_ONES], dtype=np.uint64), 1 << (shift - 6))
+        return np.tile(block, words // len(block))
 
-    # Extract intermediate expressions from the formula
-    intermediate_expressions = _extract_intermediate_expressions(formula)
+    pattern = sum(1 << bit for bit in range(WORD_BITS) if bit >> shift & 1)
+    return np.full(words, pattern, dtype=np.uint64)
 
-    # Generate all possible combinations of truth values for the variables
-    truth_values = list(itertools.product([False, True], repeat=len(variables)))
+def _evaluate_bitsets(variables, nodes, chunk=0, bits=None):
+    '''
+        Function to evaluate the columns of a truth table over all rows at once. Every
+            variable is a packed bitset and every connective one bitwise operation on whole
+            columns. Parse trees are tuples, so a subformula shared by several columns is
+            evaluated once.
 
-    # Parse the formula to replace logical operators with Python equivalents
-    parsed_formula = _parse_formula(formula)
+        Parameters
+        ----------
+        variables (list):
+            The formula variables, in column order
+        nodes (list):
+            The parse trees of the columns after the variables (see solvers/util/logic.py)
+        chunk (int):
+            Which block of 2^bits rows to evaluate, when not evaluating the whole table
+        bits (int):
+            The block size, as a power of 2. Defaults to the whole table.
 
-    # Evaluate the formula for each combination of truth values
-    results = []
-    for values in truth_values:
+        Returns
+        ----------
+        return: list
+            The packed columns of the variables, then one per node.
+    '''
+    count = len(variables)
+    bits = count if bits is None else min(bits, count)
+    words = max(1, (1 << bits) // WORD_BITS)
+
+    values = {}
+    for position, name in enumerate(variables):
+        shift = count - 1 - position
+        if shift >= bits:
+            # Variables slower than the block hold one value across all of it
+            values[('var', name)] = np.full(words, ALL_ONES if chunk >> (shift - bits) & 1 else 0, dtype=np.uint64)
+        else:
+            values[('var', name)] = _variable_bitset(bits - 1 - shift, bits)
+
+    def evaluate(node):
+        if node in values:
+            return values[node]
+
+        kind = node[0]
+        if kind == 'const':
+            result = np.full(words, ALL_ONES if node[1] else 0, dtype=np.uint64)
+        else:
+            operands = [evaluate(child) for child in node[1:]]
+            if kind == 'not':
+                result = ~operands[0]
+            elif kind == 'and':
+                result = functools.reduce(np.bitwise_and, operands)
+            elif kind == 'or':
+                result = functools.reduce(np.bitwise_or, operands)
+            elif kind == 'iff':
+                result = ~(operands[0] ^ operands[1])
+            else:
+                result = ~operands[0] | operands[1]
+
+        values[node] = result
+        return result
+
+    return [values[('var', name)] for name in variables] + [evaluate(node) for node in nodes]
+
+def _each_chunk(variables, nodes, bits):
+    # The table's packed columns one block of 2^bits rows at a time, in row order
+    bits = min(bits, len(variables))
+    for chunk in range(1 << (len(variables) - bits)):
+        yield bits, _evaluate_bitsets(variables, nodes, chunk, bits)
+
+def _count_true(bitset, count):
+    # Popcount of the first 2^count bits, the rows of the table
+    rows = 1 << count
+    if rows < WORD_BITS:
+        bitset = bitset & np.uint64((1 << rows) - 1)
+
+    return int(np.bitwise_count(bitset).sum())
+
+def _bitset_rows(bitsets, count):
+    '''
+        Function to unpack packed columns into truth table rows.
 
-        # Create a dictionary to map variables to their truth values
-        env = dict(zip(variables, values))
+        Parameters
+        ----------
+        bitsets (list):
+            The packed columns, see _evaluate_bitsets
+        count (int):
+            The number of variables
 
-        # Add the implies function to the environment
-        env['implies'] = implies
+        Returns
+        ----------
+        return: list
+            The truth table rows, as lists of bools
+    '''
+    rows = 1 << count
+    columns = [np.unpackbits(bitset.astype('<u8').view(np.uint8), bitorder='little')[:rows] for bitset in bitsets]
+    return np.stack(columns, axis=1).astype(bool).tolist()
 
-        # Create a row for the truth table
-        row = list(values)
+def _encode_columns(bitsets, count):
+    '''
+        Function to encode packed columns for the client, for the "bits" table format.
 
-        # Evaluate intermediate expressions and the main formula
-        for expr in intermediate_expressions:
+        Parameters
+        ----------
+        bitsets (list):
+            The packed columns, see _evaluate_bitsets
+        count (int):
+            The number of variables
 
-            # Parse the intermediate expression to replace logical operators w/ Python equivalents
-            parsed_expr = _parse_formula(expr)
+        Returns
+        ----------
+        return: list
+            One base64 string per column. Row r is bit r % 8 (least significant first) of
+                byte r // 8, and the bits past the last row are 0.
+    '''
+    rows = 1 << count
+    columns = []
+    for bitset in bitsets:
+        packed = bitset.astype('<u8').tobytes()[:(rows + 7) // 8]
+        if rows < 8:
+            packed = bytes([packed[0] & ((1 << rows) - 1)])
+        columns.append(base64.b64encode(packed).decode('ascii'))
 
-            # Evaluate the intermediate expression via Python's eval function
-            row.append(eval(parsed_expr, {}, env))
-        
-        print(parsed_formula)
-        # Evaluate the main formula and append it to results
-        row.append(eval(parsed_formula, {}, env))
-        results.append(row)
+    return columns
+
+def _parse_columns(formula):
+    '''
+        Function to read the columns of a formula's truth table.
+
+        Parameters
+        ----------
+        formula (str): 
+            The logical formula
+
+        Returns
+        ----------
+        return: tuple (headers, variables, nodes)
+            The table headers, the formula variables, and the parse trees of the columns
+                after the variables (the intermediate expressions, then the formula).
+    '''
+    # Extract unique variables from the formula
+    variables = _extract_variables(formula)
 
-    # Generate the headers for the truth table
-    headers = variables + intermediate_expressions + [formula]
+    # Extract intermediate expressions from the formula
+    intermediate_expressions = _extract_intermediate_expressions(formula)
+
+    # Parse every column once
+    nodes = [logic.parse(expr) for expr in intermediate_expressions] + [logic.parse(formula)]
+
+    # Generate the headers for the truth table, post processed to conform to symbology
+    headers = _post_process_formula(variables + intermediate_expressions + [formula])
 
-    # Post process formula to conform to symbology
-    headers = _post_process_formula(headers)
+    return headers, variables, nodes
+
+def solve(formula, table_format='rows'):
+    '''
+        Function to solve a logical formula and generate a truth table.
 
-    # Classify the WFF based on the truth table
-    classification, description = _classify_wff(results)
+        Parameters
+        ----------
+        formula (str): 
+            The logical formula to solve
+        table_format (str):
+            'rows' for the rows as lists of bools, or 'bits' for one packed, base64 encoded
+                column per header (see _encode_columns), a fraction of the size
+
+        Returns
+        ----------
+        return: json
+            A JSON object representing the truth table to return to the client. In the
+                'bits' format "rows" is replaced by "rowCount" and "columns".
+    '''
+    if table_format not in ('rows', 'bits'):
+        raise exceptions.CalculateError(f"Unknown table format '{table_format}', expected 'rows' or 'bits'")
+
+    headers, variables, nodes = _parse_columns(formula)
+
+    # Evaluate every column for each combination of truth values, as bitsets, and count the
+    #   rows where the formula is true
+    bitsets = _evaluate_bitsets(variables, nodes)
+    true_count = _count_true(bitsets[-1], len(variables))
+    row_count = 1 << len(variables)
+
+    # Classify the WFF based on how many rows make the formula true
+    classification, description = _classify_wff(true_count, row_count)
+
+    if table_format == 'bits':
+        return {
+            "headers": headers,
+            "tableFormat": "bits",
+            "rowCount": row_count,
+            "columns": _encode_columns(bitsets, len(variables)),
+            "classification": classification,
+            "description": description
+        }
     
     # Prepare the truth table as a JSON object
     truth_table = {
@@ -225,14 +313,16 @@ def solve(formula):
     }
 
     # Add the rows to the truth table
-    for row in results:
+    for row in _bitset_rows(bitsets, len(variables)):
         truth_table["rows"].append(row)
 
-    return json.dumps(truth_table)
+    return truth_table
 
-def _parse_implications(formula):
+def stream(formula):
     '''
-        Function to parse implicative expressions via recursion
+        Function to generate a truth table a block of rows at a time, for tables too large
+            to build and send at once. Only one block is held in memory, and the
+            classification is counted up as the blocks go by.
 
         Parameters
         ----------
@@ -241,115 +331,82 @@ def _parse_implications(formula):
 
         Returns
         ----------
-        return: str
-           A string with the elaborated formula
+        return: generator
+            Lists of lines for the client: first [{"headers", "rowCount"}], then the rows
+                (lists of bools) in blocks of 2^CHUNK_BITS, then [{"classification",
+                "description"}]. The formula is parsed before the first list, so malformed
+                formulas raise CalculateError there.
     '''
+    headers, variables, nodes = _parse_columns(formula)
+    row_count = 1 << len(variables)
 
-    # Base case - if no implication operators, return as is
-    if '->' not in formula and '→' not in formula and 'S' not in formula and '>' not in formula:
-        return formula
-    
-    # Find the rightmost implication at the top level (outside any parentheses)
-    operators = ['->', '→', 'S', '>']
-    last_pos = -1
-    last_op = None
-    paren_level = 0
-    
-    # Scan through the formula character by character
-    for i in range(len(formula)):
-        char = formula[i]
-        
-        if char == '(':
-            paren_level += 1
-        elif char == ')':
-            paren_level -= 1
-        # Only check for operators at the top level (outside parentheses)
-        elif paren_level == 0:
-            for op in operators:
-                # Check if this position contains a complete operator
-                if i + len(op) <= len(formula) and formula[i:i+len(op)] == op:
-                    # Check this isn't part of a longer operator (e.g., '>' in '->')
-                    valid_match = True
-                    if op == '>' and i > 0 and formula[i-1:i+1] == '->':
-                        valid_match = False
-                        
-                    if valid_match and i > last_pos:
-                        last_pos = i
-                        last_op = op
-    
-    # If no implications found at top level
-    if last_pos == -1:  
-        # Process internal parenthesized expressions
-        paren_start = -1
-        paren_level = 0
-        
-        for i in range(len(formula)):
-            if formula[i] == '(':
-                if paren_level == 0:
-                    paren_start = i
-                paren_level += 1
-            elif formula[i] == ')':
-                paren_level -= 1
-                if paren_level == 0 and paren_start != -1:
-                    # Found a complete parenthesized expression
-                    inner_content = formula[paren_start+1:i]
-                    processed = _parse_implications(inner_content)
-                    if processed != inner_content:  # Only replace if changed
-                        return formula[:paren_start+1] + processed + formula[i:]
-        
-        # No changes made
-        return formula
-    
-    # Split the formula at the rightmost top-level implication
-    left_part = formula[:last_pos]
-    op_len = len(last_op)
-    right_part = formula[last_pos + op_len:]
-    
-    # Process both parts recursively
-    parsed_left = _parse_implications(left_part)
-    parsed_right = _parse_implications(right_part)
-    
-    # Combine the results with implies()
-    return f"implies({parsed_left}, {parsed_right})"
-
-def _is_balanced_expression(expr):
-    '''Helper function to check if parentheses are balanced'''
-    paren_count = 0
-    for c in expr:
-        if c == '(':
-            paren_count += 1
-        elif c == ')':
-            paren_count -= 1
-            if paren_count < 0:
-                return False
-    return paren_count == 0
-
-def _classify_wff(truth_table_rows):
+    yield [{"headers": headers, "rowCount": row_count}]
+
+    true_count = 0
+    for bits, bitsets in _each_chunk(variables, nodes, CHUNK_BITS):
+        true_count += _count_true(bitsets[-1], bits)
+        yield _bitset_rows(bitsets, bits)
+
+    classification, description = _classify_wff(true_count, row_count)
+    yield [{"classification": classification, "description": description}]
+
+def summarize(formula):
+    '''
+        Function to classify a formula without listing its truth table, for tables too large
+            to send. Only the formula's own column is evaluated, as bitsets of 2^20 rows.
+
+        Parameters
+        ----------
+        formula (str): 
+            The logical formula to classify
+
+        Returns
+        ----------
+        return: json
+            The same shape as solve, with no rows. The classification is left out when the
+                formula has too many variables.
+    '''
+    tree = logic.parse(formula)
+    variables = _extract_variables(formula)
+    headers = _post_process_formula(variables + _extract_intermediate_expressions(formula) + [formula])
+
+    summary = {
+        "headers": headers,
+        "rows": [],
+        "rowsOmitted": True,
+        "message": f"The truth table has 2^{len(variables)} rows, which is too many to list."
+    }
+
+    if len(variables) <= MAX_SUMMARY_VARIABLES:
+        true_count = sum(_count_true(bitsets[-1], bits) for bits, bitsets in _each_chunk(variables, [tree], SUMMARY_CHUNK_BITS))
+        summary["classification"], summary["description"] = _classify_wff(true_count, 1 << len(variables))
+
+    return summary
+
+def _classify_wff(true_count, row_count):
     """
     Classify a WFF as a tautology, contradiction, or contingency based on its truth table.
     
     Parameters
     ----------
-    truth_table_rows (list): 
-        List of rows from the truth table
+    true_count (int): 
+        The number of rows where the formula is true (the popcount of its column)
+    row_count (int):
+        The number of rows in the truth table
         
     Returns
     ----------
     tuple: (classification, description)
         Classification as string and description explaining the classification
     """
-    # Extract the last column of each row (the final formula evaluation)
-    final_column = [row[-1] for row in truth_table_rows]
-    
     # Check if all values are True
-    if all(final_column):
+    if true_count == row_count:
         return ("tautology", "Formula is always true regardless of input values.")
     
     # Check if all values are False
-    if not any(final_column):
+    if true_count == 0:
         return ("contradiction", "Formula is always false regardless of input values.")
     
     # If some true and some false, it's a contingency
-    true_count = sum(1 for val in final_column if val)
-    false_count = len(final_column) - true_count
-    return ("contingency", f"Formula is true for {true_count} combinations and false for {false_count} combinations.")
\ No newline at end of file
+    false_count = row_count - true_count
+    return ("contingency", f"Formula is true for {true_count} combinations and false for {false_count} combinations.")
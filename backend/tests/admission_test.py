@@ -0,0 +1,73 @@
+# File: admission_test.py
+# Author: Backend Team
+# Description: test the admission control cost estimates, rejections and downgrades
+
+import sys, os, json
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+from backend import registry, admission
+from solvers.util import exceptions
+
+def main():
+    # Small problems are admitted
+    entry = registry.SOLVERS['wff']
+    assert admission.admit('wff', entry, {"formula": "(A → B) ∧ C"}) is None
+
+    # A 20 variable truth table is too large to list, only its classification is sent
+    formula = ' ∧ '.join('ABCDEFGHIJKLMNOPQRTU')
+    result = admission.admit('wff', entry, {"formula": formula})
+    print(result["message"])
+    assert result["rowsOmitted"] and result["rows"] == []
+    assert result["classification"] == "contingency"
+    assert result["description"] == f"Formula is true for 1 combinations and false for {2 ** 20 - 1} combinations."
+
+    # A table that fits a background job is rejected (to be queued) instead, when it can be
+    try:
+        admission.admit('wff', entry, {"formula": ' ∧ '.join('ABCDEFGHIJKLMNOP')}, can_queue=True)
+        assert False, "expected ProblemTooLargeError"
+    except exceptions.ProblemTooLargeError as e:
+        print(e)
+        assert e.cost > e.limit and e.queueable
+
+    # An iterated power set is downgraded to its cardinalities
+    entry = registry.SOLVERS['power-set']
+    assert admission.admit('power-set', entry, {"sets": {"A": "{a, b}"}, "iterations": 2}) is None
+
+    result = admission.admit('power-set', entry, {"sets": {"A": "{a, b, c, d}"}, "iterations": 3})
+    print(result)
+    assert result["elementsOmitted"]
+    assert result["power_sets"]["Iteration 2 - Set A"]["cardinality"] == 65536
+    assert result["power_sets"]["Iteration 3 - Set A"]["cardinality"] == "2^65536"
+
+    # Malformed input is left for the solver to report
+    assert admission.admit('cartesian-products', registry.SOLVERS['cartesian-products'], {"setOne": None}) is None
+
+    # A cartesian product over the reals and rationals is rejected
+    data = {"setOne": [["A", "{x | x ∈ R}", "2"], ["B", "{x | x ∈ Q}", "2"]], "setTwo": ["A × B"]}
+    assert admission.cartesian_cost(data) > 10 ** 8
+
+    # Products too large for a float saturate instead of raising, and are rejected with a
+    #   cost that JSON can carry
+    elements = "{" + ", ".join(str(i) for i in range(1000)) + "}"
+    data = {"setOne": [["A", elements, "1"]], "setTwo": [" × ".join(["A"] * 400)]}
+    assert admission.cartesian_cost(data) == float('inf')
+    try:
+        admission.admit('cartesian-products', registry.SOLVERS['cartesian-products'], data)
+        assert False, "expected ProblemTooLargeError"
+    except exceptions.ProblemTooLargeError as e:
+        print(e)
+        json.dumps({"estimatedCost": e.cost}, allow_nan=False)
+
+    # A bug in an estimator is raised, not taken as "admit"
+    entry = registry.SolverEntry('wff_solver', None, admission=admission.CostLimit(lambda data: 1 / 0, 1))
+    try:
+        admission.admit('wff', entry, {"formula": "A"})
+        assert False, "expected ZeroDivisionError"
+    except ZeroDivisionError:
+        pass
+
+if __name__ == "__main__":
+    main()
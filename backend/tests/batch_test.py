@@ -0,0 +1,88 @@
+# File: batch_test.py
+# Author: Backend Team
+# Description: test /solve/batch: result order, per-item errors, deduplication and limits
+
+import sys, os, threading, time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+os.environ.setdefault('API_KEY', 'test-key')
+os.environ.setdefault('BATCH_MAX_ITEMS', '10')
+
+from backend import registry
+from solvers import wff_solver
+from solvers.util import spans
+
+def main():
+    from app import app
+    client = app.test_client()
+    headers = {'X-API-Key': os.environ['API_KEY']}
+
+    def batch(body):
+        return client.post('/solve/batch', json=body, headers=headers)
+
+    # Results come back in item order, and a bad item fails on its own
+    formulas = ["A ∧ B", "A ∨ A'", "(A → B", "A → B"]
+    items = [{"solver_type": "wff", "data": {"formula": formula}} for formula in formulas]
+    items.insert(2, {"solver_type": "no-such-solver", "data": {}})
+    items.append("not an item")
+
+    results = batch({"items": items}).get_json()["results"]
+    assert len(results) == 6
+    assert results[0] == {"ok": True, "result": wff_solver.solve("A ∧ B")}
+    assert results[1]["result"]["classification"] == "tautology"
+    assert results[2] == {"ok": False, "error": "Unsupported solver type"}
+    assert results[3]["ok"] is False and results[3]["error"] == "Calculation Error"
+    assert results[4]["result"]["headers"][-1] == "A → B"
+    assert results[5] == {"ok": False, "error": "Unsupported solver type"}
+
+    # Every stage of a batch adds up to a positive time
+    response = batch({"items": items})
+    timings = dict(part.split(";dur=") for part in response.headers["Server-Timing"].split(", "))
+    assert all(float(ms) >= 0 for ms in timings.values()), timings
+
+    # Threads sharing one recorder keep their own open spans: another thread's span doesn't
+    #   pause this one's
+    recorder = spans.Recorder()
+    entered, left = threading.Event(), threading.Event()
+    def outer():
+        recorder.enter('compute')
+        entered.set()
+        left.wait()
+        recorder.exit()
+    def inner():
+        entered.wait()
+        recorder.enter('render')
+        time.sleep(0.05)
+        recorder.exit()
+        left.set()
+    threads = [threading.Thread(target=outer), threading.Thread(target=inner)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert recorder.totals['compute'] >= 50 and recorder.totals['render'] >= 50, recorder.totals
+
+    # Oversized problems are reported per item
+    big = {"solver_type": "wff", "data": {"formula": " ∧ ".join("ABCDEFGHIJKLMNOPQRTUWXYZ")}}
+    result = batch({"items": [big]}).get_json()["results"][0]
+    assert result["ok"] and result["result"]["rowsOmitted"]
+
+    # With dedupe, problems with the same canonical input are solved once and share the answer
+    items = [{"solver_type": "wff", "data": {"formula": formula}} for formula in ["A ⇒ B", "A → B", "A  →  B"]]
+    results = batch({"items": items, "dedupe": True}).get_json()["results"]
+    assert results[0] == results[1] == results[2]
+
+    # Malformed bodies and batches over BATCH_MAX_ITEMS are rejected whole
+    assert batch({"items": "wff"}).status_code == 400
+    assert client.post('/solve/batch', data="items", headers=headers).status_code == 400
+    assert batch({"items": [items[0]] * 11}).status_code == 413
+    assert batch({"items": []}).get_json() == {"results": []}
+    assert client.post('/solve/batch', json={"items": []}).status_code == 401
+
+    print("batch tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# File: cache_test.py
+# Author: Backend Team
+# Description: test the solver result cache tiers and input canonicalization
+
+import sys, os, time, tempfile, threading
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+from backend import registry, cache
+from solvers.util import exceptions
+
+def main():
+    # Equivalent inputs should share a key
+    entry = registry.SOLVERS['properties-of-relations']
+    a = cache.canonicalize(entry, {"set": "{1,2, 3}", "relation": "{(1, 2), (2,3)}"})
+    b = cache.canonicalize(entry, {"set": "{3, 2, 1, 1}", "relation": "{(2, 3),(1,2)}"})
+    print(a)
+    assert cache.make_key('properties-of-relations', a) == cache.make_key('properties-of-relations', b)
+
+    entry = registry.SOLVERS['wff']
+    a = cache.canonicalize(entry, {"formula": "(A ⇒ B)  ⋀ C"})
+    b = cache.canonicalize(entry, {"formula": "(A → B) ∧ C"})
+    print(a)
+    assert cache.make_key('wff', a) == cache.make_key('wff', b)
+
+    # LRU eviction and TTL expiry
+    results = cache.ResultCache(2, 0.2)
+    results.put('a', 1)
+    results.put('b', 2)
+    results.get('a')
+    results.put('c', 3)
+    assert results.get('b') == (False, None)
+    assert results.get('a') == (True, 1)
+
+    time.sleep(0.3)
+    assert results.get('c') == (False, None)
+    print(results.stats())
+
+    # Disk tier: survives a new instance (a restart), evicts by size, skips big entries
+    path = os.path.join(tempfile.mkdtemp(), 'results.db')
+    disk = cache.DiskCache(path, 250, 100, 60)
+    disk.put('x', '{"a": 1}')
+    disk.put('y', {"b": [1, 2]})
+    disk.put('big', 'z' * 200)
+
+    disk = cache.DiskCache(path, 250, 100, 60)
+    assert disk.get('x') == (True, '{"a": 1}')
+    assert disk.get('y') == (True, {"b": [1, 2]})
+    assert disk.get('big') == (False, None)
+
+    for i in range(10):
+        disk.put(str(i), 'v' * 40)
+    assert disk.get('x') == (False, None)
+    assert disk.get('9') == (True, 'v' * 40)
+    print(disk.stats())
+    assert disk.stats()['bytes'] <= 250
+
+    # Single flight: concurrent identical solves run once, within a process...
+    calls = []
+    def slow_solve():
+        calls.append(1)
+        time.sleep(0.3)
+        return {"rows": [[True]]}
+
+    flights = cache.SingleFlight(cache.ResultCache(8, 60), cache.DiskCache('', 0, 0, 0))
+    outcomes = []
+    threads = [threading.Thread(target=lambda: outcomes.append(flights.run('k', slow_solve, 5))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(flights.stats())
+    assert len(calls) == 1
+    assert sorted(shared for shared, _ in outcomes) == [False] + [True] * 7
+    assert all(value == {"rows": [[True]]} for _, value in outcomes)
+
+    # ...and across processes sharing the disk tier (two workers simulated by two instances)
+    path = os.path.join(tempfile.mkdtemp(), 'results.db')
+    calls.clear()
+    outcomes.clear()
+    def worker():
+        shared_disk = cache.DiskCache(path, 10000, 1000, 60)
+        def solve_and_store():
+            value = slow_solve()
+            shared_disk.put('k', value)
+            return value
+        outcomes.append(cache.SingleFlight(cache.ResultCache(8, 60), shared_disk).run('k', solve_and_store, 5))
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(shared for shared, _ in outcomes) == [False, True]
+
+    # Followers wait no longer than their own budget for a leader that hangs
+    flights = cache.SingleFlight(cache.ResultCache(8, 60), cache.DiskCache('', 0, 0, 0))
+    release = threading.Event()
+    leader = threading.Thread(target=lambda: flights.run('hang', lambda: release.wait(5) and {"rows": []}, 10))
+    leader.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    try:
+        flights.run('hang', slow_solve, 0.2, 'wff')
+    except exceptions.SolverTimeoutError as e:
+        assert e.solver_type == 'wff' and e.timeout == 0.2
+    else:
+        raise AssertionError("a follower should time out on its own budget")
+    assert time.perf_counter() - start < 1
+    release.set()
+    leader.join()
+
+    # A leader's timeout is only shared with followers on the same budget, the others solve it
+    def timed_out():
+        time.sleep(0.2)
+        raise exceptions.SolverTimeoutError('wff', 1)
+
+    calls.clear()
+    outcomes = {}
+    def run(name, compute, budget):
+        try:
+            outcomes[name] = flights.run('slow', compute, budget, 'wff')
+        except exceptions.SolverTimeoutError as e:
+            outcomes[name] = e
+
+    threads = [threading.Thread(target=run, args=('leader', timed_out, 1))]
+    threads[0].start()
+    time.sleep(0.05)
+    threads += [threading.Thread(target=run, args=(name, slow_solve, budget)) for name, budget in (('request', 1), ('job', 5))]
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert isinstance(outcomes['leader'], exceptions.SolverTimeoutError)
+    assert outcomes['request'] is outcomes['leader']
+    assert outcomes['job'] == (False, {"rows": [[True]]}) and len(calls) == 1
+
+    # The key is canonical, but the solver gets the payload as sent
+    from backend import controller
+    result = controller.solve_algorithim('power-set', {"sets": {"A": "{1, 2, 10, 2}"}, "iterations": 1})
+    assert result["original_sets"] == {"A": "{1, 2, 10, 2}"}
+    assert controller.solve_algorithim('wff', {"formula": "A  ⇒  B"})["headers"] == ["A", "B", "A  →  B"]
+
+if __name__ == "__main__":
+    main()
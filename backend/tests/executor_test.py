@@ -0,0 +1,72 @@
+# File: executor_test.py
+# Author: Backend Team
+# Description: test that pooled solves time out without blocking healthy ones
+
+import sys, os, threading, time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+from backend import registry, executor
+from solvers.util import drawings
+from solvers.util import exceptions
+
+def main():
+    pool = executor.SolverPool(2)
+
+    # A runaway power set, cancelled after one second
+    def runaway():
+        try:
+            pool.run('power-set', {'sets': {'A': '{a, b, c, d}'}, 'iterations': 3}, 1)
+        except exceptions.SolverTimeoutError as e:
+            print(e)
+            return
+        raise AssertionError("power-set should have timed out")
+
+    slow = threading.Thread(target=runaway)
+    slow.start()
+
+    # Healthy solves keep flowing on the other process
+    start = time.time()
+    print(pool.run('wff', {'formula': 'A ∧ B'}, 10))
+    print(f"healthy solve took {time.time() - start:.2f}s")
+    slow.join()
+
+    # The killed process is replaced and solver errors are re-raised in the caller
+    try:
+        pool.run('hasse-diagrams', {'set': '{1, 2}', 'relation': '{(1, 2)}'}, 10)
+        raise AssertionError("hasse-diagrams should have raised")
+    except exceptions.CalculateError as e:
+        print(f"Calculation Error: {e}")
+
+    print(pool.run('wff', {'formula': 'A ∨ B'}, 10))
+    pool.shutdown()
+
+    # Diagrams of pooled solves are drawn by the renderer pool, exactly as they'd be drawn inline
+    entry = registry.SOLVERS['hasse-diagrams']
+    data = {'set': '{1, 2, 3}', 'relation': '{(1, 1), (2, 2), (3, 3), (1, 2), (2, 3), (1, 3)}'}
+    executor.start()
+    image = executor.solve('hasse-diagrams', entry, data)["Hasse Diagram"]
+    assert executor.render_pool._started == executor.render_pool.size
+    assert image == entry.solve(data)["Hasse Diagram"]
+
+    # A full render queue pushes back instead of growing
+    busy = executor.SolverPool(1, serve=executor._serve_renders, max_waiting=0)
+    drawing = drawings.Drawing(False, [1, 2], [(1, 2, {})], 'png', {'pos': {1: (0, 0), 2: (1, 1)}})
+    results = []
+    first = threading.Thread(target=lambda: results.append(busy.run('render', drawing, 30)))
+    first.start()
+    while busy._started == 0 or busy._idle:
+        time.sleep(0.01)
+    try:
+        busy.run('render', drawing, 30)
+        raise AssertionError("the render queue should have been full")
+    except exceptions.ServerBusyError as e:
+        print(e)
+    first.join()
+    assert results[0].startswith("iVBOR")
+    busy.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# File: formats_test.py
+# Author: Backend Team
+# Description: test the png, svg and graph image formats of the diagram routes
+
+import sys, os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+from backend import registry
+from solvers.util import exceptions
+
+HASSE = {"set": "{1, 2, 3}", "relation": "{(1, 1), (2, 2), (3, 3), (1, 2), (2, 3), (1, 3)}"}
+
+def main():
+    entry = registry.SOLVERS['hasse-diagrams']
+
+    # PNG stays the default
+    png = entry.solve(dict(HASSE))["Hasse Diagram"]
+    assert png.startswith("iVBOR")
+
+    # SVG markup is smaller and the same figure always gives the same bytes
+    svg = entry.solve({**HASSE, "imageFormat": "svg"})["Hasse Diagram"]
+    assert svg.lstrip().startswith("<?xml") and "<svg" in svg
+    assert svg == entry.solve({**HASSE, "imageFormat": "svg"})["Hasse Diagram"]
+    print(f"png {len(png)} bytes, svg {len(svg)} bytes")
+    assert len(svg) < len(png)
+
+    # The graph format sends the layout itself
+    graph = entry.solve({**HASSE, "imageFormat": "graph"})["Hasse Diagram"]
+    print(graph)
+    assert graph["format"] == "graph"
+    assert sorted(node["id"] for node in graph["nodes"]) == ["1", "2", "3"]
+    assert {(edge["source"], edge["target"]) for edge in graph["edges"]} == {("1", "2"), ("2", "3")}
+
+    # Weighted graphs keep their weights as edge labels
+    graph = registry.SOLVERS['weighted-graphs'].solve({"input": "(1,2,3), (2,3,4)", "type": "DIRECTED", "imageFormat": "graph"})["Graph"]
+    assert graph["directed"]
+    assert sorted(edge["label"] for edge in graph["edges"]) == ["3.0", "4.0"]
+
+    # Unknown formats are a calculation error
+    try:
+        entry.solve({**HASSE, "imageFormat": "gif"})
+        assert False, "expected CalculateError"
+    except exceptions.CalculateError as e:
+        print(e)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# File: images_test.py
+# Author: Backend Team
+# Description: test the content-addressed image store and the /render endpoint
+
+import sys, os, tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+os.environ.setdefault('API_KEY', 'test-key')
+
+from backend import registry
+from solvers.util import image_store
+
+HASSE = {"set": "{1, 2, 3}", "relation": "{(1, 1), (2, 2), (3, 3), (1, 2), (2, 3), (1, 3)}"}
+
+def main():
+    # The same bytes always get the same URL, and are stored once
+    store = image_store.ImageStore(os.path.join(tempfile.mkdtemp(), 'images.db'), 1000)
+    url = store.put(b'a' * 400, 'png')
+    assert url == store.put(b'a' * 400, 'png')
+    assert store.stats()["images"] == 1
+    digest = url.split('/')[-1].split('.')[0]
+    assert store.get(digest, 'png') == b'a' * 400
+    assert store.get(digest, 'svg') is None
+
+    # Past the byte budget, the least recently used images are dropped
+    store.put(b'b' * 400, 'png')
+    store.get(digest, 'png')
+    store.put(b'c' * 400, 'png')
+    assert store.get(digest, 'png') is not None
+    assert store.stats()["images"] == 2
+
+    # Diagram routes return a URL instead of the image
+    result = registry.SOLVERS['hasse-diagrams'].solve({**HASSE, "imageFormat": "png-url"})
+    url = result["Hasse Diagram"]
+    print(url)
+    assert url.startswith('/render/') and url.endswith('.png')
+
+    from app import app
+    client = app.test_client()
+
+    response = client.get(url)
+    assert response.status_code == 200 and response.mimetype == 'image/png'
+    assert response.data.startswith(b'\x89PNG')
+    etag = response.headers['ETag']
+    print(etag, response.headers['Cache-Control'])
+    assert 'immutable' in response.headers['Cache-Control']
+
+    # Revalidation is answered without a body
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 304 and response.data == b''
+
+    # SVGs are served with their own content type
+    url = registry.SOLVERS['hasse-diagrams'].solve({**HASSE, "imageFormat": "svg-url"})["Hasse Diagram"]
+    response = client.get(url)
+    assert response.mimetype == 'image/svg+xml' and b'<svg' in response.data
+
+    assert client.get('/render/' + '0' * 64 + '.png').status_code == 404
+    assert client.get('/render/../app.py').status_code == 404
+
+    # A cached result whose image was evicted is solved again, which stores the image again
+    headers = {'X-API-Key': os.environ['API_KEY']}
+    payload = {"set": "{1, 2}", "relation": "{(1, 1), (2, 2), (1, 2)}", "imageFormat": "png-url"}
+    url = client.post('/solve/hasse-diagrams', json=payload, headers=headers).get_json()["Hasse Diagram"]
+    assert client.get(url).status_code == 200
+
+    digest = url.split('/')[-1].split('.')[0]
+    image_store.store._connect().execute("DELETE FROM image WHERE digest = ?", (digest,))
+    assert client.get(url).status_code == 404
+    assert not image_store.available({"Hasse Diagram": url})
+
+    assert client.post('/solve/hasse-diagrams', json=payload, headers=headers).get_json()["Hasse Diagram"] == url
+    assert client.get(url).status_code == 200
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# File: jobs_test.py
+# Author: Backend Team
+# Description: test the durable job queue: ordering, outcomes, leases and recovery of interrupted jobs
+
+import sys, os, tempfile, time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+from backend import registry, jobs
+
+def main():
+    queue = jobs.JobQueue(os.path.join(tempfile.mkdtemp(), 'jobs.db'), 60)
+
+    first = queue.submit('wff', {"formula": "A ∧ B"})
+    second = queue.submit('power-set', {"sets": {"A": "{a, b}"}, "iterations": 1})
+    assert queue.get(second)["position"] == 1
+
+    # Jobs are claimed oldest first, once
+    job_id, solver_type, data = queue.claim()
+    assert (job_id, solver_type, data) == (first, 'wff', {"formula": "A ∧ B"})
+    assert queue.get(first)["status"] == 'running'
+    assert queue.get(second)["position"] == 0
+
+    queue.finish(first, {"ok": True, "result": {"rows": [[True]]}})
+    job = queue.get(first)
+    print(job)
+    assert job["status"] == 'done' and job["result"] == {"rows": [[True]]}
+
+    # A running job keeps its claim while its lease is renewed...
+    job_id, _, _ = queue.claim()
+    assert job_id == second
+    queue.renew([second])
+    assert queue.claim() is None
+
+    # ...and goes back in the queue once it lapses, even though its worker's PID (this
+    #   process, as after a container restart) is alive
+    queue._transaction(lambda connection: connection.execute("UPDATE job SET lease = ? WHERE id = ?", (time.time() - 1, second)))
+    job_id, _, _ = queue.claim()
+    assert job_id == second
+
+    queue.finish(second, {"ok": False, "error": "Calculation Error", "message": "bad input"})
+    assert queue.get(second)["status"] == 'failed'
+    assert queue.claim() is None
+    assert queue.get('missing') is None
+    print(queue.counts())
+
+    # Workers renew the leases of the jobs they run, so a solve longer than the lease keeps its claim
+    queue = jobs.JobQueue(os.path.join(tempfile.mkdtemp(), 'jobs.db'), 60, lease=0.3)
+    workers = jobs.Workers(queue, lambda job_id, solver_type, data: time.sleep(1) or {"ok": True, "result": None}, 1)
+    job_id = queue.submit('wff', {"formula": "A"})
+    workers.start()
+    workers.notify()
+    time.sleep(0.7)
+    assert queue.get(job_id)["status"] == 'running' and queue.claim() is None
+    time.sleep(0.6)
+    assert queue.get(job_id)["status"] == 'done'
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# File: logic_test.py
+# Author: Backend Team
+# Description: test the formula tokenizer and parser shared by the logic solvers
+
+import sys, os, time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+from backend import registry
+from solvers.util import logic
+from solvers.util import exceptions
+
+A, B, C = ('var', 'A'), ('var', 'B'), ('var', 'C')
+
+def main():
+    # Every notation of (A ∧ B') → C
+    expected = ('implies', ('and', A, ('not', B)), C)
+    for formula in ["(A ∧ B') → C", "(A ∧ B′) -> C", "(A ^ ¬B) > C", "(A ` B') S C", "[A and not B] → C", "A∧B'→C", "(A ⋀ ￢B) ⇒ C", "（A & B’） ⟹ C"]:
+        assert logic.parse(formula) == expected, formula
+
+    for formula in ["A ∨ B", "A v B", "AVB", "A ~ B", "A or B", "A ⋁ B", "A | B"]:
+        assert logic.parse(formula) == ('or', A, B), formula
+    for formula in ["A ↔ B", "A <> B", "A 4 B", "A <-> B", "A == B", "A ⇔ B", "A ≡ B"]:
+        assert logic.parse(formula) == ('iff', A, B), formula
+
+    # Primes negate whatever they follow
+    assert logic.parse("(A ∨ B)'") == ('not', ('or', A, B))
+    assert logic.parse("A''") == ('not', ('not', A))
+    assert logic.parse("¬(A ∧ B)′") == ('not', ('not', ('and', A, B)))
+    assert logic.parse("1 ∧ A") == ('and', ('const', True), A)
+
+    # V and S are operators, not variables
+    assert logic.variables("(A S B) V [C ∧ A]") == ['A', 'B', 'C']
+
+    # Precedence, loosest first: → ∨ ∧ ↔, then ¬ and primes
+    assert logic.parse("A ∨ B ∧ C") == ('or', A, ('and', B, C))
+    assert logic.parse("A ∧ B → C ∨ A") == ('implies', ('and', A, B), ('or', C, A))
+    assert logic.parse("A → B → C") == ('implies', ('implies', A, B), C)
+    assert logic.parse("A ∧ B ↔ C") == ('and', A, ('iff', B, C))
+    assert logic.parse("A ↔ B ↔ C") == ('and', ('iff', A, B), ('iff', B, C))
+    assert logic.parse("A ∧ B ∧ C") == ('and', A, B, C)
+
+    # Formulas are written back with the unicode operators, keeping letters, brackets and spacing
+    assert logic.format("(A ^ B') -> C") == "(A ∧ B') → C"
+    assert logic.format("not A and B or C") == "¬A ∧ B ∨ C"
+    assert logic.format("[A ` B] S C 4 D ~ E") == "[A ∧ B] → C ↔ D ∨ E"
+    assert logic.format("（A & B’） ⟹ C") == "(A ∧ B') → C"
+    assert logic.format("A∧B′ <> 1") == "A∧B′ ↔ 1"
+    for formula in ["(A ^ B') -> C", "not A and B or C", "（A & B’） ⟹ C"]:
+        assert logic.parse(logic.format(formula)) == logic.parse(formula), formula
+
+    # The hypotheses of a proof are split at the top level ∧
+    assert logic.conjuncts("A → B ∧ A") == [('implies', A, B), A]
+    assert logic.conjuncts("(A ∧ B) ∧ C") == [('and', A, B), C]
+
+    # Malformed formulas are reported, not crashed on
+    for formula in ["", "A ∧", "(A ∧ B", "A ∧ B)", "A B", "A # B", "a ∧ B", "∧ A"]:
+        try:
+            logic.parse(formula)
+        except exceptions.CalculateError as e:
+            print(f"{formula!r}: {e}")
+        else:
+            raise AssertionError(f"{formula!r} should not parse")
+
+    try:
+        logic.parse("(" * 5000 + "A" + ")" * 5000)
+    except exceptions.CalculateError:
+        pass
+    else:
+        raise AssertionError("very deep nesting should be reported, not crash")
+
+    # Parsing time grows with the length of the formula, not its square
+    timings = []
+    for size in (2000, 20000):
+        formula = " ∧ ".join(f"({letter}' → {letter})" for letter in "ABCDEFGHIJ" * (size // 10))
+        start = time.perf_counter()
+        tree = logic.parse(formula)
+        timings.append(time.perf_counter() - start)
+        assert len(tree) == size + 1
+    print(f"2000 and 20000 terms: {timings[0] * 1000:.1f}ms, {timings[1] * 1000:.1f}ms")
+    assert timings[1] < 30 * timings[0]
+
+    print("logic tests passed")
+
+if __name__ == "__main__":
+    main()
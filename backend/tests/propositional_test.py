@@ -0,0 +1,124 @@
+# File: propositional_test.py
+# Author: Backend Team
+# Description: test the propositional proof rules, input notations, long proofs, and proofs running side by side
+
+import sys, os, time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+from backend import registry
+from solvers import propositional_solver
+from solvers.util import exceptions
+
+PROBLEMS = [
+    ("(A → B) ∧ (B → C) ∧ A", "C"),
+    ("(P → Q) ∧ Q'", "P'"),
+    ("(A ∨ B) ∧ A'", "B"),
+    ("(D → E) ∧ (E → F)", "D → F"),
+    ("(A → B) ∧ (C → B) ∧ (A ∨ C)", "B"),
+    ("A ∧ B", "A ∧ B"),
+    ("(G → H) ∧ G'", "H"),
+]
+
+# Letters for generated problems (S and V are read as operators)
+LETTERS = "ABCDEFGHIJKLMNOPQRTUWXYZ"
+
+def main():
+    from solvers.propositional_solver import Letter, OR, AND, IMPLIES
+
+    # Building a statement twice gives the same object
+    a, b = Letter("A"), Letter("B")
+    assert Letter("A") is a and Letter("A", True) is a.negate()
+    assert IMPLIES(a, b) is IMPLIES(Letter("A"), Letter("B"))
+
+    # The parts of OR and AND may come in either order, those of IMPLIES may not
+    assert OR(a, b) == OR(b, a) and hash(OR(a, b)) == hash(OR(b, a))
+    assert str(OR(b, a)) == "B or A"
+    assert AND(OR(a, b), b) == AND(b, OR(b, a))
+    assert IMPLIES(a, b) != IMPLIES(b, a)
+    assert a != a.negate() and OR(a, b) != OR(a, b).negate()
+    assert len({OR(a, b), OR(b, a), AND(a, b)}) == 2
+
+    try:
+        a.is_Not = True
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("formulas should be immutable")
+
+    # Each rule on its own, and the line that cites it
+    cases = [
+        ("(A → B) ∧ A", "B", "3. B, 1, 2, Modus Ponens"),
+        ("(A → B) ∧ B'", "A'", "3. not A, 1, 2, modus tollens"),
+        ("(A → B) ∧ (B → C)", "A → C", "3. A implies C, 1, 2, transitive"),
+        ("(A ∨ B) ∧ A'", "B", "3. B, 1, 2, disjunctive syllogism"),
+        ("(A ∨ B)'", "A' ∧ B'", "2. not A and not B, 1, De Morgan's law"),
+        ("A ∧ B", "A ∧ B", "3. A and B, 1, 2, Conjunction"),
+        ("A", "A ∨ B", "2. A or B, 1, Addition"),
+        ("(A → B) ∧ (C → B) ∧ (A ∨ C)", "B", "6. B, 1, 5, proof by cases"),
+    ]
+    for hypotheses, conclusion, line in cases:
+        proof = propositional_solver.solve(hypotheses, conclusion)["String"]
+        assert proof.splitlines()[-1] == line, (hypotheses, conclusion, proof)
+
+    # Conclusions that don't follow aren't proved
+    for hypotheses, conclusion in [("(A → B) ∧ B", "A"), ("A ∨ B", "A"), ("(A → B) ∧ A'", "B'")]:
+        assert propositional_solver.solve(hypotheses, conclusion)["String"].startswith("Unfortunately")
+
+    # Every notation gives the same proof
+    expected = propositional_solver.solve("(A → B) ∧ A", "B")
+    for hypotheses in ["(A -> B) ∧ A", "(A > B) ^ A", "(A S B) ` A", "[A → B] and A", "A→B∧A"]:
+        assert propositional_solver.solve(hypotheses, "B") == expected, hypotheses
+
+    # Negated groups, longer conclusions and ↔ used to be misread
+    assert propositional_solver.solve("(A ∧ B)' ∧ A", "B'")["String"].splitlines()[-1].endswith("disjunctive syllogism")
+    assert propositional_solver.solve("(A → C) ∧ (A → B)", "A → C ∧ B")["String"].splitlines()[-1] == "6. C and B, 4, 5, Conjunction"
+    assert propositional_solver.solve("(A ↔ B) ∧ A", "B")["String"].splitlines()[-1] == "4. B, 2, 3, Modus Ponens"
+
+    try:
+        propositional_solver.solve("A ∧", "B")
+    except exceptions.CalculateError as e:
+        print(e)
+    else:
+        raise AssertionError("a malformed hypothesis should be reported")
+
+    # Long chains used to time out: every new statement was compared with every other one
+    for size in (15, len(LETTERS)):
+        letters = LETTERS[:size]
+        hypotheses = [f"({a} → {b})" for a, b in zip(letters, letters[1:])]
+        start = time.perf_counter()
+        proof = propositional_solver.solve(" ∧ ".join(hypotheses + [letters[0]]), letters[-1])["String"]
+        implied = propositional_solver.solve(" ∧ ".join(hypotheses), f"{letters[0]} → {letters[-1]}")["String"]
+        elapsed = time.perf_counter() - start
+        print(f"{size} hypotheses: {elapsed * 1000:.1f}ms")
+
+        assert proof.splitlines()[-1].startswith(f"{2 * size - 1}. {letters[-1]}, ")
+        assert implied.splitlines()[-1].endswith("transitive")
+        assert elapsed < 1
+
+
+    expected = [propositional_solver.solve(*problem) for problem in PROBLEMS]
+    assert expected[0]["String"].endswith("Modus Ponens\n")
+    assert expected[-1]["String"].startswith("Unfortunately")
+
+    # Switch threads as often as possible so the solves really interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        jobs = [index % len(PROBLEMS) for index in range(20 * len(PROBLEMS))]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda index: propositional_solver.solve(*PROBLEMS[index]), jobs))
+    finally:
+        sys.setswitchinterval(interval)
+
+    for index, result in zip(jobs, results):
+        assert result == expected[index], (PROBLEMS[index], result)
+    print(f"{len(jobs)} concurrent proofs match their sequential output")
+
+    print("propositional tests passed")
+
+if __name__ == "__main__":
+    main()
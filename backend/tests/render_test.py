@@ -0,0 +1,46 @@
+# File: render_test.py
+# Author: Backend Team
+# Description: test the deterministic, cached graph layouts used by the graph solvers
+
+import sys, os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+from backend import registry
+from solvers.util import render
+import networkx as nx
+
+def main():
+    # The same graph typed in another order gets the same picture
+    first = render.graph_layout(nx.Graph([(1, 2), (2, 3), (3, 1)]))
+    render._layouts.clear()
+    second = render.graph_layout(nx.Graph([(3, 1), (3, 2), (2, 1)]))
+    assert first == second
+
+    # ...and so the same image, request after request
+    entry = registry.SOLVERS['adjacency-matrices-lists']
+    data = {"input": "{(a, b), (b, c), (c, d), (d, a)}", "type": "UNDIRECTED"}
+    first = entry.solve(dict(data))["Graph"]
+    render._layouts.clear()
+    assert entry.solve(dict(data))["Graph"] == first
+
+    # Callers can't change a cached layout
+    graph = nx.path_graph(5)
+    render.graph_layout(graph)[0] = (9.0, 9.0)
+    assert render.graph_layout(graph)[0] != (9.0, 9.0)
+
+    # Big graphs skip the force simulation
+    size = render.LAYOUT_SPRING_MAX_NODES + 1
+    pos = render.graph_layout(nx.star_graph(size))
+    assert len({x for x, _ in pos.values()}) == 2, "a star is bipartite: two columns"
+
+    pos = render.graph_layout(nx.cycle_graph(size * 2 + 1))
+    assert len(pos) == size * 2 + 1
+
+    pos = render.graph_layout(nx.gnm_random_graph(render.LAYOUT_SPECTRAL_MAX_NODES + 100, 2000, seed=1))
+    assert len(pos) == render.LAYOUT_SPECTRAL_MAX_NODES + 100
+
+if __name__ == "__main__":
+    main()
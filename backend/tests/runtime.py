@@ -0,0 +1,13 @@
+# File: runtime.py
+# Author: Backend Team
+# Description: imported by the tests before the backend, so the state the server writes
+#   (metrics snapshots, the result cache and image store, jobs) goes to a temporary
+#   directory instead of the repo's logs/
+
+import os, tempfile
+
+DIRECTORY = tempfile.mkdtemp(prefix='backend-tests-')
+
+# setdefault, so solver processes spawned by a test share its directory
+for variable, path in (('METRICS_DIR', 'metrics'), ('CACHE_DIR', 'cache'), ('JOBS_DB', 'jobs.db')):
+    os.environ.setdefault(variable, os.path.join(DIRECTORY, path))
@@ -0,0 +1,205 @@
+# File: wff_test.py
+# Author: Backend Team
+# Description: test the bitset truth tables against evaluating every cell one at a time
+
+import sys, os, time, itertools, json, base64
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import runtime
+
+os.environ.setdefault('API_KEY', 'test-key')
+
+from backend import registry
+from solvers import wff_solver
+from solvers.util import logic
+from solvers.util import exceptions
+
+FORMULAS = [
+    "(A ∧ B) → C",
+    "A ∨ A'",
+    "A ∧ A'",
+    "(A → B) ∧ (B → C) → (A → C)",
+    "(A ∨ B)' ↔ (A' ∧ B')",
+    "(A ^ B) v (A ^ B)",
+    "A 4 B 4 C",
+    "(A ` B) ~ C′",
+    "[P → Q] ∧ P",
+    "AVB",
+    "(ASB) 4 ¬B",
+    "A′′ -> (B <> C) <= A",
+]
+
+def evaluate(tree, env):
+    # One cell, straight from the parse tree
+    kind = tree[0]
+    if kind == "var":
+        return env[tree[1]]
+    if kind == "const":
+        return tree[1]
+    values = [evaluate(child, env) for child in tree[1:]]
+    if kind == "not":
+        return not values[0]
+    if kind == "and":
+        return all(values)
+    if kind == "or":
+        return any(values)
+    if kind == "iff":
+        return values[0] == values[1]
+    return not values[0] or values[1]
+
+def each_row(formula):
+    # The truth table one row and one cell at a time
+    variables = wff_solver._extract_variables(formula)
+    columns = [logic.parse(expr) for expr in wff_solver._extract_intermediate_expressions(formula)]
+    columns.append(logic.parse(formula))
+    rows = []
+    for values in itertools.product([False, True], repeat=len(variables)):
+        env = dict(zip(variables, values))
+        rows.append(list(values) + [evaluate(column, env) for column in columns])
+    return rows
+
+def expand(table):
+    # The rows of a "bits" table, as the frontend expands them
+    columns = [base64.b64decode(column) for column in table["columns"]]
+    return [[bool(column[row >> 3] >> (row & 7) & 1) for column in columns] for row in range(table["rowCount"])]
+
+def main():
+    # Packed columns unpack to the same rows, on either side of a word
+    for formula in FORMULAS + [" ∧ ".join("ABCDEFG") + " → (H ∨ A')"]:
+        rows = each_row(formula)
+        table = wff_solver.solve(formula)
+        assert table["rows"] == rows, formula
+        assert table["description"] == wff_solver._classify_wff(sum(row[-1] for row in rows), len(rows))[1], formula
+
+    assert wff_solver.solve("A ∨ A'")["classification"] == "tautology"
+    assert wff_solver.solve("A ∧ A'")["classification"] == "contradiction"
+    assert wff_solver.solve("A ∧ 1")["rows"] == [[False, False], [True, True]]
+
+    # Headers are written with the unicode operators, whatever the notation
+    assert wff_solver.solve("(A <> B) -> (B <-> A) == A")["headers"][2:] == ["A ↔ B", "B ↔ A", "(A ↔ B) → (B ↔ A) ↔ A"]
+    assert wff_solver.solve("(A ^ B) <= A v B")["headers"][-1] == "(A ∧ B) → A ∨ B"
+    assert wff_solver.solve("not A and (A or B)")["headers"][2:] == ["A ∨ B", "¬A ∧ (A ∨ B)"]
+    assert wff_solver.solve("(A ` B) S C 4 A ~ B")["headers"][3:] == ["A ∧ B", "(A ∧ B) → C ↔ A ∨ B"]
+    assert wff_solver.summarize("A ⇒ B ⋀ C")["headers"][-1] == "A → B ∧ C"
+
+    # Equal subformulas parse to equal trees, which are evaluated once
+    first, second = logic.parse("(A ∧ B)' → C"), logic.parse("C ∨ (A ∧ B)'")
+    assert first[1] == second[2]
+
+    bitsets = wff_solver._evaluate_bitsets(["A", "B", "C"], [first[1], first, second, second[2]])
+    assert bitsets[3] is bitsets[6]
+
+    # 20 variables are classified from the formula's bitset alone
+    formula = "(" + " ∧ ".join("ABCDEFGHIJ") + ") → (" + " ∨ ".join("KLMNOPQRTU") + ")"
+    start = time.perf_counter()
+    summary = wff_solver.summarize(formula)
+    elapsed = time.perf_counter() - start
+    print(f"20 variable summary: {elapsed * 1000:.1f}ms")
+
+    assert summary["rowsOmitted"] and summary["rows"] == []
+    assert summary["description"] == f"Formula is true for {2 ** 20 - 1} combinations and false for 1 combinations."
+    assert elapsed < 1
+
+    assert wff_solver.summarize("(A ∨ A') ∧ (B → B)")["classification"] == "tautology"
+    assert "classification" not in wff_solver.summarize(" ∧ ".join("ABCDEFGHIJKLMNOPQRTUWXYZ"))
+
+    # Tables over a few words, listed in full
+    letters = "ABCDEFGHIJKLMNOP"
+    for size in (12, 16):
+        formula = " ∧ ".join(f"({a} → {b})" for a, b in zip(letters[:size], letters[1:size]))
+        start = time.perf_counter()
+        table = wff_solver.solve(formula)
+        elapsed = time.perf_counter() - start
+        print(f"{size} variables: {elapsed * 1000:.1f}ms")
+
+        assert len(table["rows"]) == 2 ** size
+        # A chain of implications holds when the variables are some Fs followed by Ts
+        assert table["description"].startswith(f"Formula is true for {size + 1} combinations")
+        assert elapsed < 2
+
+    # Packed columns expand to the same rows, for tables under a byte, a word and over a word
+    for formula in FORMULAS + ["¬A", " ∧ ".join("ABCDEFG") + " → (H ∨ A')"]:
+        table = wff_solver.solve(formula)
+        bits = registry.SOLVERS['wff'].solve({"formula": formula, "tableFormat": "bits"})
+        assert bits["headers"] == table["headers"] and bits["description"] == table["description"], formula
+        assert expand(bits) == table["rows"], formula
+
+    # Bits past the last row are left 0
+    assert wff_solver.solve("¬A", "bits")["columns"] == ["Ag==", "AQ=="]
+
+    # 16 variables and 16 columns: a few hundred KB instead of megabytes
+    formula = " ∧ ".join(f"({a} → {b})" for a, b in zip("ABCDEFGHIJKLMNOP", "BCDEFGHIJKLMNOP"))
+    rows = len(json.dumps(wff_solver.solve(formula)))
+    bits = len(json.dumps(wff_solver.solve(formula, "bits")))
+    print(f"16 variables: {rows} bytes as rows, {bits} bytes as bits")
+    assert bits * 20 < rows
+
+    try:
+        wff_solver.solve("A", "csv")
+    except exceptions.CalculateError:
+        pass
+    else:
+        raise AssertionError("unknown table formats should be reported")
+
+    # Streamed blocks add up to the same table, including across blocks (13 variables)
+    for formula in FORMULAS + [" ∧ ".join("ABCDEFGHIJKLM") + " → (A ∨ M')"]:
+        table = wff_solver.solve(formula)
+        parts = list(wff_solver.stream(formula))
+        assert parts[0] == [{"headers": table["headers"], "rowCount": len(table["rows"])}], formula
+        assert [row for part in parts[1:-1] for row in part] == table["rows"], formula
+        assert parts[-1] == [{"classification": table["classification"], "description": table["description"]}], formula
+
+    # The first block comes without evaluating the rest of a 24 variable table
+    start = time.perf_counter()
+    parts = wff_solver.stream(" ∧ ".join("ABCDEFGHIJKLMNOPQRTUWXYZ"))
+    next(parts)
+    assert len(next(parts)) == 2 ** wff_solver.CHUNK_BITS
+    assert time.perf_counter() - start < 1
+    parts.close()
+
+    # The NDJSON endpoint
+    from app import app
+    client = app.test_client()
+    headers = {'X-API-Key': os.environ['API_KEY']}
+
+    response = client.post('/solve/wff/stream', json={"formula": "(A ∧ B) → C"}, headers=headers)
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    table = wff_solver.solve("(A ∧ B) → C")
+    assert lines[0]["rowCount"] == 8 and lines[1:-1] == table["rows"]
+    assert lines[-1]["classification"] == "contingency"
+
+    # Rows go out as they're made, nothing on the way buffers the whole table
+    formula = " ∧ ".join("ABCDEFGHIJKLMNOPQR")
+    response = client.post('/solve/wff/stream', json={"formula": formula}, headers=headers, buffered=False)
+    assert response.is_streamed
+    parts = iter(response.response)
+    assert json.loads(next(parts)) == {"headers": list("ABCDEFGHIJKLMNOPQR") + [formula], "rowCount": 2 ** 18}
+    assert next(parts).count(b"\n") == 2 ** wff_solver.CHUNK_BITS
+    response.close()
+
+    # Malformed formulas are reported before streaming starts
+    response = client.post('/solve/wff/stream', json={"formula": "(A ∧"}, headers=headers)
+    assert "Calculation Error" in response.get_json()
+
+    # Past the queue limit the summary is sent as the only line
+    response = client.post('/solve/wff/stream', json={"formula": " ∧ ".join("ABCDEFGHIJKLMNOPQRTUWXYZ")}, headers=headers)
+    lines = response.data.decode().splitlines()
+    assert len(lines) == 1 and json.loads(lines[0])["rowsOmitted"]
+
+    assert client.post('/solve/power-set/stream', json={}, headers=headers).status_code == 400
+
+    # 16 variables with intermediate columns are over the limit as rows, but in the bits
+    #   format they are priced as packed bytes and answered in full
+    formula = " ∨ ".join(f"({a} ∧ {b})" for a, b in zip("ACEGIKMO", "BDFHJLNP"))
+    rows = client.post('/solve/wff', json={"formula": formula}, headers=headers).get_json()
+    assert rows["rowsOmitted"]
+    bits = client.post('/solve/wff', json={"formula": formula, "tableFormat": "bits"}, headers=headers).get_json()
+    assert "rowsOmitted" not in bits and bits["rowCount"] == 2 ** 16
+    assert expand(bits) == wff_solver.solve(formula)["rows"]
+
+    print("wff tests passed")
+
+if __name__ == "__main__":
+    main()
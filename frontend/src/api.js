@@ -10,6 +10,13 @@ import axios from 'axios';
 const API_BASE_URL = (window._env_ && window._env_.API_URL) || 'http://localhost:5000';
 const API_KEY = (window._env_ && window._env_.API_KEY) || 'development-key';
 
+// Diagrams come back as the /render URL of an SVG: sharp at any zoom, and cached by the browser
+//   so the same diagram is only downloaded once (see utils/diagram.js)
+const IMAGE_FORMAT = 'svg-url';
+
+// The absolute URL of a /render/<sha>.<ext> diagram
+export const renderUrl = (path) => `${API_BASE_URL}${path}`;
+
 const apiClient = axios.create({
     baseURL: API_BASE_URL,
     headers: {
@@ -17,13 +24,44 @@ const apiClient = axios.create({
     }
 });
 
+// Wait for a background job to finish, polling less often the longer it runs
+const waitForJob = async (location) => {
+    let delay = 500;
+    while (true) {
+        await new Promise((resolve) => setTimeout(resolve, delay));
+        delay = Math.min(delay * 2, 5000);
+
+        const response = await apiClient.get(location);
+        const job = response.data;
+        if (job.status === 'done') {
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            return { error: job.message || job.error || 'An unknown error occurred' };
+        }
+    }
+};
+
 // A function to route and pass solver code to the backend
 // Core solve function that needs fixing
-const solve = async (solverType, data) => {
+const solve = async (solverType, data, attempt = 1) => {
     try {
-        const response = await apiClient.post(`/solve/${solverType}`, data);
+        // Problems too large to solve right away are queued as a job (202) that we poll
+        const response = await apiClient.post(`/solve/${solverType}`, data, {
+            headers: { 'Prefer': 'respond-async' }
+        });
+        if (response.status === 202) {
+            return await waitForJob(response.data.location);
+        }
         return response.data;
     } catch (error) {
+        // The server is busy drawing other diagrams, try again when it says to
+        if (error.response?.status === 503 && attempt < 3) {
+            const seconds = Number(error.response.headers['retry-after']) || 1;
+            await new Promise((resolve) => setTimeout(resolve, seconds * 1000));
+            return await solve(solverType, data, attempt + 1);
+        }
+
         console.error('Error Solving:', error);
         
         // Return structured error info instead of null
@@ -80,8 +118,10 @@ export const reportProblem = async (email, issue) => {
 };
 
 // Call WFF to Truthtable solver to the backend 
+// Truth tables come back as packed columns, a fraction of the size of rows of booleans
+//   (see utils/truthTable.js)
 export const solveWFF = async (formula) => {
-    return await solve('wff', { formula });
+    return await solve('wff', { formula, tableFormat: 'bits' });
 };
 
 // Call Propositional Logic solver to the backend
@@ -159,7 +199,7 @@ export const solvePartitions = async (set, relation) => {
 // Call adjacency matrices and lists solver to the backend
 export const solveAdjacencyMatricesLists = async (input, type) => {
     try {
-        const response =  await solve('adjacency-matrices-lists', { input, type });
+        const response =  await solve('adjacency-matrices-lists', { input, type, imageFormat: IMAGE_FORMAT });
         if (response.error) {
             throw new Error(response.error);
         }
@@ -171,12 +211,12 @@ export const solveAdjacencyMatricesLists = async (input, type) => {
 
 // Call array to tree solver to the backend
 export const solveArrayToTree = async (input) => {
-    return await solve('array-to-tree', { input });
+    return await solve('array-to-tree', { input, imageFormat: IMAGE_FORMAT });
 }
 
 // Call binary trees solver to the backend
 export const solveBinaryTrees = async (input, choice) => {
-    return await solve('binary-trees', { input, choice });
+    return await solve('binary-trees', { input, choice, imageFormat: IMAGE_FORMAT });
 }
 
 // Call boolean matrices solver to the backend
@@ -208,13 +248,13 @@ export const solveDisjointCycles = async (input) => {
 
 // Call graphs solver to the backend
 export const solveGraphs = async (pairs, type, isIsomorphic, secondInput) => {
-    return await solve('graphs', { pairs, type, isIsomorphic, secondInput });
+    return await solve('graphs', { pairs, type, isIsomorphic, secondInput, imageFormat: IMAGE_FORMAT });
 }
 
 // Call Hasse diagram solver to the backend
 export const solveHasseDiagram = async (set, relation) => {
     try {
-        const response = await solve('hasse-diagrams', { set, relation });
+        const response = await solve('hasse-diagrams', { set, relation, imageFormat: IMAGE_FORMAT });
         if (response.error) {
             throw new Error(response.error);
         }
@@ -238,7 +278,7 @@ export const solveOrderOfMagnitude = async (payload) => {
 // Call PERT diagrams solver to the backend
 export const solvePERTDiagrams = async (taskTable) => {
     try {
-        const response = await solve('pert-diagrams', taskTable);
+        const response = await solve('pert-diagrams', { ...taskTable, imageFormat: IMAGE_FORMAT });
         return response
     } catch (error) {
         console.error('Error solving PERT diagram:', error);
@@ -278,7 +318,7 @@ export const solveTopologicalSorting = async (taskTable) => {
 
 // Call tree to array solver to the backend
 export const solveTreeToArray = async (input, choice) => {
-    return await solve('tree-to-array', { input, choice });
+    return await solve('tree-to-array', { input, choice, imageFormat: IMAGE_FORMAT });
 }
 
 // Call Warshall's algorithm solver to the backend
@@ -289,7 +329,7 @@ export const solveWarshallsAlgorithm = async (input) => {
 // Call weighted graphs solver to the backend
 export const solveWeightedGraphs = async (input, type) => {
     try {
-        const response = await solve('weighted-graphs', { input, type });
+        const response = await solve('weighted-graphs', { input, type, imageFormat: IMAGE_FORMAT });
         if (response.error) {
             throw new Error(response.error);
         }
@@ -301,7 +341,7 @@ export const solveWeightedGraphs = async (input, type) => {
 
 // Solve tree notation to the backend
 export const solveTreeNotation = async (input, secondaryInput, operation) => {
-    return await solve('tree-notation', { input, secondaryInput, operation });
+    return await solve('tree-notation', { input, secondaryInput, operation, imageFormat: IMAGE_FORMAT });
 }
 
 // Solve master theorem to the backend
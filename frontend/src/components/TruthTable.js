@@ -1,37 +1,66 @@
 import React from 'react';
-import { Table, TableBody, TableCell, TableHeader, TableRow, Text } from 'grommet';
+import { Box, Button, Table, TableBody, TableCell, TableHeader, TableRow, Text } from 'grommet';
+import { readTruthTable } from '../utils/truthTable';
 
 /*
 * Name: TruthTable.js
 * Author: Parker Clark
-* Description: Defines the TruthTable component for displaying a truth table.
+* Description: Defines the TruthTable component for displaying a truth table. Takes the wff
+*   solver's response, in either table format (see utils/truthTable.js), and shows its rows a
+*   page at a time.
 */
 
-const TruthTable = ({ headers, rows }) => {
+const PAGE_ROWS = 256;
+
+const TruthTable = ({ table }) => {
+  const [shown, setShown] = React.useState(PAGE_ROWS);
+  const { rowCount, getRow } = React.useMemo(() => readTruthTable(table), [table]);
+
+  // A new table starts from its first page again
+  React.useEffect(() => {
+    setShown(PAGE_ROWS);
+  }, [table]);
+
+  const rows = [];
+  for (let index = 0; index < Math.min(shown, rowCount); index++) {
+    rows.push(getRow(index));
+  }
+
   return (
-    <Table>
-      <TableHeader>
-        <TableRow>
-          {headers.map((header, index) => (
-            <TableCell key={index} scope="col" border={{ color: 'light-4', side: 'all' }}>
-              <Text>{header}</Text>
-            </TableCell>
-          ))}
-        </TableRow>
-      </TableHeader>
-      <TableBody>
-        {rows.map((row, rowIndex) => (
-          <TableRow key={rowIndex}>
-            {row.map((cell, cellIndex) => (
-              <TableCell key={cellIndex} border={{ color: 'light-4', side: 'all' }}>
-                <Text>{cell.toString()}</Text>
+    <Box>
+      <Table>
+        <TableHeader>
+          <TableRow>
+            {table.headers.map((header, index) => (
+              <TableCell key={index} scope="col" border={{ color: 'light-4', side: 'all' }}>
+                <Text>{header}</Text>
               </TableCell>
             ))}
           </TableRow>
-        ))}
-      </TableBody>
-    </Table>
+        </TableHeader>
+        <TableBody>
+          {rows.map((row, rowIndex) => (
+            <TableRow key={rowIndex}>
+              {row.map((cell, cellIndex) => (
+                <TableCell key={cellIndex} border={{ color: 'light-4', side: 'all' }}>
+                  <Text>{cell.toString()}</Text>
+                </TableCell>
+              ))}
+            </TableRow>
+          ))}
+        </TableBody>
+      </Table>
+      {shown < rowCount && (
+        <Box margin={{ top: 'small' }} align="center">
+          <Button
+            label={`Show more rows (${rowCount - shown} more)`}
+            onClick={() => setShown(shown + PAGE_ROWS * 4)}
+            size="small"
+          />
+        </Box>
+      )}
+    </Box>
   );
 };
 
-export default TruthTable;
\ No newline at end of file
+export default TruthTable;
@@ -6,6 +6,7 @@ import AdjacencyMatrix from '../components/AdjacencyMatrix';
 import AdjacencyList from '../components/AdjacencyList';
 import { useDiagnostics } from '../hooks/useDiagnostics';
 import GraphInput from '../components/GraphInput';
+import { diagramSrc } from '../utils/diagram';
 /*
 * Name: AdjacencyMatricesLists.js
 * Author: Parker Clark
@@ -165,7 +166,7 @@ const AdjacencyMatricesLists = () => {
               <Box pad="small">
                 {output.Graph && (
                   <Box align="center" justify="center" pad={{ vertical: 'small' }} background={{ color: 'white' }} round="small">
-                    <img src={`data:image/png;base64,${output.Graph}`} alt="Graph" style={{ maxWidth: '100%', height: 'auto' }} />
+                    <img src={diagramSrc(output.Graph)} alt="Graph" style={{ maxWidth: '100%', height: 'auto' }} />
                   </Box>
                 )}
               </Box>
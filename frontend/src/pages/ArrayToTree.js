@@ -3,6 +3,7 @@ import { Box, Text, TextArea, Button, Spinner, Image, Table, TableHeader, TableB
 import { solveArrayToTree } from '../api';
 import SolverPage from '../components/SolverPage';
 import { useDiagnostics } from '../hooks/useDiagnostics';
+import { diagramSrc } from '../utils/diagram';
 /*
 * Name: ArrayToTree.js
 * Description: Solver page for converting array representation to a binary tree.
@@ -250,7 +251,7 @@ F 0 0`;
                 <Box height="medium" width="100%" overflow="auto" background="white" pad="small" round="small">
                   <Box align="center" justify="center" height="100%">
                     <Image 
-                      src={`data:image/png;base64,${result.image}`}
+                      src={diagramSrc(result.image)}
                       fit="contain"
                       alt="Binary tree visualization"
                       style={{ maxWidth: '100%' }}
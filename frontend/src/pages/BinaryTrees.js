@@ -3,6 +3,7 @@ import { Box, Text, TextInput, Button, Select} from 'grommet';
 import { solveBinaryTrees } from '../api';
 import SolverPage from '../components/SolverPage';
 import { useDiagnostics } from '../hooks/useDiagnostics';
+import { diagramSrc } from '../utils/diagram';
 
 /*
 * Name: BinaryTrees.js
@@ -225,7 +226,7 @@ const BinaryTrees = () => {
     }
   };
 
-  // Convert base64 image string to image element
+  // Convert the diagram (PNG or SVG) to an image element
   const renderOutput = () => {
     if (!output) {
       return "Output will be displayed here!";
@@ -234,7 +235,7 @@ const BinaryTrees = () => {
     return (
       <Box>
         <img
-          src={`data:image/png;base64,${output}`}
+          src={diagramSrc(output)}
           alt="Graph"
           style={{ maxWidth: '100%', height: 'auto' }}
         />
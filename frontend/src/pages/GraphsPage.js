@@ -4,6 +4,7 @@ import { solveGraphs } from '../api';
 import SolverPage from '../components/SolverPage';
 import { useDiagnostics } from '../hooks/useDiagnostics';
 import GraphInput from '../components/GraphInput';
+import { diagramSrc } from '../utils/diagram';
 
 
 /*
@@ -188,7 +189,7 @@ const GraphsPage = () => {
     return graphRegex.test(input);
   }
 
-  // Convert base64 image string to image element
+  // Convert the diagram (PNG or SVG) to an image element
   const renderOutput = () => {
     if (!output) {
       return "Output will be displayed here!";
@@ -197,7 +198,7 @@ const GraphsPage = () => {
     // Parse out json object and return out elements one by one
     return (
       <Box>
-        <img src={`data:image/png;base64,${output}`} alt="Graph" style={{ maxWidth: '100%', height: 'auto' }} />
+        <img src={diagramSrc(output)} alt="Graph" style={{ maxWidth: '100%', height: 'auto' }} />
       </Box>
     );
   };
@@ -194,6 +194,12 @@ const PowerSets = () => {
             </Box>
           )}
           
+          {result.elementsOmitted && result.message && (
+            <Box margin={{ bottom: "medium" }}>
+              <Text color="status-warning">{result.message}</Text>
+            </Box>
+          )}
+
           {result.original_sets && Object.entries(result.original_sets).map(([name, value]) => (
             <Box key={name} direction="row" margin={{ bottom: "small" }}>
               <Text weight="bold" margin={{ right:"xsmall"}}>{name.startsWith('Set') ? name : `Set ${name}`}: </Text>
@@ -221,7 +227,7 @@ const PowerSets = () => {
                       </Box>
                     )}
                     
-                    {powerSet.elements && (
+                    {powerSet.elements && !result.elementsOmitted && (
                       <Box margin={{ top: "small" }}>
                         <Text weight="bold">Elements: </Text>
                         <Box 
@@ -151,7 +151,7 @@ const PropositionalLogicSolver = () => {
         
     try {
       const result = await solvePropositionalLogic({ hypotheses, conclusion });
-      const parsedResult = JSON.parse(result); // Ensure it's properly parsed
+      const parsedResult = typeof result === 'string' ? JSON.parse(result) : result; // Ensure it's properly parsed
     
       // Set output to the "String" entry
       setOutput(parsedResult.String || "No output available");
@@ -5,6 +5,7 @@ import { solvePropertiesOfRelations, solveClosureAxioms, solveHasseDiagram, solv
 import { useDiagnostics } from '../hooks/useDiagnostics';
 import SolverPage from '../components/SolverPage';
 import LatexLine from '../components/LatexLine';
+import { diagramSrc } from '../utils/diagram';
 
 /*
 * Name: RelationProperties.js
@@ -89,15 +90,15 @@ const RelationProperties = () => {
       let properties_result = await solvePropertiesOfRelations(set, relation);
       let closure_result = await solveClosureAxioms(set, relation);
 
-      properties_result = JSON.parse(properties_result);
-      closure_result = JSON.parse(closure_result);
+      if (typeof properties_result === 'string') { properties_result = JSON.parse(properties_result); }
+      if (typeof closure_result === 'string') { closure_result = JSON.parse(closure_result); }
 
       let result = Object.assign({}, properties_result, closure_result);
       if (properties_result["Reflexive"] && properties_result["Antisymmetric"] && properties_result["Transitive"]) {
         let special_result = await solvePartialOrderings(set, relation);
         let hasse_result = await solveHasseDiagram(set, relation);
-        special_result = JSON.parse(special_result);
-        hasse_result = JSON.parse(hasse_result);
+        if (typeof special_result === 'string') { special_result = JSON.parse(special_result); }
+        if (typeof hasse_result === 'string') { hasse_result = JSON.parse(hasse_result); }
         result = Object.assign({}, result, special_result, hasse_result);
 
         result["Partial"] = true;
@@ -449,7 +450,7 @@ const Output = ({ output }) => {
                     Maximal Elements: {maximals}
                   </div>
                   <Box>
-                    <img src={`data:image/png;base64,${diagram}`} alt="Hasse Diagram" />
+                    <img src={diagramSrc(diagram)} alt="Hasse Diagram" />
                   </Box>
               </>
           )}
@@ -5,6 +5,7 @@ import { useDiagnostics } from '../hooks/useDiagnostics';
 import TaskTableInput from '../components/TaskTableInput';
 import SolverPage from '../components/SolverPage';
 import LatexLine from '../components/LatexLine';
+import { diagramSrc } from '../utils/diagram';
 
 /*
 * Name: TaskTables.js
@@ -184,9 +185,9 @@ const TaskTables = () => {
       let pert_result = await solvePERTDiagrams(tableFormat);
       let topological_result = await solveTopologicalSorting(tableFormat);
 
-      if (isTimed) { critical_result = JSON.parse(critical_result); }
-      pert_result = JSON.parse(pert_result);
-      topological_result = JSON.parse(topological_result);
+      if (isTimed && typeof critical_result === 'string') { critical_result = JSON.parse(critical_result); }
+      if (typeof pert_result === 'string') { pert_result = JSON.parse(pert_result); }
+      if (typeof topological_result === 'string') { topological_result = JSON.parse(topological_result); }
 
       let result = Object.assign({}, pert_result, topological_result);
       if (isTimed) { result = Object.assign({}, result, critical_result); }
@@ -348,7 +349,7 @@ const Output = ({ output, isTimed }) => {
             Total Relation: {total_relation}
           </div>
           <Box>
-            <img src={`data:image/png;base64,${diagram}`} alt="PERT Chart" />
+            <img src={diagramSrc(diagram)} alt="PERT Chart" />
           </Box>
       </>
     );
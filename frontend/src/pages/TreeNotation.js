@@ -3,6 +3,7 @@ import { Box, Text, TextInput, Button, Select, Tab, Tabs, TextArea, Image, Spinn
 import { solveTreeNotation } from '../api';
 import SolverPage from '../components/SolverPage';
 import { useDiagnostics } from '../hooks/useDiagnostics';
+import { diagramSrc } from '../utils/diagram';
 
 /*
 * Name: TreeNotation.js
@@ -574,7 +575,7 @@ const TreeNotation = () => {
                   <Box height="medium" width="100%" overflow="auto" background="white" pad="small" round="small">
                     <Box align="center" justify="center" height="100%">
                       <Image 
-                        src={`data:image/png;base64,${result.image}`}
+                        src={diagramSrc(result.image)}
                         fit="contain"
                         alt="Binary tree visualization"
                         style={{ maxWidth: '100%' }}
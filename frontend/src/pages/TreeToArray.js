@@ -4,6 +4,7 @@ import { solveTreeToArray } from '../api';
 import SolverPage from '../components/SolverPage';
 import { useDiagnostics } from '../hooks/useDiagnostics';
 import TreeToArrayOutput from '../components/TreeToArrayOutput';
+import { diagramSrc } from '../utils/diagram';
 
 /*
 * Name: TreeToArray.js
@@ -208,7 +209,7 @@ const TreeToArray = () => {
                 <Text weight="bold" margin={{ bottom: 'small' }}>Tree Structure:</Text>
                 <Box background="white" pad="small" round="small">
                   <img 
-                    src={`data:image/png;base64,${output}`} 
+                    src={diagramSrc(output)} 
                     alt="Tree structure visualization" 
                     style={{ maxWidth: '100%', height: 'auto' }} 
                   />
@@ -228,7 +229,7 @@ const TreeToArray = () => {
                 </Text>
                 <Box background="white" pad="small" round="small">
                   <img 
-                    src={`data:image/png;base64,${treeData.pointerDiagram}`} 
+                    src={diagramSrc(treeData.pointerDiagram)} 
                     alt="Pointer memory representation" 
                     style={{ maxWidth: '100%', height: 'auto' }} 
                   />
@@ -89,7 +89,7 @@ const WFFSolverPage = () => {
     
     try {
       const result = await solveWFF(input);
-      const parsedResult = JSON.parse(result);
+      const parsedResult = typeof result === 'string' ? JSON.parse(result) : result;
       console.log(parsedResult);
       
       // Track successful execution with timing
@@ -257,7 +257,12 @@ const WFFSolverPage = () => {
     
     return (
       <Box>
-        <TruthTable headers={output.headers} rows={output.rows} />
+        {output.rowsOmitted && output.message && (
+          <Box margin={{ bottom: "medium" }}>
+            <Text color="status-warning">{output.message}</Text>
+          </Box>
+        )}
+        <TruthTable table={output} />
         {output.classification && renderClassification(output.classification, output.description)}
       </Box>
     );
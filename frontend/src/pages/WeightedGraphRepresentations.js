@@ -6,6 +6,7 @@ import AdjacencyMatrix from '../components/AdjacencyMatrix';
 import AdjacencyList from '../components/AdjacencyList';
 import { useDiagnostics } from '../hooks/useDiagnostics';
 import WeightedGraphInput from '../components/WeightedGraphInput';
+import { diagramSrc } from '../utils/diagram';
 
 /*
 * Name: WeightedGraphRepresentations.js
@@ -103,7 +104,7 @@ const WeightedGraphRepresentations = () => {
 
     try {
       const result = await solveWeightedGraphs(input, type);
-      const parsedResult = JSON.parse(result);
+      const parsedResult = typeof result === 'string' ? JSON.parse(result) : result;
       console.log(parsedResult);
       
       // Track successful execution with timing
@@ -147,7 +148,7 @@ const WeightedGraphRepresentations = () => {
             <Box pad="small">
               {output.Graph && (
                 <Box align="center" justify="center" pad={{ vertical: 'small' }} background={{ color: 'white' }} round="small">
-                  <img src={`data:image/png;base64,${output.Graph}`} alt="Graph" style={{ maxWidth: '100%', height: 'auto' }} />
+                  <img src={diagramSrc(output.Graph)} alt="Graph" style={{ maxWidth: '100%', height: 'auto' }} />
                 </Box>
               )}
             </Box>
@@ -0,0 +1,87 @@
+/*
+* Name: diagram.js
+* Author: Backend Team
+* Description: Turns a diagram from a solver response into an <img> src. The backend sends
+*   diagrams in the imageFormat the request asked for: a base64 PNG, SVG markup, a
+*   /render/<sha>.<ext> URL, or for single graphs a {format: "graph", nodes, edges} object with
+*   coordinates, drawn here as SVG.
+* Param {string|Object} image - The diagram as returned by the solver
+* Returns {string} A URL for the image
+*/
+
+import { renderUrl } from '../api';
+
+const NODE_RADIUS = 22;
+const MARGIN = 40;
+const SCALE = 120;
+
+const escapeXml = (text) => String(text)
+  .replace(/&/g, '&amp;')
+  .replace(/</g, '&lt;')
+  .replace(/>/g, '&gt;')
+  .replace(/"/g, '&quot;');
+
+// Draw a {format: "graph"} diagram as SVG markup, flipping y so it reads like matplotlib's
+export const graphToSvg = (graph) => {
+  const xs = graph.nodes.map((node) => node.x);
+  const ys = graph.nodes.map((node) => node.y);
+  const minX = Math.min(...xs, 0);
+  const maxY = Math.max(...ys, 0);
+  const spanX = Math.max(Math.max(...xs, 0) - minX, 1);
+  const spanY = Math.max(maxY - Math.min(...ys, 0), 1);
+  // Layouts come in very different units (spring layouts span ~2, tree layouts a few levels)
+  const scale = SCALE * Math.max(1, 4 / Math.max(spanX, spanY));
+  const titleHeight = graph.title ? 30 : 0;
+  const width = spanX * scale + 2 * MARGIN;
+  const height = spanY * scale + 2 * MARGIN + titleHeight;
+
+  const points = {};
+  graph.nodes.forEach((node) => {
+    points[node.id] = {
+      x: MARGIN + (node.x - minX) * scale,
+      y: titleHeight + MARGIN + (maxY - node.y) * scale,
+    };
+  });
+
+  const edgeColor = escapeXml(graph.edgeColor === 'k' ? 'black' : graph.edgeColor);
+  const edges = graph.edges.map((edge) => {
+    const from = points[edge.source];
+    const to = points[edge.target];
+    // Stop the line at the border of the target node so the arrowhead stays visible
+    const length = Math.hypot(to.x - from.x, to.y - from.y) || 1;
+    const endX = to.x - (to.x - from.x) * NODE_RADIUS / length;
+    const endY = to.y - (to.y - from.y) * NODE_RADIUS / length;
+    const marker = graph.directed ? ' marker-end="url(#arrow)"' : '';
+    const label = edge.label === null || edge.label === undefined ? '' :
+      `<text x="${(from.x + to.x) / 2}" y="${(from.y + to.y) / 2}" fill="red" font-size="12" text-anchor="middle">${escapeXml(edge.label)}</text>`;
+    return `<line x1="${from.x}" y1="${from.y}" x2="${endX}" y2="${endY}" stroke="${edgeColor}"${marker}/>${label}`;
+  });
+
+  const nodeColor = escapeXml(graph.nodeColor);
+  const nodes = graph.nodes.map((node) => {
+    const { x, y } = points[node.id];
+    return `<circle cx="${x}" cy="${y}" r="${NODE_RADIUS}" fill="${nodeColor}"/>` +
+      `<text x="${x}" y="${y}" font-size="13" font-weight="bold" text-anchor="middle" dominant-baseline="central">${escapeXml(node.label)}</text>`;
+  });
+
+  const title = graph.title ?
+    `<text x="${width / 2}" y="24" font-size="16" text-anchor="middle">${escapeXml(graph.title)}</text>` : '';
+
+  return `<svg xmlns="http://www.w3.org/2000/svg" width="${width}" height="${height}" viewBox="0 0 ${width} ${height}" font-family="sans-serif">` +
+    `<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" orient="auto-start-reverse">` +
+    `<path d="M 0 0 L 10 5 L 0 10 z" fill="${edgeColor}"/></marker></defs>` +
+    `<rect width="100%" height="100%" fill="white"/>${title}${edges.join('')}${nodes.join('')}</svg>`;
+};
+
+export const diagramSrc = (image) => {
+  if (image && typeof image === 'object' && image.format === 'graph') {
+    return `data:image/svg+xml;charset=utf-8,${encodeURIComponent(graphToSvg(image))}`;
+  }
+  if (typeof image === 'string' && image.startsWith('/render/')) {
+    return renderUrl(image);
+  }
+  if (typeof image === 'string' && image.trimStart().startsWith('<')) {
+    return `data:image/svg+xml;charset=utf-8,${encodeURIComponent(image)}`;
+  }
+  return `data:image/png;base64,${image}`;
+};
@@ -0,0 +1,32 @@
+/*
+* Name: truthTable.js
+* Author: Backend Team
+* Description: Reads truth tables in either format the wff solver sends. The "rows" format is
+*   a list of rows of booleans. The "bits" format (tableFormat: "bits") is one base64 string
+*   per column, where row r is bit r % 8 (least significant first) of byte r / 8. Bits tables
+*   are decoded to bytes once and their rows are only expanded when they are shown.
+* Param {Object} table - The solver response, with headers and rows, or rowCount and columns
+* Returns {Object} {rowCount, getRow(index)}
+*/
+
+const decodeBase64 = (text) => {
+  const binary = atob(text);
+  const bytes = new Uint8Array(binary.length);
+  for (let index = 0; index < binary.length; index++) {
+    bytes[index] = binary.charCodeAt(index);
+  }
+  return bytes;
+};
+
+export const readTruthTable = (table) => {
+  if (table.tableFormat !== 'bits') {
+    const rows = table.rows || [];
+    return { rowCount: rows.length, getRow: (index) => rows[index] };
+  }
+
+  const columns = table.columns.map(decodeBase64);
+  return {
+    rowCount: table.rowCount,
+    getRow: (index) => columns.map((column) => ((column[index >> 3] >> (index & 7)) & 1) === 1),
+  };
+};